@@ -1,8 +1,11 @@
 import os
 from dotenv import load_dotenv
+from review_agent import events
 from review_agent.agent import ReviewAgent, ReviewInput
 from review_agent.platforms.mock import MockPlatform
 from review_agent.platforms.local_directory import LocalDirectoryPlatform
+from review_agent.pipeline import generate_and_post
+from review_agent.pool import PlatformPool
 
 def demo_review_agent():
     """Demonstrate the review agent with sample data."""
@@ -37,69 +40,68 @@ def demo_review_agent():
         }
     ]
     
-    for i, sample in enumerate(sample_reviews, 1):
-        print(f"\n🔄 Processing Review {i}/{len(sample_reviews)}...")
-        print(f"Business: {sample['business_name']}")
-        print(f"Experience: {sample['experience_text']}")
-        print(f"Rating: {sample['rating']}/5")
-        
-        # Create review input
-        review_input = ReviewInput(
-            business_name=sample['business_name'],
-            experience_text=sample['experience_text'],
-            rating=sample['rating'],
-            visit_date=sample['visit_date']
-        )
-        
-        print("\n🤖 Generating review...")
-        
-        if use_ai:
-            try:
-                # Initialize the review agent with AI
-                agent = ReviewAgent(api_key=api_key)
-                review = agent.generate_review(review_input)
-            except Exception as e:
-                print(f"AI generation failed: {e}")
-                review = generate_fallback_review(review_input)
-        else:
-            # Use a simple template for mock
-            review = generate_fallback_review(review_input)
-        
-        print("\n📝 Generated Review:")
-        print("-" * 40)
-        print(review)
-        print("-" * 40)
-        
-        # Initialize platforms (mix of mock and semi-real)
-        platforms = [
-            MockPlatform("Google Reviews"),
-            MockPlatform("Yelp"),
-            LocalDirectoryPlatform()  # This one tries to make real API calls
-        ]
-        
-        print(f"\n📤 Posting to {len(platforms)} platforms...")
-        
-        for platform in platforms:
-            platform_name = getattr(platform, 'platform_name', platform.__class__.__name__)
-            print(f"\n📤 Posting to {platform_name}...")
+    # Platforms log in once and are closed when the demo ends
+    with PlatformPool() as pool:
+        for i, sample in enumerate(sample_reviews, 1):
+            print(f"\n🔄 Processing Review {i}/{len(sample_reviews)}...")
+            print(f"Business: {sample['business_name']}")
+            print(f"Experience: {sample['experience_text']}")
+            print(f"Rating: {sample['rating']}/5")
+            
+            # Create review input
+            review_input = ReviewInput(
+                business_name=sample['business_name'],
+                experience_text=sample['experience_text'],
+                rating=sample['rating'],
+                visit_date=sample['visit_date']
+            )
             
-            # Login
-            if isinstance(platform, LocalDirectoryPlatform):
-                platform.login({"api_key": "demo_key"})
-            else:
-                platform.login({"username": "demo", "password": "demo"})
+            # Platforms (mix of mock and semi-real) are logged in on first
+            # use and reused for every review
+            platforms = [
+                pool.get(MockPlatform, {"username": "demo", "password": "demo"}, "Google Reviews"),
+                pool.get(MockPlatform, {"username": "demo", "password": "demo"}, "Yelp"),
+                # This one tries to make real API calls
+                pool.get(LocalDirectoryPlatform, {"api_key": "demo_key"})
+            ]
             
-            # Search business
-            business_id = platform.search_business(
-                review_input.business_name, 
-                "New York"  # Adding location for more realistic demo
+            def generate():
+                print("\n🤖 Generating review...")
+                
+                if use_ai:
+                    try:
+                        # Initialize the review agent with AI
+                        agent = ReviewAgent(api_key=api_key)
+                        review = agent.generate_review(review_input)
+                    except Exception as e:
+                        print(f"AI generation failed: {e}")
+                        review = generate_fallback_review(review_input)
+                else:
+                    # Use a simple template for mock
+                    review = generate_fallback_review(review_input)
+                
+                print("\n📝 Generated Review:")
+                print("-" * 40)
+                print(review)
+                print("-" * 40)
+                print(f"\n📤 Posting to {len(platforms)} platforms...")
+                return review
+            
+            # Business lookups (with a location for a more realistic demo) run
+            # while the review is being generated
+            review, report = generate_and_post(
+                generate,
+                platforms,
+                review_input.business_name,
+                "New York",
+                review_input.rating
             )
             
-            # Post review
-            result = platform.post_review(business_id, review, review_input.rating)
+            for failure in report.failed:
+                print(f"❌ Posting to {failure.platform} failed: {failure.error}")
+            
+            print(f"✅ Review {i} posted to {len(report.succeeded)}/{len(platforms)} platforms!\n")
         
-        print(f"✅ Review {i} posted successfully!\n")
-    
     print("🎉 Demo complete! Reviews have been posted to multiple platforms.")
     print("📁 Check the 'mock_reviews' folder to see your generated reviews.")
     print("\n💡 Next steps:")
@@ -132,4 +134,5 @@ def generate_fallback_review(review_input: ReviewInput) -> str:
     return review
 
 if __name__ == "__main__":
+    events.subscribe(events.ConsoleListener())
     demo_review_agent()
\ No newline at end of file
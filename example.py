@@ -1,5 +1,6 @@
 import os
 from dotenv import load_dotenv
+from review_agent import events
 from review_agent.agent import ReviewAgent, ReviewInput
 from review_agent.platforms.mock import MockPlatform
 
@@ -107,4 +108,5 @@ Overall, I would rate this {review_input.rating} out of 5 stars. {"Highly recomm
         print("\n👍 Review generated but not posted. Thanks for trying the MVP!")
 
 if __name__ == "__main__":
+    events.subscribe(events.ConsoleListener())
     main()
\ No newline at end of file
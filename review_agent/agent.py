@@ -4,6 +4,8 @@ from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 from pydantic import BaseModel
 
+from . import events, metrics, tracing
+
 class ReviewInput(BaseModel):
     business_name: str
     experience_text: str
@@ -11,9 +13,21 @@ class ReviewInput(BaseModel):
     visit_date: Optional[str] = None
 
 class ReviewAgent:
-    def __init__(self, api_key: str):
-        """Initialize the review agent with OpenAI API key."""
-        self.llm = ChatOpenAI(openai_api_key=api_key, model="gpt-3.5-turbo")
+    def __init__(self, api_key: Optional[str] = None, llm=None):
+        """
+        Initialize the review agent with OpenAI API key.
+
+        Args:
+            api_key: OpenAI API key
+            llm: Optional LangChain language model to use instead of OpenAI,
+                e.g. a fake model for benchmarks
+        """
+        with metrics.stage_timer("agent_init"), tracing.span("agent_init"):
+            self._build(api_key, llm)
+
+    def _build(self, api_key: Optional[str], llm):
+        """Create the LLM client, prompt template and chain."""
+        self.llm = llm or ChatOpenAI(openai_api_key=api_key, model="gpt-3.5-turbo")
         self.review_template = """
         Based on the following customer experience, generate a detailed, authentic review.
         Make sure to highlight specific details and maintain a natural tone.
@@ -41,16 +55,46 @@ class ReviewAgent:
 
     def generate_review(self, review_input: ReviewInput) -> str:
         """Generate a review based on the input experience."""
-        try:
-            review = self.review_chain.run(**review_input.dict())
-            return review.strip()
-        except Exception as e:
-            # Fallback if LangChain fails
-            return f"Had a great experience at {review_input.business_name}. {review_input.experience_text} Would rate it {review_input.rating}/5 stars."
+        with metrics.stage_timer("generate") as timer, tracing.span("generate") as span:
+            try:
+                review = self.review_chain.run(**review_input.dict())
+                return review.strip()
+            except Exception as e:
+                # Fallback if LangChain fails
+                timer.outcome = "fallback"
+                span.set(outcome="fallback")
+                tracing.instant("fallback", reason=repr(e))
+                events.emit("agent.fallback", "⚠️  Review generation failed, using fallback: {error}",
+                            business_name=review_input.business_name, error=repr(e))
+                return f"Had a great experience at {review_input.business_name}. {review_input.experience_text} Would rate it {review_input.rating}/5 stars."
 
     def post_review(self, platform: str, review: str, **kwargs):
         """
         Post the review to the specified platform.
         To be implemented for each platform.
         """
-        raise NotImplementedError(f"Posting to {platform} not yet implemented")
\ No newline at end of file
+        raise NotImplementedError(f"Posting to {platform} not yet implemented")
+
+def generate_fallback_review(review_input: ReviewInput) -> str:
+    """Generate a simple review without AI."""
+    with metrics.stage_timer("generate") as timer, tracing.span("generate", outcome="fallback"):
+        timer.outcome = "fallback"
+        tracing.instant("fallback", reason="fallback generator")
+        rating_text = {
+            5: "Excellent experience!",
+            4: "Very good experience.",
+            3: "Good experience overall.",
+            2: "Okay experience, could be better.",
+            1: "Poor experience."
+        }
+        
+        review = f"I visited {review_input.business_name} and {review_input.experience_text} "
+        review += f"{rating_text.get(review_input.rating, 'Had an experience.')} "
+        review += f"I would rate this {review_input.rating} out of 5 stars."
+        
+        if review_input.rating >= 4:
+            review += " Highly recommended!"
+        elif review_input.rating <= 2:
+            review += " Hope they can improve."
+        
+        return review
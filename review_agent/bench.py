@@ -0,0 +1,343 @@
+"""
+End-to-end benchmark suite.
+
+Measures latency and throughput of the main pipeline stages without any
+external services: review generation runs against a fake LLM with a
+configurable delay, ``LocalDirectoryPlatform`` talks to an in-process
+reference directory server (``review_agent.directory_server``), and
+everything writes to a temporary directory.
+
+Results are reported as JSON so runs can be stored and compared:
+
+    review-agent bench --output baseline.json
+    review-agent bench --compare baseline.json
+"""
+
+import math
+import os
+import platform as _platform
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from langchain_core.language_models.llms import LLM
+
+from . import __version__
+from .agent import ReviewAgent, ReviewInput
+from .directory_server import DirectoryServer
+from .memprofile import MemoryTracer
+from .pipeline import generate_and_post
+from .platforms.local_directory import LocalDirectoryPlatform
+from .platforms.mock import MockPlatform
+from .utils.simple_voice import SimpleVoiceProcessor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+SCENARIOS = ("generate", "mock_post", "mock_read", "local_directory", "voice", "pipeline")
+
+SAMPLE_REVIEW = (
+    "I had a lovely evening here. The food arrived quickly, the staff were "
+    "attentive without hovering and the prices were fair for the portion sizes. "
+    "I would happily come back and recommend it to friends."
+)
+
+
+class FakeLLM(LLM):
+    """LangChain LLM that sleeps for a configurable time and returns a canned review."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    response: str = SAMPLE_REVIEW
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-latency"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None,
+              run_manager: Any = None, **kwargs: Any) -> str:
+        delay = self.latency + (random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        return self.response
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of this process right now, in MiB (Linux only)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 2)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of this process so far, in MiB.
+
+    This is the peak over the process's lifetime, not of one scenario.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 2)
+
+
+def measure(operation: Callable[[int], Any], iterations: int, concurrency: int = 1) -> Dict[str, Any]:
+    """
+    Run ``operation(i)`` for ``i`` in ``range(iterations)`` and summarize.
+
+    Returns:
+        Dict with latency percentiles (milliseconds), throughput (ops/s),
+        error count, RSS growth during the run and the process's peak RSS
+    """
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def timed(i: int):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            operation(i)
+            failed = False
+        except Exception:
+            failed = True
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            if failed:
+                errors += 1
+
+    rss_before = current_rss_mb()
+    wall_started = time.perf_counter()
+    if concurrency <= 1:
+        for i in range(iterations):
+            timed(i)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(timed, range(iterations)))
+    wall = time.perf_counter() - wall_started
+    rss_after = current_rss_mb()
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_s": round(wall, 6),
+        "throughput_ops_s": round(iterations / wall, 2) if wall > 0 else None,
+        "latency_ms": {
+            "min": round(latencies[0] * 1000, 4) if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies) * 1000, 4) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50) * 1000, 4),
+            "p95": round(percentile(latencies, 95) * 1000, 4),
+            "p99": round(percentile(latencies, 99) * 1000, 4),
+            "max": round(latencies[-1] * 1000, 4) if latencies else 0.0,
+        },
+        # Resident memory gained while this scenario ran (None off Linux)
+        "rss_delta_mb": round(rss_after - rss_before, 2) if rss_before is not None and rss_after is not None else None,
+        # Lifetime peak of the whole process, so it never goes down
+        "process_peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _review_input(i: int) -> ReviewInput:
+    return ReviewInput(
+        business_name=f"Benchmark Business {i % 50}",
+        experience_text="Friendly staff, quick service and a fair bill.",
+        rating=(i % 5) + 1,
+        visit_date="2024-03-21"
+    )
+
+
+class BenchmarkSuite:
+    """
+    Collection of pipeline benchmarks sharing one scratch directory.
+
+    Example:
+        suite = BenchmarkSuite(iterations=500, llm_latency=0.05)
+        report = suite.run(["generate", "mock_post"])
+    """
+
+    def __init__(self, iterations: int = 200, concurrency: int = 1,
+                 llm_latency: float = 0.0, llm_jitter: float = 0.0,
+                 workdir: Optional[str] = None, trace_memory: bool = False):
+        self.iterations = iterations
+        self.concurrency = concurrency
+        self.llm_latency = llm_latency
+        self.llm_jitter = llm_jitter
+        self.workdir = workdir
+        # Adds a per-scenario "memory" section; tracemalloc inflates latency
+        self.trace_memory = trace_memory
+
+    def run(self, scenarios: Sequence[str] = SCENARIOS) -> Dict[str, Any]:
+        """Run the selected scenarios and return the JSON-serializable report."""
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise ValueError(f"Unknown benchmark scenarios: {', '.join(sorted(unknown))}")
+
+        workdir = self.workdir or tempfile.mkdtemp(prefix="review-agent-bench-")
+        results = {}
+        try:
+            for name in scenarios:
+                scenario_dir = os.path.join(workdir, name)
+                os.makedirs(scenario_dir, exist_ok=True)
+                results[name] = self._run_scenario(name, scenario_dir)
+        finally:
+            if not self.workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+        return {
+            "meta": {
+                "version": __version__,
+                "python": _platform.python_version(),
+                "platform": _platform.platform(),
+                "cpus": os.cpu_count(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "iterations": self.iterations,
+                "concurrency": self.concurrency,
+                "llm_latency_s": self.llm_latency,
+                "llm_jitter_s": self.llm_jitter,
+                "trace_memory": self.trace_memory,
+            },
+            "scenarios": results,
+        }
+
+    def _run_scenario(self, name: str, workdir: str) -> Dict[str, Any]:
+        bench = getattr(self, f"bench_{name}")
+        if not self.trace_memory:
+            return bench(workdir)
+
+        tracer = MemoryTracer(snapshot_interval=0.5)
+        tracer.start()
+        try:
+            result = bench(workdir)
+        finally:
+            tracer.stop()
+        result["memory"] = tracer.report(timeline=False)
+        return result
+
+    def _agent(self) -> ReviewAgent:
+        return ReviewAgent(llm=FakeLLM(latency=self.llm_latency, jitter=self.llm_jitter))
+
+    def bench_generate(self, workdir: str) -> Dict[str, Any]:
+        agent = self._agent()
+        return measure(lambda i: agent.generate_review(_review_input(i)),
+                       self.iterations, self.concurrency)
+
+    def bench_mock_post(self, workdir: str) -> Dict[str, Any]:
+        platform = MockPlatform("Benchmark", reviews_dir=workdir)
+        platform.login({})
+        return measure(lambda i: platform.post_review(f"business_{i % 50}", SAMPLE_REVIEW, (i % 5) + 1),
+                       self.iterations, self.concurrency)
+
+    def bench_mock_read(self, workdir: str) -> Dict[str, Any]:
+        platform = MockPlatform("Benchmark", reviews_dir=workdir)
+        platform.login({})
+        for i in range(self.iterations):
+            platform.post_review(f"business_{i % 50}", SAMPLE_REVIEW, (i % 5) + 1)
+
+        # Each read loads every stored review, so fewer reads are enough
+        reads = max(1, self.iterations // 20)
+        result = measure(lambda i: platform.get_all_reviews(), reads, self.concurrency)
+        result["stored_reviews"] = self.iterations
+        return result
+
+    def bench_local_directory(self, workdir: str) -> Dict[str, Any]:
+        with DirectoryServer(port=0) as server:
+            platform = LocalDirectoryPlatform(server.url)
+            platform.login({"api_key": "bench"})
+
+            def search_and_post(i: int):
+                business_id = platform.search_business(f"Benchmark Business {i % 50}", "New York")
+                platform.post_review(business_id, SAMPLE_REVIEW, (i % 5) + 1)
+
+            return measure(search_and_post, self.iterations, self.concurrency)
+
+    def bench_voice(self, workdir: str) -> Dict[str, Any]:
+        processor = SimpleVoiceProcessor(audio_dir=workdir)
+        names = ["restaurant", "coffee", "repair", "hotel", "other"]
+        paths = []
+        for name in names:
+            path = os.path.join(workdir, f"{name}_review.wav")
+            with open(path, "wb") as f:
+                f.write(b"RIFF\x00\x00\x00\x00WAVE")
+            paths.append(path)
+
+        return measure(lambda i: processor.process_audio_file(paths[i % len(paths)]),
+                       self.iterations, self.concurrency)
+
+    def bench_pipeline(self, workdir: str) -> Dict[str, Any]:
+        agent = self._agent()
+        platforms = [MockPlatform(name, reviews_dir=workdir) for name in ("Google Reviews", "Yelp")]
+        for platform in platforms:
+            platform.login({})
+
+        with DirectoryServer(port=0) as server:
+            directory = LocalDirectoryPlatform(server.url)
+            directory.login({"api_key": "bench"})
+            platforms.append(directory)
+
+            def run_pipeline(i: int):
+                review_input = _review_input(i)
+                _, report = generate_and_post(
+                    lambda: agent.generate_review(review_input),
+                    platforms,
+                    review_input.business_name,
+                    "New York",
+                    review_input.rating
+                )
+                if not report.ok:
+                    raise RuntimeError(report.failed[0].error)
+
+            return measure(run_pipeline, self.iterations, self.concurrency)
+
+
+def compare_reports(baseline: Mapping[str, Any], current: Mapping[str, Any],
+                    threshold: float = 10.0) -> List[str]:
+    """
+    Compare two benchmark reports.
+
+    A scenario regresses when its p95 latency grows, or its throughput
+    drops, by more than ``threshold`` percent.
+
+    Returns:
+        List of human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for name, result in current.get("scenarios", {}).items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+
+        base_p95 = base["latency_ms"]["p95"]
+        p95 = result["latency_ms"]["p95"]
+        if base_p95 > 0 and (p95 - base_p95) / base_p95 * 100 > threshold:
+            regressions.append(f"{name}: p95 {base_p95:.3f}ms -> {p95:.3f}ms")
+
+        base_tput = base.get("throughput_ops_s") or 0
+        tput = result.get("throughput_ops_s") or 0
+        if base_tput > 0 and (base_tput - tput) / base_tput * 100 > threshold:
+            regressions.append(f"{name}: throughput {base_tput:.1f}/s -> {tput:.1f}/s")
+
+    return regressions
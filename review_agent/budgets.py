@@ -0,0 +1,206 @@
+"""
+Per-platform rate budgets.
+
+Every platform publishes its own API quota, and a fan-out run with many
+threads (or batch worker processes) can exceed it without noticing until
+the platform starts answering 429. ``RateBudgets`` holds one token bucket
+per platform, configured in one place, and ``ReviewPlatform`` consults it
+before every instrumented call (see ``ReviewPlatform.rate_budgets``):
+
+- a call waits for a token instead of being sent over budget, so a run
+  goes as fast as the quota allows and no faster
+- batch calls take one token per review or sub-request they carry, since
+  that is what the platform counts against the quota
+- a budget can cover a whole platform ("Facebook") or one operation
+  ("Trustpilot.post_review"); the operation budget wins
+- a ``RateLimitError`` from the platform pauses its bucket for
+  ``retry_after`` seconds, for every caller sharing it
+- with a ``path``, buckets live in a SQLite file, so every process using
+  the file (batch workers, concurrent runs) draws from the same budget
+
+    ReviewPlatform.rate_budgets = RateBudgets.parse(
+        "Facebook=200/3600:10,Trustpilot=10,Trustpilot.invite_review=5", path="budgets.db")
+"""
+
+import time
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+from . import events, metrics, tracing
+from .platforms.base import RateLimitError
+from .ratelimit import TokenBucket
+from .storage import SQLiteStore
+
+RATE_BUDGET_CALLS = metrics.REGISTRY.counter(
+    "review_agent_rate_budget_calls_total",
+    "Platform calls checked against a rate budget by result (immediate, waited, rejected)",
+    ("platform", "result"),
+)
+RATE_BUDGET_WAIT = metrics.REGISTRY.counter(
+    "review_agent_rate_budget_wait_seconds_total",
+    "Seconds platform calls spent waiting for their rate budget",
+    ("platform",),
+)
+
+
+class Budget(NamedTuple):
+    # Calls per second, and how many may go at once after an idle period
+    rate: float
+    burst: float
+
+    @classmethod
+    def parse(cls, spec: str) -> "Budget":
+        """
+        ``CALLS[/SECONDS][:BURST]``, e.g. ``10`` (10 per second),
+        ``200/3600`` (200 per hour) or ``200/3600:10``.
+        """
+        quota, _, burst = spec.partition(":")
+        calls, _, seconds = quota.partition("/")
+        rate = float(calls) / float(seconds or 1)
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        return cls(rate, float(burst) if burst else max(1.0, rate))
+
+
+class SharedTokenBuckets(SQLiteStore):
+    """
+    Named token buckets in a SQLite file, shared by every process using it.
+
+    Same accounting as ``TokenBucket``, on wall-clock time so processes
+    agree on it.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS rate_buckets ("
+        " name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL,"
+        " blocked_until REAL NOT NULL DEFAULT 0)",
+    )
+
+    def __init__(self, path: str = "review_agent_budgets.db"):
+        super().__init__(path)
+
+    def reserve(self, name: str, budget: Budget, tokens: float = 1.0,
+                max_wait: Optional[float] = None) -> float:
+        """
+        Take ``tokens`` from bucket ``name`` and return the wait in seconds.
+
+        If the wait would exceed ``max_wait``, nothing is taken.
+        """
+        now = time.time()
+        with self.transaction() as connection:
+            row = connection.execute("SELECT tokens, updated, blocked_until FROM rate_buckets WHERE name = ?",
+                                     (name,)).fetchone()
+            tokens_left, updated, blocked_until = row if row is not None else (budget.burst, now, 0.0)
+            available = min(budget.burst, tokens_left + max(0.0, now - updated) * budget.rate)
+            remaining = available - tokens
+            wait = max(-remaining / budget.rate if remaining < 0 else 0.0, blocked_until - now)
+            if max_wait is not None and wait > max_wait:
+                return wait
+            connection.execute(
+                "INSERT INTO rate_buckets (name, tokens, updated, blocked_until) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (name) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (name, remaining, now, blocked_until))
+        return wait
+
+    def defer(self, name: str, budget: Budget, seconds: float):
+        """Hold every caller of bucket ``name`` for ``seconds``."""
+        now = time.time()
+        self.execute(
+            "INSERT INTO rate_buckets (name, tokens, updated, blocked_until) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (name) DO UPDATE SET blocked_until = MAX(blocked_until, excluded.blocked_until)",
+            (name, budget.burst, now, now + seconds))
+
+
+class RateBudgets:
+    """Token buckets per platform (and optionally per operation)."""
+
+    def __init__(self, budgets: Mapping[str, Budget], path: Optional[str] = None,
+                 max_wait: Optional[float] = None):
+        """
+        Args:
+            budgets: Budget per platform label, or per ``"label.operation"``
+            path: SQLite file to share the buckets with other processes
+                (default: buckets in this process only)
+            max_wait: Longest a call may wait for its budget; beyond that it
+                fails at once with ``RateLimitError`` (default: always wait)
+        """
+        self.budgets = dict(budgets)
+        self.path = path
+        self.max_wait = max_wait
+        self._shared = SharedTokenBuckets(path) if path else None
+        self._buckets: Dict[str, TokenBucket] = {
+            name: TokenBucket(budget.rate, budget.burst) for name, budget in self.budgets.items()}
+
+    @classmethod
+    def parse(cls, spec: str, path: Optional[str] = None, max_wait: Optional[float] = None) -> "RateBudgets":
+        """
+        Build budgets from ``NAME=CALLS[/SECONDS][:BURST]`` pairs separated
+        by commas, e.g. ``"Facebook=200/3600,Trustpilot.post_review=1"``.
+        """
+        budgets = {}
+        for part in filter(None, (part.strip() for part in spec.split(","))):
+            name, _, value = part.partition("=")
+            try:
+                if not name.strip() or not value.strip():
+                    raise ValueError("expected NAME=CALLS[/SECONDS][:BURST]")
+                budgets[name.strip()] = Budget.parse(value.strip())
+            except ValueError as e:
+                raise ValueError(f"invalid rate budget {part!r}: {e}") from None
+        return cls(budgets, path=path, max_wait=max_wait)
+
+    def budget_for(self, platform: str, operation: str) -> Optional[Tuple[str, Budget]]:
+        """The bucket name and budget a call draws from, if it has one."""
+        for name in (f"{platform}.{operation}", platform):
+            budget = self.budgets.get(name)
+            if budget is not None:
+                return name, budget
+        return None
+
+    def acquire(self, platform: str, operation: str, tokens: float = 1.0) -> float:
+        """
+        Wait until the call may go; returns the seconds waited.
+
+        Args:
+            platform: Platform label
+            operation: Stage or operation name, e.g. ``post_review``
+            tokens: Quota the call uses, e.g. the reviews in a batch
+
+        Raises:
+            RateLimitError: The wait would exceed ``max_wait``
+        """
+        found = self.budget_for(platform, operation)
+        if found is None:
+            return 0.0
+        name, budget = found
+        if self._shared is not None:
+            wait = self._shared.reserve(name, budget, tokens, max_wait=self.max_wait)
+        else:
+            wait = self._buckets[name].reserve(tokens, max_wait=self.max_wait)
+
+        if self.max_wait is not None and wait > self.max_wait:
+            if metrics.enabled():
+                RATE_BUDGET_CALLS.inc(platform, "rejected")
+            raise RateLimitError(f"{name} rate budget exhausted; retry after {wait:.3f}s", retry_after=wait)
+        if metrics.enabled():
+            RATE_BUDGET_CALLS.inc(platform, "waited" if wait > 0 else "immediate")
+            RATE_BUDGET_WAIT.inc(platform, amount=wait)
+        if wait > 0:
+            with tracing.span("rate_budget_wait", platform=platform, budget=name):
+                time.sleep(wait)
+        return wait
+
+    def defer(self, platform: str, operation: str, seconds: float):
+        """Pause the call's budget after the platform asked to retry later."""
+        found = self.budget_for(platform, operation)
+        if found is None:
+            return
+        name, budget = found
+        if self._shared is not None:
+            self._shared.defer(name, budget, seconds)
+        else:
+            self._buckets[name].defer(seconds)
+        events.emit("rate_budget.deferred", "⏸️  {platform} is rate limiting; pausing {budget} for {seconds:.1f}s",
+                    platform=platform, budget=name, seconds=seconds)
+
+    def close(self):
+        if self._shared is not None:
+            self._shared.close()
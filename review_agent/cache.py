@@ -0,0 +1,198 @@
+"""
+Business ID resolution cache.
+
+Every post starts with ``search_business``, a network round trip on the
+real platforms, for the same handful of businesses over and over.
+``BusinessCache`` remembers the result per (platform, normalized name,
+normalized location), where the platform includes the server URL for
+platforms with a configurable endpoint:
+
+- found IDs are kept for ``ttl`` seconds
+- "not found" answers (``BusinessNotFoundError``) are kept for
+  ``negative_ttl`` seconds and re-raised without a lookup
+- with a ``path``, entries are stored in SQLite and survive restarts; the
+  file can be shared by batch worker processes
+- ``preload_csv`` loads known businesses in bulk
+- stand-in IDs a platform made up while offline are never cached
+
+Install a cache for every platform, or for one instance:
+
+    ReviewPlatform.business_cache = BusinessCache("business_ids.db")
+    facebook.business_cache = BusinessCache(ttl=3600)
+"""
+
+import csv
+import threading
+import time
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+from . import metrics
+from .storage import SQLiteStore
+
+CacheKey = Tuple[str, str, str]
+
+# Cached value for a business that was searched for and not found
+NOT_FOUND = None
+
+BUSINESS_CACHE = metrics.REGISTRY.counter(
+    "review_agent_business_cache_total",
+    "Business ID cache lookups by platform and result (hit, negative_hit, miss)",
+    ("platform", "result"),
+)
+
+
+def normalize(text: Optional[str]) -> str:
+    """Case- and whitespace-insensitive form of a business name or location."""
+    if not text:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+class _BusinessIdStore(SQLiteStore):
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS business_ids ("
+        " platform TEXT NOT NULL, name TEXT NOT NULL, location TEXT NOT NULL,"
+        " business_id TEXT, message TEXT, expires_at REAL NOT NULL,"
+        " PRIMARY KEY (platform, name, location))",
+    )
+
+
+class BusinessCache:
+    """
+    TTL cache of business IDs, optionally persisted to SQLite.
+
+    Example:
+        cache = BusinessCache("business_ids.db", ttl=7 * 86400)
+        cache.preload_csv("known_businesses.csv")
+        ReviewPlatform.business_cache = cache
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 86400.0,
+                 negative_ttl: float = 3600.0, max_entries: int = 100_000):
+        """
+        Args:
+            path: SQLite file for a persistent cache (default: memory only)
+            ttl: Seconds a found business ID stays valid
+            negative_ttl: Seconds a "not found" answer stays valid
+            max_entries: In-memory entries kept before expired ones are purged
+        """
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._store = _BusinessIdStore(path) if path else None
+        # key -> (business_id or NOT_FOUND, message, expires_at)
+        self._entries: Dict[CacheKey, Tuple[Optional[str], str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(platform: str, business_name: str, location: Optional[str]) -> CacheKey:
+        return (platform, normalize(business_name), normalize(location))
+
+    def lookup(self, platform: str, business_name: str,
+               location: Optional[str]) -> Optional[Tuple[Optional[str], str]]:
+        """
+        Return ``(business_id, message)`` for a live entry, else None.
+
+        ``business_id`` is ``NOT_FOUND`` for a cached negative answer, with
+        the original error message.
+        """
+        key = self.key(platform, business_name, location)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+        if (entry is None or entry[2] <= now) and self._store is not None:
+            # Another process may have refreshed it
+            rows = self._store.query(
+                "SELECT business_id, message, expires_at FROM business_ids"
+                " WHERE platform = ? AND name = ? AND location = ?", key)
+            if rows:
+                entry = rows[0]
+                with self._lock:
+                    self._entries[key] = entry
+        if entry is None or entry[2] <= now:
+            return None
+        return entry[0], entry[1]
+
+    def store(self, platform: str, business_name: str, location: Optional[str],
+              business_id: Optional[str], message: str = ""):
+        """Cache a found ID, or a "not found" answer when ``business_id`` is ``NOT_FOUND``."""
+        key = self.key(platform, business_name, location)
+        ttl = self.ttl if business_id is not NOT_FOUND else self.negative_ttl
+        entry = (business_id, message, time.time() + ttl)
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._purge_expired()
+            self._entries[key] = entry
+        if self._store is not None:
+            self._store.execute(
+                "INSERT OR REPLACE INTO business_ids VALUES (?, ?, ?, ?, ?, ?)", key + entry)
+
+    def invalidate(self, platform: str, business_name: str, location: Optional[str]):
+        key = self.key(platform, business_name, location)
+        with self._lock:
+            self._entries.pop(key, None)
+        if self._store is not None:
+            self._store.execute(
+                "DELETE FROM business_ids WHERE platform = ? AND name = ? AND location = ?", key)
+
+    def invalidate_id(self, platform: str, business_id: str):
+        """Drop every search that found ``business_id``, e.g. after the platform deleted it."""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items()
+                        if key[0] == platform and entry[0] == business_id]:
+                del self._entries[key]
+        if self._store is not None:
+            self._store.execute(
+                "DELETE FROM business_ids WHERE platform = ? AND business_id = ?", (platform, business_id))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self._store is not None:
+            self._store.execute("DELETE FROM business_ids")
+
+    def _purge_expired(self):
+        now = time.time()
+        expired = [key for key, entry in self._entries.items() if entry[2] <= now]
+        for key in expired:
+            del self._entries[key]
+        if len(self._entries) >= self.max_entries:
+            # Still full of live entries; drop the oldest half (dicts keep
+            # insertion order) and let SQLite serve them if persistent
+            for key in list(self._entries)[:len(self._entries) // 2]:
+                del self._entries[key]
+
+    def preload_csv(self, path: str, platform: Optional[str] = None) -> int:
+        """
+        Load known businesses from a CSV file.
+
+        The file needs ``business_name`` and ``business_id`` columns, plus
+        ``platform`` unless ``platform`` is given, and optionally ``location``.
+        The platform is its label, followed by the server URL for platforms
+        with a configurable endpoint (``Local Directory http://localhost:8000``).
+
+        Returns:
+            int: Number of entries loaded
+        """
+        expires_at = time.time() + self.ttl
+        rows = []
+        with open(path, newline="", encoding="utf-8") as f:
+            for line_number, row in enumerate(csv.DictReader(f), start=2):
+                row_platform = platform or row.get("platform")
+                if not row_platform or not row.get("business_name") or not row.get("business_id"):
+                    raise ValueError(f"{path}:{line_number}: platform, business_name and business_id are required")
+                key = self.key(row_platform, row["business_name"], row.get("location"))
+                rows.append(key + (row["business_id"], "", expires_at))
+
+        with self._lock:
+            for row in rows:
+                self._entries[row[:3]] = row[3:]
+        if self._store is not None:
+            self._store.executemany("INSERT OR REPLACE INTO business_ids VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def close(self):
+        if self._store is not None:
+            self._store.close()
@@ -8,16 +8,28 @@ Command-line interface for the Review Agent system.
 import argparse
 import sys
 import os
+import time
 from pathlib import Path
 
+_import_started = time.perf_counter()
+
 # Add the project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from review_agent.agent import ReviewAgent, ReviewInput
+from review_agent import events, metrics, tracing
+from review_agent.agent import ReviewAgent, ReviewInput, generate_fallback_review
+from review_agent.pipeline import generate_and_post
 from review_agent.platforms.mock import MockPlatform
+from review_agent.pool import PlatformPool
 from review_agent.utils.simple_voice import SimpleVoiceProcessor
 
+# Time spent importing the package and its dependencies, for --profile
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
+# Commands that write JSON to stdout; their progress events go to stderr
+MACHINE_READABLE_COMMANDS = ('batch', 'bench', 'loadgen')
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -28,11 +40,73 @@ Examples:
   review-agent demo                    # Run basic demo
   review-agent voice                   # Run voice demo
   review-agent generate --help         # Generate single review
+  review-agent batch --input in.jsonl  # Bulk run across all cores
+  review-agent --events=json batch ... # Machine-readable progress on stderr
+  review-agent bench --output b.json   # Benchmark the pipeline
+  review-agent loadgen --rate 200 --duration 30 --output load.json  # Open-loop load test
+  review-agent serve-directory --port 8000  # Reference Local Directory API
+  review-agent --metrics-file m.prom batch ...  # Export stage metrics
+  review-agent --profile generate ...  # cProfile + per-stage timings
+  review-agent --diagnostics diag batch ...  # then: review-agent debug dump PID
+  review-agent --trace t.json batch ...  # Open t.json in ui.perfetto.dev
+  review-agent --trace-memory batch --workers 1 ...  # Per-stage memory + top allocators
+  review-agent --business-cache ids.db --preload-businesses known.csv batch ...
+  review-agent --http-cache 64 --session-cache sessions.db batch ...
+  review-agent --outbox outbox.db batch --local-directory http://localhost:8000 ...
+  review-agent --mock-faults "latency=lognormal:0.08:0.5,error_rate=0.02,seed=7" batch ...
+  review-agent --quotas "Facebook=200/3600,Trustpilot=10" --quota-db quotas.db batch ...
   
 For more information, visit: https://github.com/brian-olson/review-agent
         """
     )
     
+    parser.add_argument('--quiet', action='store_true', help='Do not report progress events')
+    parser.add_argument('--events', choices=['text', 'json'], default='text',
+                        help='Progress event format: emoji lines (on stderr for batch, bench and loadgen, '
+                             'stdout otherwise) or JSON Lines on stderr')
+    parser.add_argument('--metrics-file', metavar='PATH',
+                        help='Record stage metrics and write them in Prometheus text format on exit')
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help='Record stage metrics and serve them on http://127.0.0.1:PORT/metrics')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='Record pipeline spans and write them as Chrome trace-event JSON (chrome://tracing, Perfetto)')
+    parser.add_argument('--diagnostics', metavar='DIR',
+                        help='Dump stacks on SIGUSR1 and toggle a sampling profile on SIGUSR2, writing to DIR')
+    parser.add_argument('--profile-window', type=float, default=30.0, metavar='SECONDS',
+                        help='Maximum length of a SIGUSR2 sampling profile')
+    parser.add_argument('--profile', nargs='?', const='review-agent.pstats', metavar='PATH',
+                        help='Profile the run with cProfile, write pstats to PATH and print a per-stage breakdown')
+    parser.add_argument('--business-cache', metavar='PATH',
+                        help='Cache business ID lookups in a SQLite file shared across runs and workers')
+    parser.add_argument('--business-cache-ttl', type=float, default=86400.0, metavar='SECONDS',
+                        help='How long cached business IDs stay valid ("not found" answers: 1 hour)')
+    parser.add_argument('--preload-businesses', metavar='CSV',
+                        help='Preload the business ID cache from a CSV with platform, business_name, '
+                             'location and business_id columns')
+    parser.add_argument('--session-cache', metavar='PATH',
+                        help='Reuse platform login sessions across runs and workers via a SQLite file')
+    parser.add_argument('--http-cache', type=float, metavar='MB',
+                        help='Keep up to MB of GET responses and revalidate them with ETag/Last-Modified; '
+                             'prints the hit rate and bytes saved on exit (main process only)')
+    parser.add_argument('--outbox', metavar='PATH',
+                        help='Queue Local Directory posts in a SQLite file while the server is unreachable '
+                             'and deliver them in the background once it is back')
+    parser.add_argument('--quotas', metavar='SPEC',
+                        help='Keep platform calls within per-platform quotas, e.g. '
+                             '"Facebook=200/3600,Trustpilot=10:20,Trustpilot.post_review=1" '
+                             '(CALLS[/SECONDS][:BURST] per platform or platform.operation)')
+    parser.add_argument('--quota-db', metavar='PATH',
+                        help='SQLite file holding the rate budgets, to share them with other concurrent runs '
+                             '(default: a temporary file shared with this run\'s worker processes)')
+    parser.add_argument('--quota-max-wait', type=float, metavar='SECONDS',
+                        help='Fail a call with a rate limit error instead of waiting longer than SECONDS for its budget')
+    parser.add_argument('--mock-faults', metavar='SPEC',
+                        help='Inject latency and failures into mock platforms, e.g. '
+                             '"latency=lognormal:0.08:0.5,error_rate=0.02,rate_limit=50:10,outage=60:5,seed=7"')
+    parser.add_argument('--trace-memory', nargs='?', const='', metavar='PATH',
+                        help='Trace allocations with tracemalloc, print per-stage peaks and top allocation sites, '
+                             'and optionally write the JSON report to PATH (main process only)')
+    
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Demo command
@@ -54,23 +128,240 @@ For more information, visit: https://github.com/brian-olson/review-agent
     voice_parser.add_argument('--business', help='Business name')
     voice_parser.add_argument('--rating', type=int, choices=[1,2,3,4,5], help='Rating (1-5)')
     
+    # Batch command
+    batch_parser = subparsers.add_parser('batch', help='Generate and post reviews in bulk')
+    batch_parser.add_argument('--input', required=True, help='JSON Lines file with one review input per line')
+    batch_parser.add_argument('--output', help='Write per-review results as JSON Lines (default: stdout)')
+    batch_parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    batch_parser.add_argument('--platforms', default='Mock', help='Comma-separated mock platform names')
+    batch_parser.add_argument('--local-directory', metavar='URL', help='Also post to a Local Directory server')
+    batch_parser.add_argument('--timeout', type=float, default=30.0, help='Per-platform timeout in seconds')
+    batch_parser.add_argument('--start-method', choices=['fork', 'spawn', 'forkserver'],
+                              help='How worker processes are started (default: the platform\'s)')
+    
+    # Bench command
+    bench_parser = subparsers.add_parser('bench', help='Benchmark pipeline latency and throughput')
+    bench_parser.add_argument('--scenarios', help='Comma-separated scenarios to run (default: all)')
+    bench_parser.add_argument('--iterations', type=int, default=200, help='Operations per scenario')
+    bench_parser.add_argument('--concurrency', type=int, default=1, help='Concurrent operations per scenario')
+    bench_parser.add_argument('--llm-latency', type=float, default=0.0, help='Fake LLM latency in seconds')
+    bench_parser.add_argument('--llm-jitter', type=float, default=0.0, help='Fake LLM latency jitter in seconds')
+    bench_parser.add_argument('--output', help='Write the JSON report to a file (default: stdout)')
+    bench_parser.add_argument('--compare', metavar='BASELINE', help='Compare against a previous JSON report')
+    bench_parser.add_argument('--threshold', type=float, default=10.0,
+                              help='Regression threshold in percent for --compare')
+    bench_parser.add_argument('--trace-memory', action='store_true', dest='bench_trace_memory',
+                              help='Add per-scenario tracemalloc results (slows the scenarios down)')
+    
+    # Loadgen command
+    loadgen_parser = subparsers.add_parser('loadgen', help='Drive a platform at a target request rate (open loop)')
+    loadgen_parser.add_argument('--platform', choices=['mock', 'local-directory'], default='mock',
+                                help='Platform to load (mock faults come from --mock-faults)')
+    loadgen_parser.add_argument('--local-directory', metavar='URL',
+                                help='Directory server to load (default: an in-process reference server)')
+    loadgen_parser.add_argument('--operation', choices=['post_review', 'search_business', 'search_and_post'],
+                                default='post_review', help='Call made for each arrival')
+    loadgen_parser.add_argument('--rate', type=float, default=50.0, help='Target arrivals per second')
+    loadgen_parser.add_argument('--duration', type=float, default=10.0, help='Seconds to send for')
+    loadgen_parser.add_argument('--arrival', choices=['poisson', 'constant'], default='poisson',
+                                help='Arrival process')
+    loadgen_parser.add_argument('--max-in-flight', type=int, default=256,
+                                help='Concurrent calls; later arrivals queue and the wait counts as latency')
+    loadgen_parser.add_argument('--seed', type=int, help='Seed for Poisson arrivals')
+    loadgen_parser.add_argument('--window', type=float, default=1.0, help='Timeline bucket width in seconds')
+    loadgen_parser.add_argument('--output', help='Write the JSON report to a file (default: stdout)')
+    
+    # Serve-directory command
+    serve_parser = subparsers.add_parser('serve-directory', help='Run the reference Local Directory API server')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    serve_parser.add_argument('--port', type=int, default=8000, help='TCP port')
+    serve_parser.add_argument('--db', default='local_directory.db', help='SQLite file (":memory:" for a throwaway one)')
+    serve_parser.add_argument('--api-key', help='Require this bearer token on every request')
+    serve_parser.add_argument('--verbose', action='store_true', help='Log every request')
+    
+    # Debug command
+    debug_parser = subparsers.add_parser('debug', help='Inspect a running review-agent process')
+    debug_parser.add_argument('action', choices=['dump', 'profile'],
+                              help='dump: write thread/asyncio stacks; profile: start or stop a sampling profile')
+    debug_parser.add_argument('pid', type=int, help='PID of a process started with --diagnostics')
+    debug_parser.add_argument('--children', action='store_true', help='Also signal its worker processes')
+    
     # Version command
     version_parser = subparsers.add_parser('version', help='Show version information')
     
     args = parser.parse_args()
+    configure_events(args)
+    metrics_server = configure_metrics(args)
+    configure_business_cache(args)
+    configure_session_cache(args)
+    http_cache = configure_http_cache(args)
+    configure_outbox(args)
+    try:
+        rate_budgets, rate_budget_dir = configure_rate_budgets(args)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.mock_faults:
+        from review_agent.faults import FaultProfile
+        try:
+            MockPlatform.faults = FaultProfile.parse(args.mock_faults)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.trace:
+        tracing.enable()
+    if args.diagnostics:
+        from review_agent import diagnostics
+        if not diagnostics.install_signal_handlers(args.diagnostics, window=args.profile_window):
+            print("⚠️  Signal-triggered diagnostics are not supported on this platform", file=sys.stderr)
+    profiler = None
+    if args.profile:
+        from review_agent.profiling import RunProfiler
+        profiler = RunProfiler(args.profile, import_seconds=IMPORT_SECONDS)
+        profiler.start()
+    memory_tracer = None
+    if args.trace_memory is not None:
+        from review_agent.memprofile import MemoryTracer
+        memory_tracer = MemoryTracer()
+        memory_tracer.start()
     
+    try:
+        run_command(args, parser)
+    finally:
+        if profiler:
+            profiler.stop()
+            print(profiler.format_breakdown(), file=sys.stderr)
+        if memory_tracer:
+            memory_tracer.stop()
+            print(memory_tracer.format_report(), file=sys.stderr)
+            if args.trace_memory:
+                import json
+                with open(args.trace_memory, 'w') as f:
+                    json.dump(memory_tracer.report(), f, indent=2)
+        if rate_budgets:
+            rate_budgets.close()
+        if rate_budget_dir:
+            rate_budget_dir.cleanup()
+        if http_cache:
+            stats = http_cache.stats()
+            events.emit("http_cache.summary",
+                        "🗄️  HTTP cache: {hits}/{requests} GETs revalidated ({hit_rate:.0%}), {bytes_saved} bytes saved",
+                        requests=stats['hits'] + stats['misses'], **stats)
+        if metrics_server:
+            metrics_server.shutdown()
+        if args.metrics_file:
+            metrics.write_textfile(args.metrics_file)
+        if args.trace:
+            tracing.export(args.trace)
+
+def run_command(args, parser):
+    """Dispatch to the selected subcommand."""
     if args.command == 'demo':
         run_demo(use_voice=args.voice)
     elif args.command == 'generate':
         run_generate(args)
     elif args.command == 'voice':
-        run_voice(args)
+        # Transcription and generation belong to the same submission
+        with tracing.correlation():
+            run_voice(args)
+    elif args.command == 'batch':
+        run_batch(args)
+    elif args.command == 'bench':
+        run_bench(args)
+    elif args.command == 'loadgen':
+        run_loadgen(args)
+    elif args.command == 'serve-directory':
+        run_serve_directory(args)
+    elif args.command == 'debug':
+        run_debug(args)
     elif args.command == 'version':
         print("Review Agent v0.1.0")
         print("https://github.com/brian-olson/review-agent")
     else:
         parser.print_help()
 
+def configure_metrics(args):
+    """Enable metrics if requested; returns the HTTP server, if any."""
+    if not (args.metrics_file or args.metrics_port):
+        return None
+    metrics.enable()
+    if args.metrics_port:
+        return metrics.start_http_server(args.metrics_port)
+    return None
+
+def configure_business_cache(args):
+    """Install a business ID cache for every platform if requested."""
+    if not (args.business_cache or args.preload_businesses):
+        return
+    from review_agent.cache import BusinessCache
+    from review_agent.platforms.base import ReviewPlatform
+    cache = BusinessCache(args.business_cache, ttl=args.business_cache_ttl)
+    if args.preload_businesses:
+        count = cache.preload_csv(args.preload_businesses)
+        events.emit("cache.preload", "📇 Preloaded {count} business IDs from {path}",
+                    count=count, path=args.preload_businesses)
+    ReviewPlatform.business_cache = cache
+
+def configure_session_cache(args):
+    """Install a login session cache for every platform if requested."""
+    if not args.session_cache:
+        return
+    from review_agent.platforms.base import ReviewPlatform
+    from review_agent.sessions import SessionCache
+    ReviewPlatform.session_cache = SessionCache(args.session_cache)
+
+def configure_http_cache(args):
+    """Install a conditional GET cache for every HTTP transport if requested."""
+    if not args.http_cache:
+        return None
+    from review_agent.transport import HTTPCache, HTTPTransport
+    HTTPTransport.cache = HTTPCache(max_bytes=int(args.http_cache * 2**20))
+    return HTTPTransport.cache
+
+def configure_outbox(args):
+    """Queue Local Directory posts durably while the server is down, if requested."""
+    if not args.outbox:
+        return
+    from review_agent.outbox import Outbox
+    from review_agent.platforms.local_directory import LocalDirectoryPlatform
+    LocalDirectoryPlatform.outbox = Outbox(args.outbox)
+
+def configure_rate_budgets(args):
+    """
+    Install per-platform rate budgets for every platform if requested.
+
+    Returns the budgets and the temporary directory holding their file, if
+    one was created.
+    """
+    if not args.quotas:
+        return None, None
+    import tempfile
+    from review_agent.budgets import RateBudgets
+    from review_agent.platforms.base import ReviewPlatform
+    path, directory = args.quota_db, None
+    if not path:
+        # A file rather than in-process buckets, so batch workers share the budget
+        directory = tempfile.TemporaryDirectory(prefix="review-agent-budgets-")
+        path = os.path.join(directory.name, "budgets.db")
+    try:
+        budgets = RateBudgets.parse(args.quotas, path=path, max_wait=args.quota_max_wait)
+    except ValueError:
+        if directory:
+            directory.cleanup()
+        raise
+    ReviewPlatform.rate_budgets = budgets
+    return budgets, directory
+
+def configure_events(args):
+    """Subscribe the progress event listener selected on the command line."""
+    if args.quiet:
+        return
+    if args.events == 'json':
+        events.subscribe(events.JsonListener())
+    elif args.command in MACHINE_READABLE_COMMANDS:
+        # Keep stdout parseable for commands that write results there
+        events.subscribe(events.ConsoleListener(sys.stderr))
+    else:
+        events.subscribe(events.ConsoleListener())
+
 def run_demo(use_voice=False):
     """Run the demonstration."""
     if use_voice:
@@ -98,32 +389,40 @@ def run_generate(args):
         visit_date=args.date
     )
     
-    # Generate review
     api_key = os.getenv("OPENAI_API_KEY")
-    if api_key:
-        try:
-            agent = ReviewAgent(api_key=api_key)
-            review = agent.generate_review(review_input)
-        except Exception as e:
-            print(f"AI generation failed: {e}")
+
+    def generate():
+        if api_key:
+            try:
+                agent = ReviewAgent(api_key=api_key)
+                review = agent.generate_review(review_input)
+            except Exception as e:
+                print(f"AI generation failed: {e}")
+                review = generate_fallback_review(review_input)
+        else:
+            print("⚠️  No OpenAI API key found, using fallback generator...")
             review = generate_fallback_review(review_input)
-    else:
-        print("⚠️  No OpenAI API key found, using fallback generator...")
-        review = generate_fallback_review(review_input)
-    
-    print("\n📝 Generated Review:")
-    print("=" * 50)
-    print(review)
-    print("=" * 50)
-    
-    if not args.no_post:
-        # Post to mock platforms
-        print("\n📤 Posting to platforms...")
-        platform = MockPlatform("Demo Platform")
-        platform.login({"username": "cli_user", "password": "demo"})
-        business_id = platform.search_business(args.business, args.location)
-        result = platform.post_review(business_id, review, args.rating)
+
+        print("\n📝 Generated Review:")
+        print("=" * 50)
+        print(review)
+        print("=" * 50)
+        return review
+
+    if args.no_post:
+        generate()
+        return
+
+    # Post to mock platforms, looking the business up while generating
+    print("\n📤 Posting to platforms...")
+    with PlatformPool() as pool:
+        platform = pool.get(MockPlatform, {"username": "cli_user", "password": "demo"}, "Demo Platform")
+        review, report = generate_and_post(generate, [platform], args.business, args.location, args.rating)
+    if report.ok:
         print("✅ Review posted successfully!")
+    else:
+        for failure in report.failed:
+            print(f"❌ Posting to {failure.platform} failed: {failure.error}")
 
 def run_voice(args):
     """Process voice input."""
@@ -165,26 +464,152 @@ def run_voice(args):
     else:
         print(f"\n💬 Transcribed Text:\n{experience_text}")
 
-def generate_fallback_review(review_input):
-    """Generate a simple review without AI."""
-    rating_text = {
-        5: "Excellent experience!",
-        4: "Very good experience.",
-        3: "Good experience overall.",
-        2: "Okay experience, could be better.",
-        1: "Poor experience."
-    }
-    
-    review = f"I visited {review_input.business_name} and {review_input.experience_text} "
-    review += f"{rating_text.get(review_input.rating, 'Had an experience.')} "
-    review += f"I would rate this {review_input.rating} out of 5 stars."
-    
-    if review_input.rating >= 4:
-        review += " Highly recommended!"
-    elif review_input.rating <= 2:
-        review += " Hope they can improve."
-    
-    return review
+def run_batch(args):
+    """Generate and post reviews in bulk across worker processes."""
+    import json
+    from functools import partial
+    from review_agent.runner import ShardedRunner, build_platforms
+    
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    # (True, item) per parsed line; (False, its failed result) per unparsable one
+    entries = []
+    with open(args.input, 'r') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entries.append((True, json.loads(line)))
+            except ValueError as e:
+                entries.append((False, {'business_name': None, 'ok': False,
+                                        'error': f"line {number} is not valid JSON: {e}"}))
+    
+    platform_factory = partial(
+        build_platforms,
+        [name.strip() for name in args.platforms.split(',') if name.strip()],
+        args.local_directory
+    )
+    runner = ShardedRunner(
+        platform_factory,
+        workers=args.workers,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        timeout=args.timeout,
+        start_method=args.start_method
+    )
+    processed = iter(runner.run([entry for parsed, entry in entries if parsed]))
+    results = [next(processed) if parsed else entry for parsed, entry in entries]
+    
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+    finally:
+        if args.output:
+            output.close()
+    
+    failed = sum(1 for result in results if not result['ok'])
+    print(f"📦 Processed {len(results)} reviews with {runner.workers} workers ({failed} failed)", file=sys.stderr)
+
+def run_bench(args):
+    """Run the benchmark suite and print or save the JSON report."""
+    import json
+    from review_agent.bench import SCENARIOS, BenchmarkSuite, compare_reports
+    
+    # Measure the pipeline itself, not progress output
+    events.clear()
+    
+    scenarios = args.scenarios.split(',') if args.scenarios else SCENARIOS
+    suite = BenchmarkSuite(
+        iterations=args.iterations,
+        concurrency=args.concurrency,
+        llm_latency=args.llm_latency,
+        llm_jitter=args.llm_jitter,
+        trace_memory=args.bench_trace_memory
+    )
+    report = suite.run(scenarios)
+    
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_reports(baseline, report, args.threshold)
+        for regression in regressions:
+            print(f"📉 Regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("✅ No regressions against baseline", file=sys.stderr)
+
+def run_loadgen(args):
+    """Run the open-loop load generator and print or save the JSON report."""
+    import json
+    import tempfile
+    from contextlib import ExitStack
+    from review_agent.loadgen import LoadGenerator, format_summary
+    
+    # Measure the platform, not progress output
+    events.clear()
+    
+    with ExitStack() as stack:
+        if args.platform == 'mock':
+            reviews_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="review-agent-loadgen-"))
+            platform = MockPlatform("Load Test", reviews_dir=reviews_dir)
+        else:
+            from review_agent.platforms.local_directory import LocalDirectoryPlatform
+            url = args.local_directory
+            if not url:
+                from review_agent.directory_server import DirectoryServer
+                url = stack.enter_context(DirectoryServer(port=0)).url
+            platform = LocalDirectoryPlatform(url)
+        stack.callback(platform.close)
+        platform.login({"api_key": os.getenv("LOCAL_DIRECTORY_API_KEY", "loadgen")})
+        
+        generator = LoadGenerator(
+            platform,
+            rate=args.rate,
+            duration=args.duration,
+            arrival=args.arrival,
+            operation=args.operation,
+            max_in_flight=args.max_in_flight,
+            seed=args.seed,
+            window=args.window
+        )
+        report = generator.run()
+    
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    print(format_summary(report), file=sys.stderr)
+
+def run_serve_directory(args):
+    """Run the reference Local Directory server until interrupted."""
+    from review_agent.directory_server import DirectoryServer
+    
+    server = DirectoryServer(args.host, args.port, db_path=args.db, api_key=args.api_key, verbose=args.verbose)
+    print(f"📒 Local Directory API on {server.url} (database: {args.db}); Ctrl+C to stop", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+def run_debug(args):
+    """Signal a running process to dump stacks or toggle its profiler."""
+    from review_agent import diagnostics
+    
+    for pid, error in diagnostics.send_signal(args.pid, args.action, args.children).items():
+        if error:
+            print(f"❌ PID {pid}: {error}")
+        else:
+            print(f"🩺 Sent {args.action} request to PID {pid}; output goes to its --diagnostics directory")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
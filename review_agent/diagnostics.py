@@ -0,0 +1,281 @@
+"""
+Live diagnostics for long-running processes.
+
+Opt in with ``install_signal_handlers`` (or the CLI's ``--diagnostics DIR``):
+
+- ``SIGUSR1`` writes the stack of every thread, plus any asyncio tasks, to
+  ``DIR/review-agent-<pid>-stacks-<time>.txt``.
+- ``SIGUSR2`` starts a sampling profile; a second ``SIGUSR2`` (or the end of
+  the timed window) stops it and writes folded stacks to
+  ``DIR/review-agent-<pid>-profile-<time>.folded``, ready for flamegraph.pl
+  or speedscope.
+
+``review-agent debug dump PID`` and ``review-agent debug profile PID`` send
+these signals from the command line.
+"""
+
+import asyncio
+import gc
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Dict, List, Optional
+
+from . import events
+
+
+def _timestamp() -> str:
+    return time.strftime("%Y%m%d-%H%M%S")
+
+
+def format_thread_stacks() -> str:
+    """Return the current stack of every thread as text."""
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    sections = []
+    for ident, frame in sys._current_frames().items():
+        header = f'Thread {names.get(ident, "<unknown>")} (ident {ident})'
+        sections.append(header + "\n" + "".join(traceback.format_stack(frame)))
+    return "\n".join(sections)
+
+
+def format_asyncio_tasks() -> str:
+    """
+    Return the stacks of tasks on every running asyncio event loop.
+
+    Loops are found by scanning live objects, so this is only meant for
+    diagnostics. Reading another thread's loop is not thread-safe; a loop
+    that changes mid-read is reported as unreadable rather than failing the
+    dump.
+    """
+    sections = []
+    for obj in gc.get_objects():
+        if not isinstance(obj, asyncio.AbstractEventLoop) or not obj.is_running():
+            continue
+        try:
+            tasks = list(asyncio.all_tasks(obj))
+        except RuntimeError:
+            sections.append(f"Event loop {obj!r}: tasks changed while reading, try again")
+            continue
+        sections.append(f"Event loop {obj!r}: {len(tasks)} task(s)")
+        for task in tasks:
+            lines = [f"  {task!r}"]
+            for frame in task.get_stack():
+                lines.extend("    " + line for line in traceback.format_stack(frame)[-1:])
+            sections.append("\n".join(lines))
+    return "\n".join(sections) if sections else "No running asyncio event loops"
+
+
+def dump_stacks(output_dir: str) -> str:
+    """Write thread stacks and asyncio tasks to a file and return its path."""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"review-agent-{os.getpid()}-stacks-{_timestamp()}.txt")
+    with open(path, "w") as f:
+        f.write(f"# review-agent stack dump, pid {os.getpid()}, {time.ctime()}\n\n")
+        f.write("## Threads\n\n")
+        f.write(format_thread_stacks())
+        f.write("\n## asyncio tasks\n\n")
+        f.write(format_asyncio_tasks())
+        f.write("\n")
+    events.emit("diagnostics.dump", "🩺 Stack dump written to {path}", path=path)
+    return path
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler that samples every thread's stack on a timer.
+
+    Sampling runs on its own daemon thread, so it works while the main
+    thread is blocked in I/O, and costs nothing while stopped.
+    """
+
+    def __init__(self, output_dir: str, interval: float = 0.005, window: float = 30.0):
+        """
+        Args:
+            output_dir: Directory for the folded-stack output files
+            interval: Seconds between samples
+            window: Maximum profile length in seconds before stopping itself
+        """
+        self.output_dir = output_dir
+        self.interval = interval
+        self.window = window
+        self._samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.last_path: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def toggle(self):
+        """Start a profile window, or stop the running one."""
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self._samples = Counter()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+        events.emit("diagnostics.profile_start",
+                    "🩺 Sampling profile started (up to {window}s, every {interval}s)",
+                    window=self.window, interval=self.interval)
+
+    def stop(self):
+        # Don't join the sampler; it writes the output itself when it
+        # notices the stop flag
+        self._stop.set()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        deadline = time.monotonic() + self.window
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own_ident:
+                    self._samples[self._fold(names.get(ident, str(ident)), frame)] += 1
+            self._stop.wait(self.interval)
+        self.last_path = self._write()
+
+    @staticmethod
+    def _fold(thread_name: str, frame) -> str:
+        functions: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            functions.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        functions.append(thread_name)
+        return ";".join(reversed(functions))
+
+    def _write(self) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"review-agent-{os.getpid()}-profile-{_timestamp()}.folded")
+        with open(path, "w") as f:
+            for stack, count in self._samples.most_common():
+                f.write(f"{stack} {count}\n")
+        events.emit("diagnostics.profile_stop", "🩺 Sampling profile ({samples} samples) written to {path}",
+                    path=path, samples=sum(self._samples.values()))
+        return path
+
+
+_profiler: Optional[SamplingProfiler] = None
+# Actions requested by the signal handlers, served by the diagnostics thread
+_requests: Optional[queue.SimpleQueue] = None
+
+
+def _serve(requests: queue.SimpleQueue, output_dir: str):
+    while True:
+        action = requests.get()
+        try:
+            if action == "dump":
+                dump_stacks(output_dir)
+            else:
+                _profiler.toggle()
+        except Exception as e:
+            events.emit("diagnostics.error", "⚠️  Diagnostics {action} failed: {error}", action=action, error=str(e))
+
+
+def _start_diagnostics_thread(output_dir: str):
+    global _requests
+    _requests = queue.SimpleQueue()
+    threading.Thread(target=_serve, args=(_requests, output_dir), name="diagnostics", daemon=True).start()
+
+
+def install_signal_handlers(output_dir: str, window: float = 30.0, interval: float = 0.005) -> bool:
+    """
+    Install the SIGUSR1 (stack dump) and SIGUSR2 (profile toggle) handlers.
+
+    Must be called from the main thread. The handlers only queue the
+    request; a diagnostics thread does the file I/O and event reporting, so
+    a signal arriving while the main thread holds a lock (e.g. a listener's)
+    cannot deadlock it. Forked worker processes inherit the handlers, start
+    their own diagnostics thread and write files named with their own PID.
+
+    Returns:
+        bool: False on platforms without SIGUSR1/SIGUSR2 (e.g. Windows)
+    """
+    global _profiler
+    if not hasattr(signal, "SIGUSR1"):
+        return False
+
+    _profiler = SamplingProfiler(output_dir, interval=interval, window=window)
+    _start_diagnostics_thread(output_dir)
+    if hasattr(os, "register_at_fork"):
+        # Threads don't survive fork
+        os.register_at_fork(after_in_child=lambda: _start_diagnostics_thread(output_dir))
+    # SimpleQueue.put is safe to call from a signal handler
+    signal.signal(signal.SIGUSR1, lambda signum, frame: _requests.put("dump"))
+    signal.signal(signal.SIGUSR2, lambda signum, frame: _requests.put("profile"))
+    return True
+
+
+def child_pids(pid: int) -> List[int]:
+    """Return the direct children of a process (Linux only, else empty)."""
+    children: List[int] = []
+    task_dir = f"/proc/{pid}/task"
+    if not os.path.isdir(task_dir):
+        return children
+    for task in os.listdir(task_dir):
+        try:
+            with open(os.path.join(task_dir, task, "children")) as f:
+                children.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return children
+
+
+def catches_signal(pid: int, signum: int) -> Optional[bool]:
+    """
+    Return whether a process has a handler for ``signum``.
+
+    Reads the caught-signal mask from /proc, so the answer is None
+    (unknown) on other platforms.
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("SigCgt:"):
+                    return bool(int(line.split()[1], 16) & (1 << (signum - 1)))
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def send_signal(pid: int, action: str, include_children: bool = False) -> Dict[int, Optional[str]]:
+    """
+    Ask a running process to dump its stacks or toggle its profiler.
+
+    Args:
+        pid: Process ID started with ``--diagnostics``
+        action: ``dump`` (SIGUSR1) or ``profile`` (SIGUSR2)
+        include_children: Also signal worker processes (Linux only)
+
+    Returns:
+        Dict of PID to error message, or None if the signal was sent
+    """
+    signum = {"dump": signal.SIGUSR1, "profile": signal.SIGUSR2}[action]
+    pids = [pid] + (child_pids(pid) if include_children else [])
+    outcome: Dict[int, Optional[str]] = {}
+    for target in pids:
+        # The default action for SIGUSR1/2 is to terminate, so never signal a
+        # process that hasn't installed the handlers
+        if catches_signal(target, signum) is False:
+            outcome[target] = "no diagnostics handler installed (start it with --diagnostics); not signalled"
+            continue
+        try:
+            os.kill(target, signum)
+            outcome[target] = None
+        except OSError as e:
+            outcome[target] = str(e)
+    return outcome
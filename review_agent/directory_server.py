@@ -0,0 +1,433 @@
+"""
+Reference Local Directory server.
+
+A standard-library implementation of the REST API that
+``LocalDirectoryPlatform`` talks to, backed by SQLite. Use it for local
+testing (``review-agent serve-directory``), as the benchmark stand-in, or
+as a starting point for a real directory.
+
+Endpoints (JSON in and out):
+
+- ``GET  /api/businesses/search?name=&location=``: fuzzy name search over a
+  trigram index, best matches first, each with a similarity ``score``
+- ``POST /api/businesses``: create a business
+- ``GET  /api/businesses/{id}``: one business
+- ``GET  /api/businesses/{id}/reviews?limit=&cursor=&since=``: reviews,
+  oldest first, one page at a time; pass the returned ``next_cursor`` to get
+  the next page (while ``has_more``) or, saved after the last page, to get
+  only reviews added since; ``since`` filters by ``created_at`` instead
+- ``POST /api/businesses/{id}/reviews``: add a review
+- ``POST /api/reviews/batch``: add many reviews; answers 207 with one
+  result per review
+
+A review may carry an ``idempotency_key``: posting the same key again
+returns the review it created (status 200) instead of adding a duplicate.
+
+With an ``api_key``, requests must send ``Authorization: Bearer <key>``.
+Request bodies may be gzip-compressed. Successful GET responses carry an
+``ETag``; a request whose ``If-None-Match`` matches it gets an empty 304.
+"""
+
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from .storage import SQLiteStore
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Minimum trigram similarity (Jaccard) for a search result
+MIN_SIMILARITY = 0.3
+MAX_SEARCH_RESULTS = 10
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+
+def search_key(text: Optional[str]) -> str:
+    """Normalize text for matching: Unicode-folded, lowercase, no punctuation."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(_NON_WORD.sub("", text).split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of an already normalized string, padded at word edges."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class DirectoryStore(SQLiteStore):
+    """
+    Businesses and reviews in SQLite, plus an in-memory trigram index of
+    business names (rebuilt from the table on start) for fuzzy search.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS businesses ("
+        " id INTEGER PRIMARY KEY, name TEXT NOT NULL, name_key TEXT NOT NULL,"
+        " location TEXT NOT NULL, location_key TEXT NOT NULL, category TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS businesses_by_key ON businesses (name_key, location_key)",
+        "CREATE TABLE IF NOT EXISTS reviews ("
+        " id INTEGER PRIMARY KEY, business_id INTEGER NOT NULL, text TEXT NOT NULL,"
+        " rating INTEGER NOT NULL, author TEXT, date TEXT, created_at TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS reviews_by_business ON reviews (business_id, id)",
+        "CREATE INDEX IF NOT EXISTS reviews_by_created ON reviews (business_id, created_at, id)",
+        "CREATE TABLE IF NOT EXISTS review_keys ("
+        " idempotency_key TEXT PRIMARY KEY, review_id INTEGER NOT NULL)",
+    )
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        # trigram -> business IDs, and business ID -> (trigram count, row)
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._indexed: Dict[int, Tuple[int, tuple]] = {}
+        # name key -> business IDs, so exact lookups skip the fuzzy scoring
+        self._by_name: Dict[str, List[int]] = defaultdict(list)
+        for row in self.query("SELECT id, name, location, category, name_key, location_key FROM businesses"):
+            self._index(row)
+
+    def _index(self, row: tuple):
+        grams = trigrams(row[4])
+        with self._lock:
+            for gram in grams:
+                self._postings[gram].add(row[0])
+            self._indexed[row[0]] = (len(grams), row)
+            self._by_name[row[4]].append(row[0])
+
+    @staticmethod
+    def _business(row: tuple) -> Dict[str, Any]:
+        return {"id": str(row[0]), "name": row[1], "location": row[2], "category": row[3]}
+
+    @staticmethod
+    def _review(row: tuple) -> Dict[str, Any]:
+        return {
+            "id": f"review_{row[0]}", "business_id": str(row[1]), "text": row[2], "rating": row[3],
+            "author": row[4], "date": row[5], "created_at": row[6],
+        }
+
+    def create_business(self, name: str, location: str, category: str) -> Dict[str, Any]:
+        name_key, location_key = search_key(name), search_key(location)
+        with self.transaction() as connection:
+            cursor = connection.execute(
+                "INSERT INTO businesses (name, name_key, location, location_key, category)"
+                " VALUES (?, ?, ?, ?, ?)", (name, name_key, location, location_key, category))
+            row = (cursor.lastrowid, name, location, category, name_key, location_key)
+        # Only searchable once committed, so a rolled-back insert never shows up
+        self._index(row)
+        return self._business(row)
+
+    def get_business(self, business_id: str) -> Optional[Dict[str, Any]]:
+        rows = self.query("SELECT id, name, location, category FROM businesses WHERE id = ?", (business_id,))
+        return self._business(rows[0]) if rows else None
+
+    def search(self, name: str, location: Optional[str] = None,
+               limit: int = MAX_SEARCH_RESULTS) -> List[Dict[str, Any]]:
+        name_key = search_key(name)
+        location_key = search_key(location) if location else None
+        with self._lock:
+            exact = [self._indexed[business_id][1] for business_id in self._by_name.get(name_key, ())]
+        exact = [row for row in exact if location_key is None or row[5] == location_key]
+        if exact:
+            # The usual case, a business searched for by its own name
+            return [dict(self._business(row), score=1.0) for row in exact[:limit]]
+
+        grams = trigrams(name_key)
+        shared: Counter = Counter()
+        with self._lock:
+            for gram in grams:
+                shared.update(self._postings.get(gram, ()))
+            candidates = [(count, self._indexed[business_id]) for business_id, count in shared.items()]
+
+        matches = []
+        for count, (gram_count, row) in candidates:
+            if location_key is not None and row[5] != location_key:
+                continue
+            # Jaccard similarity of the two trigram sets
+            similarity = count / (len(grams) + gram_count - count)
+            if similarity >= MIN_SIMILARITY:
+                business = self._business(row)
+                business["score"] = round(similarity, 3)
+                matches.append(business)
+        matches.sort(key=lambda business: (-business["score"], int(business["id"])))
+        return matches[:limit]
+
+    def add_reviews(self, reviews: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Insert ``(business_id, review)`` pairs in one transaction; one result per review."""
+        seconds, nanoseconds = divmod(time.time_ns(), 10**9)
+        created_at = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)) + f".{nanoseconds:09d}Z"
+        results = []
+        with self.transaction() as connection:
+            for business_id, review in reviews:
+                error = _review_error(review)
+                if error is None and not connection.execute(
+                        "SELECT 1 FROM businesses WHERE id = ?", (business_id,)).fetchone():
+                    results.append({"status": 404, "error": f"unknown business {business_id}"})
+                    continue
+                if error is not None:
+                    results.append({"status": 422, "error": error})
+                    continue
+                key = review.get("idempotency_key")
+                if key:
+                    existing = connection.execute(
+                        "SELECT r.id, r.business_id, r.text, r.rating, r.author, r.date, r.created_at"
+                        " FROM review_keys k JOIN reviews r ON r.id = k.review_id"
+                        " WHERE k.idempotency_key = ?", (str(key),)).fetchone()
+                    if existing:
+                        results.append({"status": 200, "review": self._review(existing)})
+                        continue
+                row = (int(business_id), review["text"], int(review["rating"]),
+                       review.get("author"), review.get("date"), created_at)
+                cursor = connection.execute(
+                    "INSERT INTO reviews (business_id, text, rating, author, date, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)", row)
+                if key:
+                    connection.execute("INSERT INTO review_keys VALUES (?, ?)", (str(key), cursor.lastrowid))
+                results.append({"status": 201, "review": self._review((cursor.lastrowid,) + row)})
+        return results
+
+    def list_reviews(self, business_id: str, limit: int = DEFAULT_PAGE_SIZE,
+                     cursor: Optional[str] = None, since: Optional[str] = None) -> Dict[str, Any]:
+        sql = ("SELECT id, business_id, text, rating, author, date, created_at FROM reviews"
+               " WHERE business_id = ?")
+        params: List[Any] = [business_id]
+        if cursor:
+            sql += " AND id > ?"
+            params.append(int(cursor))
+        if since:
+            sql += " AND created_at > ?"
+            params.append(since)
+        sql += " ORDER BY id LIMIT ?"
+        # One extra row tells whether another page exists
+        params.append(limit + 1)
+
+        rows = self.query(sql, params)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            "reviews": [self._review(row) for row in rows],
+            # Also returned on the last page, as the resume point for a later sync
+            "next_cursor": str(rows[-1][0]) if rows else cursor,
+            "has_more": has_more,
+        }
+
+
+def _review_error(review: Any) -> Optional[str]:
+    if not isinstance(review, dict) or not isinstance(review.get("text"), str):
+        return "text is required"
+    try:
+        rating = int(review.get("rating"))
+    except (TypeError, ValueError):
+        return "rating must be an integer"
+    if not 1 <= rating <= 5:
+        return "rating must be between 1 and 5"
+    return None
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class DirectoryRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for a ``DirectoryStore`` (``self.server.store``)."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # client's delayed ACK adds ~40ms to every keep-alive request
+    disable_nagle_algorithm = True
+    server_version = "ReviewAgentDirectory/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: Any, method: str = "post"):
+        body = json.dumps(payload).encode("utf-8")
+        if method == "get" and status == 200:
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()[:20]
+            if etag in self.headers.get("If-None-Match", ""):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("ETag", etag)
+        else:
+            self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if self.headers.get("Content-Encoding") == "gzip":
+            try:
+                body = gzip.decompress(body)
+            except (OSError, EOFError, zlib.error):
+                raise _HTTPError(400, "request body is not valid gzip")
+        try:
+            return json.loads(body or b"{}")
+        except ValueError:
+            raise _HTTPError(400, "request body is not valid JSON")
+
+    def _check_auth(self):
+        api_key = self.server.api_key
+        if api_key and self.headers.get("Authorization") != f"Bearer {api_key}":
+            raise _HTTPError(401, "invalid or missing API key")
+
+    def _handle(self, method: str):
+        url = urlparse(self.path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            self._check_auth()
+            handler = getattr(self, f"_{method}_{self._route(parts)}", None)
+            if handler is None:
+                raise _HTTPError(405 if self._route(parts) != "not_found" else 404, "not found")
+            status, payload = handler(parts, query)
+        except _HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            # Answer instead of dropping the connection, and keep serving
+            self.log_error("%s %s failed: %r", method.upper(), self.path, e)
+            status, payload = 500, {"error": f"internal error: {type(e).__name__}"}
+        self._send_json(status, payload, method)
+
+    @staticmethod
+    def _route(parts: List[str]) -> str:
+        if parts[:2] != ["api", "businesses"] and parts != ["api", "reviews", "batch"]:
+            return "not_found"
+        if parts == ["api", "reviews", "batch"]:
+            return "batch"
+        if len(parts) == 2:
+            return "businesses"
+        if parts[2:] == ["search"]:
+            return "search"
+        if len(parts) == 3:
+            return "business"
+        if len(parts) == 4 and parts[3] == "reviews":
+            return "reviews"
+        return "not_found"
+
+    def do_GET(self):
+        self._handle("get")
+
+    def do_POST(self):
+        self._handle("post")
+
+    # Routes: (path parts, query) -> (status, payload)
+
+    def _get_search(self, parts, query):
+        name = query.get("name")
+        if not name:
+            raise _HTTPError(400, "name is required")
+        return 200, {"businesses": self.server.store.search(name, query.get("location"))}
+
+    def _post_businesses(self, parts, query):
+        data = self._read_json()
+        if not isinstance(data, dict) or not data.get("name") or not isinstance(data["name"], str):
+            raise _HTTPError(422, "name is required")
+        if not all(isinstance(data.get(field) or "", str) for field in ("location", "category")):
+            raise _HTTPError(422, "location and category must be strings")
+        business = self.server.store.create_business(
+            data["name"], data.get("location") or "Unknown Location", data.get("category") or "General Business")
+        return 201, business
+
+    def _get_business(self, parts, query):
+        business = self.server.store.get_business(parts[2])
+        if business is None:
+            raise _HTTPError(404, f"unknown business {parts[2]}")
+        return 200, business
+
+    def _get_reviews(self, parts, query):
+        if self.server.store.get_business(parts[2]) is None:
+            raise _HTTPError(404, f"unknown business {parts[2]}")
+        try:
+            limit = min(MAX_PAGE_SIZE, max(1, int(query.get("limit", DEFAULT_PAGE_SIZE))))
+            cursor = query.get("cursor")
+            if cursor is not None:
+                int(cursor)
+        except ValueError:
+            raise _HTTPError(400, "limit and cursor must be integers")
+        return 200, self.server.store.list_reviews(parts[2], limit, cursor, query.get("since"))
+
+    def _post_reviews(self, parts, query):
+        result = self.server.store.add_reviews([(parts[2], self._read_json())])[0]
+        if result["status"] >= 400:
+            raise _HTTPError(result["status"], result["error"])
+        return result["status"], result["review"]
+
+    def _post_batch(self, parts, query):
+        data = self._read_json()
+        reviews = data.get("reviews") if isinstance(data, dict) else None
+        if not isinstance(reviews, list):
+            raise _HTTPError(422, "reviews must be a list")
+        pairs = [(str(review.get("business_id")) if isinstance(review, dict) else "", review)
+                 for review in reviews]
+        return 207, {"results": self.server.store.add_reviews(pairs)}
+
+
+class DirectoryServer:
+    """
+    Run the reference directory, in the foreground or on a background thread.
+
+    Example:
+        with DirectoryServer(port=0) as server:
+            platform = LocalDirectoryPlatform(server.url)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8000, db_path: str = ":memory:",
+                 api_key: Optional[str] = None, verbose: bool = False):
+        """
+        Args:
+            host: Interface to bind
+            port: TCP port (0 picks a free one)
+            db_path: SQLite file, or ``:memory:`` for a throwaway directory
+            api_key: Require this bearer token on every request
+            verbose: Log every request to stderr
+        """
+        self.httpd = ThreadingHTTPServer((host, port), DirectoryRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.store = DirectoryStore(db_path)
+        self.httpd.api_key = api_key
+        self.httpd.verbose = verbose
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def store(self) -> DirectoryStore:
+        return self.httpd.store
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self):
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="directory-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.store.close()
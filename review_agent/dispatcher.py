@@ -0,0 +1,217 @@
+"""
+Concurrent multi-platform publishing.
+
+``PlatformDispatcher`` posts one review to several ``ReviewPlatform``
+instances at once, so publishing takes as long as the slowest platform
+rather than the sum of all of them.
+"""
+
+import contextvars
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from . import tracing
+from .platforms.base import ReviewPlatform, platform_label
+
+
+@dataclass
+class PlatformResult:
+    """Outcome of publishing a review to a single platform."""
+
+    platform: str
+    business_id: Optional[str] = None
+    result: Any = None
+    error: Optional[BaseException] = None
+    timed_out: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.timed_out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'platform': self.platform,
+            'business_id': self.business_id,
+            'ok': self.ok,
+            'timed_out': self.timed_out,
+            'error': repr(self.error) if self.error is not None else None,
+            'elapsed': round(self.elapsed, 6),
+        }
+
+
+@dataclass
+class DispatchReport:
+    """Per-platform results of one dispatch, in platform order."""
+
+    results: List[PlatformResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results)
+
+    @property
+    def succeeded(self) -> List[PlatformResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[PlatformResult]:
+        return [result for result in self.results if not result.ok]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'ok': self.ok,
+            'elapsed': round(self.elapsed, 6),
+            'results': [result.to_dict() for result in self.results],
+        }
+
+
+class PendingDispatch:
+    """
+    Handle for a dispatch that has been started but not yet collected.
+
+    The per-platform timeouts are measured from the moment ``wait`` is
+    called, so time spent overlapping with review generation is free.
+    """
+
+    def __init__(self, platforms: List[ReviewPlatform], futures: List[Future],
+                 timeouts: List[float]):
+        self._platforms = platforms
+        self._futures = futures
+        self._timeouts = timeouts
+
+    def wait(self) -> DispatchReport:
+        """Wait for every platform, honouring each platform's timeout."""
+        started = time.monotonic()
+        results = []
+
+        for platform, future, timeout in zip(self._platforms, self._futures, self._timeouts):
+            remaining = max(0.0, started + timeout - time.monotonic())
+            try:
+                results.append(future.result(timeout=remaining))
+            except FutureTimeoutError:
+                # The worker thread cannot be interrupted; it finishes in the
+                # background and its result is discarded.
+                tracing.instant("platform_timeout", platform=platform_label(platform), timeout=timeout)
+                results.append(PlatformResult(
+                    platform=platform_label(platform),
+                    timed_out=True,
+                    error=TimeoutError(f"{platform_label(platform)} did not respond within {timeout}s"),
+                    elapsed=time.monotonic() - started
+                ))
+
+        return DispatchReport(results=results, elapsed=time.monotonic() - started)
+
+
+class PlatformDispatcher:
+    """
+    Post a review to several platforms concurrently.
+
+    Each platform runs ``search_business`` (unless a business ID is
+    supplied) followed by ``post_review`` on a worker thread. Failures and
+    timeouts are reported per platform instead of aborting the whole
+    dispatch.
+
+    Example:
+        with PlatformDispatcher(platforms, timeout=10) as dispatcher:
+            report = dispatcher.dispatch(review, 5, "Joe's Pizza", "New York")
+            for result in report.failed:
+                print(result.platform, result.error)
+    """
+
+    def __init__(self, platforms: Sequence[ReviewPlatform], timeout: float = 30.0,
+                 timeouts: Optional[Dict[str, float]] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            platforms: Logged-in platforms to publish to
+            timeout: Default per-platform timeout in seconds
+            timeouts: Optional per-platform overrides keyed by platform name
+            max_workers: Thread pool size, defaults to two per platform
+        """
+        self.platforms = list(platforms)
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(1, 2 * len(self.platforms)),
+            thread_name_prefix="review-dispatch"
+        )
+
+    def timeout_for(self, platform: ReviewPlatform) -> float:
+        return self.timeouts.get(platform_label(platform), self.timeout)
+
+    def start(self, review: Union[str, Future], rating: int,
+              business_name: Optional[str] = None, location: Optional[str] = None,
+              business_ids: Optional[Dict[str, str]] = None) -> PendingDispatch:
+        """
+        Start publishing without waiting for the results.
+
+        Args:
+            review: Review text, or a ``Future`` that will resolve to it.
+                Business lookups start immediately; posts wait for the text.
+            rating: Rating 1-5
+            business_name: Business to search for on each platform
+            location: Optional location passed to ``search_business``
+            business_ids: Optional known business IDs keyed by platform name,
+                which skip ``search_business`` for those platforms
+
+        Returns:
+            PendingDispatch: call ``wait()`` to collect the report
+        """
+        business_ids = business_ids or {}
+        # Run each platform in a copy of the caller's context so the
+        # correlation ID follows the review onto the worker threads
+        futures = [
+            self._executor.submit(
+                contextvars.copy_context().run,
+                self._publish, platform, review, rating, business_name, location,
+                business_ids.get(platform_label(platform))
+            )
+            for platform in self.platforms
+        ]
+        timeouts = [self.timeout_for(platform) for platform in self.platforms]
+        return PendingDispatch(self.platforms, futures, timeouts)
+
+    def dispatch(self, review: Union[str, Future], rating: int,
+                 business_name: Optional[str] = None, location: Optional[str] = None,
+                 business_ids: Optional[Dict[str, str]] = None) -> DispatchReport:
+        """Publish to every platform and wait for the per-platform report."""
+        return self.start(review, rating, business_name, location, business_ids).wait()
+
+    def _publish(self, platform: ReviewPlatform, review: Union[str, Future], rating: int,
+                 business_name: Optional[str], location: Optional[str],
+                 business_id: Optional[str]) -> PlatformResult:
+        started = time.monotonic()
+        outcome = PlatformResult(platform=platform_label(platform), business_id=business_id)
+        try:
+            if outcome.business_id is None:
+                if business_name is None:
+                    raise ValueError("Either business_name or a business ID is required")
+                outcome.business_id = platform.search_business(business_name, location)
+            if isinstance(review, Future):
+                # Shows up in traces as the time this platform sat idle
+                # waiting for generation to finish
+                with tracing.span("await_review", platform=outcome.platform):
+                    review_text = review.result()
+            else:
+                review_text = review
+            outcome.result = platform.post_review(outcome.business_id, review_text, rating)
+        except Exception as e:
+            outcome.error = e
+        outcome.elapsed = time.monotonic() - started
+        return outcome
+
+    def close(self, wait: bool = True):
+        """Shut down the worker threads."""
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Don't block on threads still stuck in a timed-out platform call
+        self.close(wait=False)
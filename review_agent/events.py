@@ -0,0 +1,149 @@
+"""
+Structured progress events.
+
+Platforms, the agent and the voice processor report progress by emitting
+named events instead of printing. Nothing is printed unless a listener has
+been subscribed, and ``emit`` returns straight away when there are no
+listeners, so library users and bulk workers pay almost nothing for it.
+
+Example:
+    from review_agent import events
+
+    events.subscribe(events.ConsoleListener())     # emoji progress lines
+    events.subscribe(events.JsonListener())        # JSON Lines on stderr
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TextIO, Tuple
+
+
+class Event:
+    """A single progress event."""
+
+    __slots__ = ('name', 'message', 'fields', 'timestamp')
+
+    def __init__(self, name: str, message: str, fields: Dict[str, Any]):
+        self.name = name
+        self.message = message
+        self.fields = fields
+        self.timestamp = time.time()
+
+    def render(self) -> str:
+        """Format the human-readable message with the event's fields."""
+        return self.message.format(**self.fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'ts': self.timestamp,
+            'event': self.name,
+            'pid': os.getpid(),
+            'thread': threading.current_thread().name,
+        }
+        data.update(self.fields)
+        return data
+
+
+Listener = Callable[[Event], None]
+
+# Replaced rather than mutated so emit() can read it without taking a lock
+_listeners: Tuple[Listener, ...] = ()
+_listeners_lock = threading.Lock()
+
+
+def subscribe(listener: Listener) -> Listener:
+    """Register a listener and return it (handy for a later unsubscribe)."""
+    global _listeners
+    with _listeners_lock:
+        _listeners = _listeners + (listener,)
+    return listener
+
+
+def unsubscribe(listener: Listener):
+    """Remove a previously registered listener."""
+    global _listeners
+    with _listeners_lock:
+        _listeners = tuple(existing for existing in _listeners if existing is not listener)
+
+
+def clear():
+    """Remove all listeners."""
+    global _listeners
+    with _listeners_lock:
+        _listeners = ()
+
+
+def enabled() -> bool:
+    """Return True if anyone is listening for events."""
+    return bool(_listeners)
+
+
+def emit(name: str, message: str = "", **fields: Any):
+    """
+    Emit an event to every listener.
+
+    Args:
+        name: Dotted event name, e.g. ``platform.post_review``
+        message: ``str.format`` template for console output, filled in
+            from ``fields`` only if a listener renders it
+        **fields: Structured event data
+    """
+    listeners = _listeners
+    if not listeners:
+        return
+
+    event = Event(name, message, fields)
+    for listener in listeners:
+        listener(event)
+
+
+class ConsoleListener:
+    """Print each event's human-readable message with one write per event."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event):
+        if not event.message:
+            return
+        stream = self.stream or sys.stdout
+        text = event.render() + "\n"
+        with self._lock:
+            stream.write(text)
+            stream.flush()
+
+
+class JsonListener:
+    """Write each event as a JSON object on its own line (stderr by default)."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event):
+        stream = self.stream or sys.stderr
+        line = json.dumps(event.to_dict(), default=str) + "\n"
+        with self._lock:
+            stream.write(line)
+            stream.flush()
+
+
+class LoggingListener:
+    """Forward events to the ``review_agent`` logger."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("review_agent")
+        self.level = level
+
+    def __call__(self, event: Event):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(
+                self.level,
+                event.render() if event.message else event.name,
+                extra={'event': event.name, 'event_fields': event.fields}
+            )
@@ -0,0 +1,158 @@
+"""
+Fault injection for ``MockPlatform``.
+
+A ``FaultProfile`` makes the mock behave like a real, imperfect platform so
+load tests exercise timeouts, retries and backpressure offline:
+
+- latency drawn from a distribution (constant, uniform, normal, lognormal
+  or exponential) before every call
+- a random error rate (``PlatformUnavailableError``)
+- a token-bucket rate limit answered with ``RateLimitError`` carrying a
+  ``retry_after`` hint
+- periodic outages: the last ``outage_duration`` seconds of every
+  ``outage_every`` seconds, so a run starts healthy
+
+Draws come from a generator seeded with ``seed`` and the platform name, so
+a single-threaded run is reproducible (with threads, the order of calls
+still varies). Profiles can be written as a compact spec:
+
+    MockPlatform("Yelp", faults=FaultProfile.parse(
+        "latency=lognormal:0.08:0.5,error_rate=0.02,rate_limit=50:10,outage=60:5,seed=7"))
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, fields
+from typing import Optional
+
+from . import tracing
+from .platforms.base import PlatformUnavailableError, RateLimitError
+from .ratelimit import TokenBucket
+
+LATENCY_DISTRIBUTIONS = ("none", "constant", "uniform", "normal", "lognormal", "exponential")
+
+
+@dataclass
+class FaultProfile:
+    """
+    What to inject. Latency parameters by distribution:
+
+    - constant: ``latency_a`` seconds
+    - uniform: between ``latency_a`` and ``latency_b``
+    - normal: mean ``latency_a``, standard deviation ``latency_b``
+    - lognormal: median ``latency_a``, shape (sigma) ``latency_b``
+    - exponential: mean ``latency_a``
+    """
+
+    latency: str = "none"
+    latency_a: float = 0.0
+    latency_b: float = 0.0
+    # Probability (0-1) that a call fails with PlatformUnavailableError
+    error_rate: float = 0.0
+    # Calls per second before RateLimitError, and the burst allowed
+    rate_limit: Optional[float] = None
+    rate_limit_burst: Optional[float] = None
+    # Seconds between outage starts, and how long each lasts
+    outage_every: float = 0.0
+    outage_duration: float = 0.0
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if self.latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency must be one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+        if not 0.0 <= self.error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        if self.outage_duration and self.outage_every <= self.outage_duration:
+            raise ValueError("outage_every must be longer than outage_duration")
+
+    @classmethod
+    def parse(cls, spec: str) -> "FaultProfile":
+        """
+        Build a profile from ``key=value`` pairs separated by commas.
+
+        Keys: ``latency=DIST:A[:B]``, ``error_rate=P``,
+        ``rate_limit=RATE[:BURST]``, ``outage=EVERY:DURATION``, ``seed=N``,
+        or any field name.
+        """
+        values = {}
+        names = {field.name for field in fields(cls)}
+        for part in filter(None, (part.strip() for part in spec.split(","))):
+            key, _, value = part.partition("=")
+            key, args = key.strip(), value.strip().split(":")
+            try:
+                if key == "latency":
+                    values["latency"] = args[0]
+                    values.update(zip(("latency_a", "latency_b"), map(float, args[1:3])))
+                elif key == "rate_limit":
+                    values.update(zip(("rate_limit", "rate_limit_burst"), map(float, args[:2])))
+                elif key == "outage":
+                    values["outage_every"], values["outage_duration"] = map(float, args)
+                elif key == "seed":
+                    values["seed"] = int(value)
+                elif key in names:
+                    values[key] = float(value)
+                else:
+                    raise ValueError(f"unknown fault option {key!r}")
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"invalid fault spec {part!r}: {e}") from None
+        return cls(**values)
+
+
+class FaultInjector:
+    """Applies one ``FaultProfile`` to the calls of one platform instance."""
+
+    def __init__(self, profile: FaultProfile, name: str = ""):
+        self.profile = profile
+        self.name = name
+        seed = None if profile.seed is None else f"{profile.seed}:{name}"
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._bucket = (TokenBucket(profile.rate_limit, profile.rate_limit_burst)
+                        if profile.rate_limit else None)
+
+    def _latency(self) -> float:
+        profile, draw = self.profile, self._random
+        if profile.latency == "constant":
+            return profile.latency_a
+        if profile.latency == "uniform":
+            return draw.uniform(profile.latency_a, profile.latency_b)
+        if profile.latency == "normal":
+            return max(0.0, draw.gauss(profile.latency_a, profile.latency_b))
+        if profile.latency == "lognormal":
+            return draw.lognormvariate(0.0, profile.latency_b) * profile.latency_a
+        if profile.latency == "exponential":
+            return draw.expovariate(1.0 / profile.latency_a) if profile.latency_a > 0 else 0.0
+        return 0.0
+
+    def before_call(self, operation: str):
+        """
+        Sleep and maybe raise, as the platform would for ``operation``.
+
+        Raises:
+            PlatformUnavailableError: During an outage or for an injected error
+            RateLimitError: Over the rate limit
+        """
+        profile = self.profile
+        if profile.outage_duration:
+            into_period = (time.monotonic() - self._started) % profile.outage_every
+            if into_period >= profile.outage_every - profile.outage_duration:
+                tracing.instant("fault_outage", platform=self.name, operation=operation)
+                raise PlatformUnavailableError(
+                    f"{self.name} is down (injected outage, {profile.outage_every - into_period:.1f}s left)")
+
+        if self._bucket is not None and not self._bucket.try_acquire():
+            retry_after = max(self._bucket.delay(), 0.001)
+            tracing.instant("fault_rate_limited", platform=self.name, operation=operation)
+            raise RateLimitError(f"{self.name} rate limit exceeded (injected); retry after {retry_after:.3f}s",
+                                 retry_after=retry_after)
+
+        with self._lock:
+            latency = self._latency()
+            failed = profile.error_rate and self._random.random() < profile.error_rate
+        if latency > 0:
+            time.sleep(latency)
+        if failed:
+            tracing.instant("fault_error", platform=self.name, operation=operation)
+            raise PlatformUnavailableError(f"{self.name} {operation} failed (injected error)")
@@ -0,0 +1,225 @@
+"""
+Local Graph API stand-in.
+
+A small in-memory imitation of the parts of the Facebook Graph API that
+``FacebookPlatform`` uses, for tests and offline runs. Point the platform's
+``base_url`` at it:
+
+    with GraphServer(access_token="test-token") as graph:
+        graph.add_page("Joe's Pizza", "New York")
+        facebook = FacebookPlatform(base_url=graph.url)
+        facebook.login({"access_token": "test-token"})
+
+Endpoints (an optional ``/v18.0``-style version prefix is ignored):
+
+- ``GET  /me``: the token's user
+- ``GET  /search?q=&type=page&fields=&limit=``: pages whose name and
+  location contain every word of ``q``
+- ``GET  /{page_id}?fields=``: one page, or a Graph error (400, code 100)
+- ``POST /{page_id}/recommendations`` and ``POST /me/feed``: accept a post
+- ``POST /`` with a ``batch`` form field: run up to ``MAX_BATCH_SIZE``
+  GET sub-requests and answer one ``{code, headers, body}`` per request
+
+An invalid token is answered with 401. ``batch_sizes`` records every batch
+call, and ``complete_limit`` makes batches answer ``null`` for the
+sub-requests after that many, as Graph does for ones it did not get to.
+"""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+# Graph's limit on sub-requests per batch call
+MAX_BATCH_SIZE = 50
+
+_VERSION = re.compile(r"^v\d+(\.\d+)?$")
+
+Response = Tuple[int, Any]
+
+
+def _graph_error(status: int, message: str, code: int, error_type: str = "GraphMethodException") -> Response:
+    return status, {"error": {"message": message, "type": error_type, "code": code}}
+
+
+class GraphState:
+    """Pages, posts and batch calls seen by one ``GraphServer``."""
+
+    def __init__(self, access_token: Optional[str] = None):
+        self.access_token = access_token
+        self.user = {"id": "100000000000001", "name": "Graph Test User"}
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.posts: List[Dict[str, Any]] = []
+        self.batch_sizes: List[int] = []
+        self.complete_limit: Optional[int] = None
+        self._next_id = 200000000000001
+        self._lock = threading.Lock()
+
+    def add_page(self, name: str, location: Optional[str] = None, category: str = "Local Business") -> str:
+        with self._lock:
+            page_id = str(self._next_id)
+            self._next_id += 1
+            self.pages[page_id] = {"id": page_id, "name": name, "location": {"city": location} if location else {},
+                                   "category": category}
+        return page_id
+
+    def _authorized(self, token: Optional[str]) -> bool:
+        return bool(token) and (self.access_token is None or token == self.access_token)
+
+    def get(self, parts: List[str], query: Dict[str, str]) -> Response:
+        """Answer a GET for path ``parts``; also used for batch sub-requests."""
+        if not self._authorized(query.get("access_token")):
+            return _graph_error(401, "Invalid OAuth access token.", 190, "OAuthException")
+        if parts == ["me"]:
+            return 200, dict(self.user)
+        if parts == ["search"]:
+            return self._search(query)
+        if len(parts) == 1:
+            page = self.pages.get(parts[0])
+            if page is None:
+                return _graph_error(400, f"Unsupported get request. Object with ID '{parts[0]}' does not exist", 100)
+            return 200, self._fields(page, query.get("fields"))
+        return _graph_error(400, "Unknown path components", 2500, "OAuthException")
+
+    def _search(self, query: Dict[str, str]) -> Response:
+        if query.get("type") != "page":
+            return _graph_error(400, "Unsupported search type", 100)
+        words = query.get("q", "").casefold().split()
+        limit = int(query.get("limit") or 25)
+        with self._lock:
+            pages = list(self.pages.values())
+        matches = []
+        for page in pages:
+            text = f"{page['name']} {page['location'].get('city', '')}".casefold()
+            if words and all(word in text for word in words):
+                matches.append(self._fields(page, query.get("fields")))
+        return 200, {"data": matches[:limit]}
+
+    @staticmethod
+    def _fields(page: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+        if not fields:
+            return {"id": page["id"], "name": page["name"]}
+        names = [name.strip() for name in fields.split(",")]
+        return {name: page[name] for name in names if name in page}
+
+    def post(self, parts: List[str], form: Dict[str, str]) -> Response:
+        if not self._authorized(form.get("access_token")):
+            return _graph_error(401, "Invalid OAuth access token.", 190, "OAuthException")
+        if not parts:
+            return self._batch(form)
+        if parts == ["me", "feed"] or (len(parts) == 2 and parts[1] == "recommendations" and parts[0] in self.pages):
+            with self._lock:
+                post_id = f"{parts[0]}_{len(self.posts) + 1}"
+                self.posts.append(dict(form, id=post_id, target="/".join(parts)))
+            return 200, {"id": post_id}
+        return _graph_error(400, "Unsupported post request", 100)
+
+    def _batch(self, form: Dict[str, str]) -> Response:
+        try:
+            requests = json.loads(form.get("batch") or "")
+        except ValueError:
+            return _graph_error(400, "The batch parameter must be a JSON array", 100)
+        if not isinstance(requests, list):
+            return _graph_error(400, "The batch parameter must be a JSON array", 100)
+        if len(requests) > MAX_BATCH_SIZE:
+            return _graph_error(400, f"Too many requests in batch message. Maximum batch size is {MAX_BATCH_SIZE}", 1)
+        with self._lock:
+            self.batch_sizes.append(len(requests))
+
+        answers: List[Optional[Dict[str, Any]]] = []
+        for index, request in enumerate(requests):
+            if self.complete_limit is not None and index >= self.complete_limit:
+                answers.append(None)
+                continue
+            url = urlparse(request.get("relative_url", "")) if isinstance(request, dict) else urlparse("")
+            if not isinstance(request, dict) or request.get("method", "GET").upper() != "GET":
+                status, body = _graph_error(400, "Only GET sub-requests are supported", 100)
+            else:
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                query.setdefault("access_token", form.get("access_token"))
+                status, body = self.get(_path_parts(url.path), query)
+            answers.append({"code": status, "headers": [], "body": json.dumps(body)})
+        return 200, answers
+
+
+def _path_parts(path: str) -> List[str]:
+    parts = [unquote(part) for part in path.strip("/").split("/") if part]
+    if parts and _VERSION.match(parts[0]):
+        parts = parts[1:]
+    return parts
+
+
+class GraphRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for a ``GraphState`` (``self.server.state``)."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "ReviewAgentGraph/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Any):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self._send_json(*self.server.state.get(_path_parts(url.path), query))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8")
+        form = {key: values[-1] for key, values in parse_qs(body, keep_blank_values=True).items()}
+        self._send_json(*self.server.state.post(_path_parts(url.path), form))
+
+
+class GraphServer:
+    """
+    Run the Graph stand-in on a background thread.
+
+    Example:
+        with GraphServer() as graph:
+            page_id = graph.add_page("Joe's Pizza")
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, access_token: Optional[str] = None):
+        """
+        Args:
+            host: Interface to bind
+            port: TCP port (0 picks a free one)
+            access_token: Accept only this token (default: any)
+        """
+        self.httpd = ThreadingHTTPServer((host, port), GraphRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = GraphState(access_token)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def state(self) -> GraphState:
+        return self.httpd.state
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v18.0"
+
+    def add_page(self, name: str, location: Optional[str] = None, category: str = "Local Business") -> str:
+        return self.state.add_page(name, location, category)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="graph-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
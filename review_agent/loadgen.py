@@ -0,0 +1,245 @@
+"""
+Open-loop load generator for the platform layer.
+
+``bench`` runs a fixed number of operations at a fixed concurrency, so a
+slow platform simply lowers the request rate (closed loop). Capacity
+planning needs the opposite question: what happens at a given arrival
+rate? ``LoadGenerator`` sends requests on a schedule that does not wait for
+earlier ones:
+
+- arrivals are constant (every ``1/rate`` seconds) or Poisson (exponential
+  gaps with mean ``1/rate``)
+- each request is timed from its scheduled arrival, not from when a worker
+  got to it, so queueing behind a stalled platform counts as latency
+  (coordinated-omission correction); the uncorrected service time is
+  reported next to it
+- results are also bucketed by arrival time into a timeline of completions,
+  errors by type and latency percentiles
+
+    platform = MockPlatform("Load", faults=FaultProfile.parse("latency=lognormal:0.05:0.5"))
+    platform.login({})
+    report = LoadGenerator(platform, rate=200, duration=30).run()
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .bench import SAMPLE_REVIEW, percentile
+from .platforms.base import RateLimitError, ReviewPlatform, platform_label
+
+ARRIVALS = ("poisson", "constant")
+OPERATIONS = ("post_review", "search_business", "search_and_post")
+
+# (scheduled, started, finished) offsets in seconds from the run start, and
+# the error type name or None
+Sample = Tuple[float, float, float, Optional[str]]
+
+
+def _latency_ms(sorted_values: List[float]) -> Dict[str, float]:
+    return {
+        "p50": round(percentile(sorted_values, 50) * 1000, 3),
+        "p90": round(percentile(sorted_values, 90) * 1000, 3),
+        "p99": round(percentile(sorted_values, 99) * 1000, 3),
+        "p999": round(percentile(sorted_values, 99.9) * 1000, 3),
+        "max": round(sorted_values[-1] * 1000, 3) if sorted_values else 0.0,
+    }
+
+
+class LoadGenerator:
+    """Drive one platform at a target request rate and record what it sustains."""
+
+    def __init__(self, platform: ReviewPlatform, rate: float, duration: float,
+                 arrival: str = "poisson", operation: str = "post_review",
+                 max_in_flight: int = 256, businesses: int = 100,
+                 location: Optional[str] = "New York", seed: Optional[int] = None,
+                 window: float = 1.0):
+        """
+        Args:
+            platform: Logged-in platform to load
+            rate: Target arrivals per second
+            duration: Seconds to keep sending
+            arrival: "poisson" or "constant"
+            operation: "post_review", "search_business" or "search_and_post"
+            max_in_flight: Worker threads; arrivals beyond them wait in a
+                queue, and that wait counts as latency
+            businesses: Distinct businesses the requests cycle through
+            location: Location passed to ``search_business``
+            seed: Seed for Poisson arrivals
+            window: Timeline bucket width in seconds
+        """
+        if rate <= 0 or duration <= 0:
+            raise ValueError("rate and duration must be positive")
+        if arrival not in ARRIVALS:
+            raise ValueError(f"arrival must be one of {', '.join(ARRIVALS)}")
+        if operation not in OPERATIONS:
+            raise ValueError(f"operation must be one of {', '.join(OPERATIONS)}")
+        self.platform = platform
+        self.rate = rate
+        self.duration = duration
+        self.arrival = arrival
+        self.operation = operation
+        self.max_in_flight = max_in_flight
+        self.names = [f"Load Test Business {i}" for i in range(businesses)]
+        self.location = location
+        self.seed = seed
+        self.window = window
+        self._business_ids: List[str] = []
+
+    def arrivals(self) -> Iterator[float]:
+        """Scheduled send times, in seconds from the start, within ``duration``."""
+        draw = random.Random(self.seed)
+        offset, count = 0.0, 0
+        while True:
+            if self.arrival == "constant":
+                offset = count / self.rate
+            else:
+                offset += draw.expovariate(self.rate)
+            if offset >= self.duration:
+                return
+            yield offset
+            count += 1
+
+    def _operation(self) -> Callable[[int], Any]:
+        platform, names, location = self.platform, self.names, self.location
+        if self.operation == "search_business":
+            return lambda i: platform.search_business(names[i % len(names)], location)
+        if self.operation == "search_and_post":
+            return lambda i: platform.post_review(
+                platform.search_business(names[i % len(names)], location), SAMPLE_REVIEW, i % 5 + 1)
+
+        ids = self._business_ids
+        return lambda i: platform.post_review(ids[i % len(ids)], SAMPLE_REVIEW, i % 5 + 1)
+
+    def _prepare(self, attempts: int = 20):
+        """Resolve business IDs up front so posts measure only posting."""
+        if self.operation != "post_review" or self._business_ids:
+            return
+        for name in self.names:
+            for attempt in range(attempts):
+                try:
+                    self._business_ids.append(self.platform.search_business(name, self.location))
+                    break
+                except RateLimitError as e:
+                    time.sleep(e.retry_after)
+                except Exception:
+                    # Injected errors and outages; the platform may recover
+                    if attempt + 1 == attempts:
+                        raise
+                    time.sleep(0.1 * (attempt + 1))
+
+    def run(self) -> Dict[str, Any]:
+        """Send the load and return the JSON-serializable report."""
+        self._prepare()
+        operation = self._operation()
+        samples: List[Sample] = []
+        lock = threading.Lock()
+        in_queue = 0
+        max_queue = 0
+
+        def call(i: int, scheduled: float, started_at: float):
+            nonlocal in_queue
+            started = time.perf_counter()
+            with lock:
+                in_queue -= 1
+            error = None
+            try:
+                operation(i)
+            except Exception as e:
+                error = type(e).__name__
+            finished = time.perf_counter()
+            with lock:
+                samples.append((scheduled, started - started_at, finished - started_at, error))
+
+        sent = 0
+        scheduler_lag = 0.0
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="loadgen") as executor:
+            started_at = time.perf_counter()
+            for i, offset in enumerate(self.arrivals()):
+                delay = started_at + offset - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    scheduler_lag = max(scheduler_lag, -delay)
+                with lock:
+                    in_queue += 1
+                    max_queue = max(max_queue, in_queue)
+                executor.submit(call, i, offset, started_at)
+                sent += 1
+            sending_finished = time.perf_counter() - started_at
+        finished = time.perf_counter() - started_at
+
+        return self._report(samples, sent, sending_finished, finished, max_queue, scheduler_lag)
+
+    def _report(self, samples: List[Sample], sent: int, sending: float, finished: float,
+                max_queue: int, scheduler_lag: float) -> Dict[str, Any]:
+        latencies = sorted(done - scheduled for scheduled, _start, done, _error in samples)
+        service = sorted(done - start for _scheduled, start, done, _error in samples)
+        errors = Counter(error for *_times, error in samples if error)
+
+        buckets: Dict[int, List[Sample]] = {}
+        for sample in samples:
+            buckets.setdefault(int(sample[0] // self.window), []).append(sample)
+        timeline = []
+        for index in range(int(self.duration // self.window) + (self.duration % self.window > 0)):
+            bucket = buckets.get(index, [])
+            bucket_latencies = sorted(done - scheduled for scheduled, _start, done, _error in bucket)
+            bucket_errors = Counter(error for *_times, error in bucket if error)
+            timeline.append({
+                "t": round(index * self.window, 3),
+                "sent": len(bucket),
+                "ok": len(bucket) - sum(bucket_errors.values()),
+                "errors": dict(bucket_errors),
+                "p50_ms": round(percentile(bucket_latencies, 50) * 1000, 3),
+                "p99_ms": round(percentile(bucket_latencies, 99) * 1000, 3),
+            })
+
+        completed = len(samples) - sum(errors.values())
+        return {
+            "meta": {
+                "platform": platform_label(self.platform),
+                "operation": self.operation,
+                "arrival": self.arrival,
+                "target_rate": self.rate,
+                "duration_s": self.duration,
+                "max_in_flight": self.max_in_flight,
+                "seed": self.seed,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+            "summary": {
+                "sent": sent,
+                "ok": completed,
+                "errors": dict(errors),
+                "error_rate": round(sum(errors.values()) / len(samples), 4) if samples else 0.0,
+                "offered_rate": round(sent / sending, 2) if sending > 0 else None,
+                "achieved_rate": round(completed / finished, 2) if finished > 0 else None,
+                "drain_s": round(finished - sending, 3),
+                "max_queued": max_queue,
+                "scheduler_lag_ms": round(scheduler_lag * 1000, 3),
+                # From scheduled arrival: includes time queued for a worker
+                "latency_ms": _latency_ms(latencies),
+                # From the moment a worker started the call
+                "service_time_ms": _latency_ms(service),
+            },
+            "timeline": timeline,
+        }
+
+
+def format_summary(report: Dict[str, Any]) -> str:
+    """One-screen text summary of a load report."""
+    meta, summary = report["meta"], report["summary"]
+    latency, service = summary["latency_ms"], summary["service_time_ms"]
+    lines = [
+        f"{meta['platform']} {meta['operation']}: {meta['arrival']} arrivals at {meta['target_rate']}/s "
+        f"for {meta['duration_s']}s",
+        f"  sent {summary['sent']} (offered {summary['offered_rate']}/s), ok {summary['ok']} "
+        f"(achieved {summary['achieved_rate']}/s), max queued {summary['max_queued']}",
+        f"  latency    p50 {latency['p50']}ms  p99 {latency['p99']}ms  p99.9 {latency['p999']}ms  max {latency['max']}ms",
+        f"  service    p50 {service['p50']}ms  p99 {service['p99']}ms  p99.9 {service['p999']}ms  max {service['max']}ms",
+    ]
+    if summary["errors"]:
+        lines.append("  errors     " + ", ".join(f"{name} {count}" for name, count in sorted(summary["errors"].items())))
+    return "\n".join(lines)
@@ -0,0 +1,229 @@
+"""
+Memory tracing for the CLI's ``--trace-memory`` option and ``bench --trace-memory``.
+
+``MemoryTracer`` runs tracemalloc for the whole run and hooks into the
+pipeline's stage boundaries (see ``metrics.add_stage_hook``). It reports:
+
+- per-stage calls, peak traced memory while the stage ran, and net growth
+  left behind after it returned (the number to watch when RSS climbs
+  during a long batch)
+- a timeline of traced memory sampled at stage boundaries
+- the top allocation sites still alive at the end of the run, and at the
+  highest snapshot taken during it
+
+tracemalloc slows allocation-heavy code down noticeably, so timings from a
+traced run should not be compared with untraced ones. Only the current
+process is traced; run batches with ``--workers 1`` to see worker memory.
+
+Python 3.8 has no ``tracemalloc.reset_peak``; there a stage's peak is
+approximated by the traced memory it held when it returned, which misses
+temporary allocations freed before then.
+"""
+
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from . import metrics
+
+_MB = 1024 * 1024
+
+# tracemalloc.reset_peak is new in Python 3.9
+_RESET_PEAK = getattr(tracemalloc, "reset_peak", None)
+
+# Frames from the import machinery, tracemalloc and this module are noise
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _mb(size: float) -> float:
+    return round(size / _MB, 3)
+
+
+class _StageStats:
+    __slots__ = ('calls', 'peak', 'growth')
+
+    def __init__(self):
+        self.calls = 0
+        self.peak = 0
+        self.growth = 0
+
+
+class MemoryTracer:
+    """
+    Trace Python allocations for one run.
+
+    Stages can run concurrently (the dispatcher posts to several platforms
+    at once); tracemalloc's peak is process-wide, so a stage's peak then
+    includes memory allocated by the stages overlapping it.
+
+    Example:
+        tracer = MemoryTracer(top=10)
+        tracer.start()
+        ...
+        tracer.stop()
+        print(tracer.format_report())
+    """
+
+    def __init__(self, frames: int = 1, top: int = 10, snapshot_interval: float = 1.0,
+                 timeline_limit: int = 500):
+        """
+        Args:
+            frames: Stack frames kept per allocation (more is slower)
+            top: Number of allocation sites to report
+            snapshot_interval: Minimum seconds between snapshots taken at
+                stage boundaries
+            timeline_limit: Maximum timeline samples kept; older samples are
+                thinned out so long runs stay bounded
+        """
+        self.frames = frames
+        self.top = top
+        self.snapshot_interval = snapshot_interval
+        self.timeline_limit = timeline_limit
+        self.stages: Dict[str, _StageStats] = {}
+        self.timeline: List[Dict[str, Any]] = []
+        self.traced_peak = 0
+        self.top_allocations: List[Dict[str, Any]] = []
+        self.peak_allocations: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._started = 0.0
+        self._last_snapshot = 0.0
+        self._was_tracing = False
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._peak_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._peak_snapshot_size = 0
+        self._timeline_step = 1
+        self._timeline_counter = 0
+
+    def start(self):
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start(self.frames)
+        self._baseline = self._snapshot()
+        self._started = self._last_snapshot = time.perf_counter()
+        if _RESET_PEAK is not None:
+            _RESET_PEAK()
+        metrics.add_stage_hook(self)
+
+    def stop(self):
+        """Stop tracing and compute the allocation-site report."""
+        metrics.remove_stage_hook(self)
+        _current, peak = tracemalloc.get_traced_memory()
+        self.traced_peak = max(self.traced_peak, peak)
+        final = self._snapshot()
+        if not self._was_tracing:
+            tracemalloc.stop()
+
+        self.top_allocations = self._top_sites(final, self._baseline)
+        if self._peak_snapshot is not None:
+            self.peak_allocations = self._top_sites(self._peak_snapshot, self._baseline)
+        # Snapshots hold every live trace; drop them once summarized
+        self._baseline = self._peak_snapshot = None
+
+    # Stage hook protocol, called by metrics.StageTimer
+
+    def enter(self, stage: str, platform: str):
+        with self._lock:
+            if self._in_flight == 0:
+                # Only reset when nothing else is running, so an outer or
+                # overlapping stage never loses its own peak
+                _current, peak = tracemalloc.get_traced_memory()
+                self.traced_peak = max(self.traced_peak, peak)
+                if _RESET_PEAK is not None:
+                    _RESET_PEAK()
+            self._in_flight += 1
+            return tracemalloc.get_traced_memory()[0]
+
+    def exit(self, stage: str, platform: str, token):
+        current, peak = tracemalloc.get_traced_memory()
+        now = time.perf_counter()
+        # Without reset_peak, peak covers the whole run; fall back to current
+        stage_peak = peak if _RESET_PEAK is not None else current
+        with self._lock:
+            self._in_flight -= 1
+            self.traced_peak = max(self.traced_peak, peak)
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = _StageStats()
+            stats.calls += 1
+            stats.peak = max(stats.peak, stage_peak - token)
+            stats.growth += current - token
+            self._add_sample(now, stage, current)
+
+            take_snapshot = now - self._last_snapshot >= self.snapshot_interval
+            if take_snapshot:
+                self._last_snapshot = now
+        if take_snapshot and current > self._peak_snapshot_size:
+            snapshot = self._snapshot()
+            with self._lock:
+                if current > self._peak_snapshot_size:
+                    self._peak_snapshot, self._peak_snapshot_size = snapshot, current
+
+    def _add_sample(self, now: float, stage: str, current: int):
+        self._timeline_counter += 1
+        if self._timeline_counter % self._timeline_step:
+            return
+        self.timeline.append({"t": round(now - self._started, 4), "stage": stage, "traced_mb": _mb(current)})
+        if len(self.timeline) >= self.timeline_limit:
+            # Keep every other sample and halve the sampling rate from now on
+            del self.timeline[1::2]
+            self._timeline_step *= 2
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+    def _top_sites(self, snapshot: tracemalloc.Snapshot,
+                   baseline: Optional[tracemalloc.Snapshot]) -> List[Dict[str, Any]]:
+        if baseline is None:
+            return []
+        sites = []
+        for diff in snapshot.compare_to(baseline, "lineno")[:self.top]:
+            if diff.size_diff <= 0:
+                break
+            frame = diff.traceback[0]
+            sites.append({
+                "site": f"{frame.filename}:{frame.lineno}",
+                "size_mb": _mb(diff.size),
+                "growth_mb": _mb(diff.size_diff),
+                "count": diff.count,
+            })
+        return sites
+
+    def report(self, timeline: bool = True) -> Dict[str, Any]:
+        """Return the results as a JSON-serializable dict."""
+        report = {
+            "traced_peak_mb": _mb(self.traced_peak),
+            # False on Python 3.8, where stage peaks are approximate
+            "exact_stage_peaks": _RESET_PEAK is not None,
+            "stages": {
+                stage: {"calls": stats.calls, "peak_mb": _mb(stats.peak), "growth_mb": _mb(stats.growth)}
+                for stage, stats in sorted(self.stages.items())
+            },
+            "top_allocations": self.top_allocations,
+            "peak_allocations": self.peak_allocations,
+        }
+        if timeline:
+            report["timeline"] = self.timeline
+        return report
+
+    def format_report(self) -> str:
+        """Return a short text summary."""
+        lines = [f"🧠 Memory: traced peak {_mb(self.traced_peak):.3f} MB"]
+        if _RESET_PEAK is None:
+            lines.append("  (stage peaks approximate: tracemalloc.reset_peak needs Python 3.9+)")
+        if self.stages:
+            lines.append(f"  {'stage':<16} {'calls':>6} {'peak MB':>10} {'growth MB':>10}")
+        for stage, stats in sorted(self.stages.items(), key=lambda item: -item[1].peak):
+            lines.append(f"  {stage:<16} {stats.calls:>6} {_mb(stats.peak):>10.3f} {_mb(stats.growth):>10.3f}")
+        if self.top_allocations:
+            lines.append("  Top allocation sites still alive at the end of the run:")
+            for site in self.top_allocations:
+                lines.append(f"    {site['growth_mb']:>9.3f} MB  {site['count']:>7} blocks  {site['site']}")
+        return "\n".join(lines)
@@ -0,0 +1,405 @@
+"""
+Built-in metrics registry with Prometheus text export.
+
+Every pipeline stage (``generate``, ``search_business``, ``post_review`` and
+``transcribe``) is recorded as:
+
+- ``review_agent_stage_duration_seconds``: latency histogram
+- ``review_agent_stage_total``: counter by outcome (success, failure, fallback)
+- ``review_agent_stage_in_flight``: gauge of calls currently running
+
+Metrics are disabled by default; ``stage_timer`` then returns a shared no-op
+object, so instrumented code pays one flag check per call.
+
+Example:
+    from review_agent import metrics
+
+    metrics.enable()
+    ...
+    metrics.write_textfile("review_agent.prom")
+    metrics.start_http_server(9464)   # serves /metrics on 127.0.0.1
+"""
+
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, Any] = {}
+
+    def _key(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return tuple(str(label) for label in labels)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    metric_type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+    def snapshot(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, snapshot: Dict[LabelValues, float]):
+        for key, value in snapshot.items():
+            self.inc(*key, amount=value)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    metric_type = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bounds."""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, *labels: str, value: float):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts plus an overflow slot, sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, *labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return sum(state[0]) if state else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = self.header()
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+    def snapshot(self) -> Dict[LabelValues, Tuple[List[int], float]]:
+        with self._lock:
+            return {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+
+    def merge(self, snapshot: Dict[LabelValues, Tuple[List[int], float]]):
+        with self._lock:
+            for key, (counts, total) in snapshot.items():
+                state = self._values.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0])
+                state[0] = [a + b for a, b in zip(state[0], counts)]
+                state[1] += total
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> Dict[str, Any]:
+        """
+        Return the counters and histograms and reset them.
+
+        Used to ship metrics from worker processes to the parent, which
+        adds them to its own registry with ``merge``. Gauges are
+        point-in-time and are not shipped.
+        """
+        snapshot = {}
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            if isinstance(metric, (Counter, Histogram)):
+                snapshot[metric.name] = metric.snapshot()
+                metric.reset()
+        return snapshot
+
+    def merge(self, snapshot: Dict[str, Any]):
+        for name, values in snapshot.items():
+            metric = self._metrics.get(name)
+            if isinstance(metric, (Counter, Histogram)):
+                metric.merge(values)
+
+    def reset(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_DURATION = REGISTRY.histogram(
+    "review_agent_stage_duration_seconds", "Latency of pipeline stages", ("stage", "platform")
+)
+STAGE_TOTAL = REGISTRY.counter(
+    "review_agent_stage_total", "Completed pipeline stage calls by outcome", ("stage", "platform", "outcome")
+)
+STAGE_IN_FLIGHT = REGISTRY.gauge(
+    "review_agent_stage_in_flight", "Pipeline stage calls currently running", ("stage", "platform")
+)
+
+_enabled = False
+
+# Extra observers of stage boundaries (e.g. the memory tracer); each has
+# enter(stage, platform) -> token and exit(stage, platform, token)
+_stage_hooks: Tuple[Any, ...] = ()
+
+
+def add_stage_hook(hook):
+    """Register an observer that is told when every stage starts and ends."""
+    global _stage_hooks
+    _stage_hooks = _stage_hooks + (hook,)
+
+
+def remove_stage_hook(hook):
+    global _stage_hooks
+    _stage_hooks = tuple(existing for existing in _stage_hooks if existing is not hook)
+
+
+def enable():
+    """Start recording metrics."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop recording metrics (already recorded values are kept)."""
+    global _enabled
+    _enabled = False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+class _NullTimer:
+    """Stand-in returned by ``stage_timer`` while metrics are disabled."""
+
+    __slots__ = ()
+
+    outcome = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class StageTimer:
+    """
+    Records one stage call: in-flight gauge, latency and outcome.
+
+    The outcome is ``failure`` if the block raises, otherwise ``success``
+    unless the block sets ``timer.outcome`` (e.g. to ``"fallback"``).
+    """
+
+    __slots__ = ('stage', 'platform', 'outcome', '_started', '_record', '_hooks', '_tokens')
+
+    def __init__(self, stage: str, platform: str):
+        self.stage = stage
+        self.platform = platform
+        self.outcome = None
+        self._record = _enabled
+        self._hooks = _stage_hooks
+
+    def __enter__(self):
+        self._tokens = [hook.enter(self.stage, self.platform) for hook in self._hooks]
+        if self._record:
+            STAGE_IN_FLIGHT.inc(self.stage, self.platform)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._started
+        if self._record:
+            STAGE_IN_FLIGHT.dec(self.stage, self.platform)
+            outcome = "failure" if exc_type is not None else (self.outcome or "success")
+            STAGE_DURATION.observe(self.stage, self.platform, value=elapsed)
+            STAGE_TOTAL.inc(self.stage, self.platform, outcome)
+        for hook, token in zip(self._hooks, self._tokens):
+            hook.exit(self.stage, self.platform, token)
+        return False
+
+
+def stage_timer(stage: str, platform: str = ""):
+    """Context manager recording a stage call, or a no-op when disabled."""
+    if not _enabled and not _stage_hooks:
+        return _NULL_TIMER
+    return StageTimer(stage, platform)
+
+
+def write_textfile(path: str, registry: MetricsRegistry = REGISTRY):
+    """
+    Atomically write the registry in Prometheus text format, e.g. for the
+    node_exporter textfile collector.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".prom")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(registry.render())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_http_server(port: int, host: str = "127.0.0.1",
+                      registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """
+    Serve ``/metrics`` on a daemon thread.
+
+    Binds to localhost by default; returns the server so callers can
+    ``shutdown()`` it.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,218 @@
+"""
+Durable outbox for reviews a platform could not take yet.
+
+When a platform is unreachable its posts go into an ``Outbox`` (a SQLite
+file) instead of being lost, and are delivered later:
+
+- ``PlatformHealth`` remembers that a platform is down, so further posts
+  are queued at once instead of each waiting for a connect timeout; after
+  a backoff one call is let through as a probe
+- ``OutboxFlusher`` drains the outbox in batches from a background thread
+  once the platform answers again
+- every queued review has an idempotency key, sent with the first attempt
+  and every redelivery, so a post that reached the server before failing
+  on our side is not created twice
+
+Entries survive restarts; the next run that configures the same file
+delivers them. Reviews the platform rejects outright (e.g. an unknown
+business) are kept as failed entries for inspection instead of being
+retried forever.
+
+    LocalDirectoryPlatform.outbox = Outbox("outbox.db")
+"""
+
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from . import events
+from .storage import SQLiteStore
+
+
+def new_idempotency_key() -> str:
+    return uuid.uuid4().hex
+
+
+class OutboxEntry(NamedTuple):
+    id: int
+    platform: str
+    idempotency_key: str
+    business_id: str
+    review_text: str
+    rating: int
+    # Set when business_id is a placeholder to resolve again before delivery
+    business_name: Optional[str]
+    location: Optional[str]
+    attempts: int
+
+
+class Outbox(SQLiteStore):
+    """Queued reviews per platform, shared by every process using the file."""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS outbox ("
+        " id INTEGER PRIMARY KEY, platform TEXT NOT NULL, idempotency_key TEXT NOT NULL UNIQUE,"
+        " business_id TEXT NOT NULL, review_text TEXT NOT NULL, rating INTEGER NOT NULL,"
+        " business_name TEXT, location TEXT, attempts INTEGER NOT NULL DEFAULT 0,"
+        " status TEXT NOT NULL DEFAULT 'pending', claimed_until REAL NOT NULL DEFAULT 0,"
+        " last_error TEXT, created_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (platform, status, id)",
+    )
+
+    def __init__(self, path: str = "review_agent_outbox.db"):
+        super().__init__(path)
+
+    def enqueue(self, platform: str, business_id: str, review_text: str, rating: int,
+                idempotency_key: Optional[str] = None, business_name: Optional[str] = None,
+                location: Optional[str] = None) -> str:
+        """
+        Queue a review; enqueueing the same key again is a no-op.
+
+        Returns:
+            str: The idempotency key
+        """
+        key = idempotency_key or new_idempotency_key()
+        self.execute(
+            "INSERT OR IGNORE INTO outbox (platform, idempotency_key, business_id, review_text, rating,"
+            " business_name, location, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (platform, key, business_id, review_text, rating, business_name, location, time.time()))
+        return key
+
+    def claim(self, platform: str, limit: int = 100, lease: float = 60.0) -> List[OutboxEntry]:
+        """
+        Take up to ``limit`` pending entries, oldest first.
+
+        Claimed entries are hidden from other flushers for ``lease`` seconds;
+        finish them with ``complete``, ``release`` or ``fail``.
+        """
+        now = time.time()
+        with self.transaction() as connection:
+            rows = connection.execute(
+                "SELECT id, platform, idempotency_key, business_id, review_text, rating,"
+                " business_name, location, attempts FROM outbox"
+                " WHERE platform = ? AND status = 'pending' AND claimed_until <= ? ORDER BY id LIMIT ?",
+                (platform, now, limit)).fetchall()
+            connection.executemany("UPDATE outbox SET claimed_until = ?, attempts = attempts + 1 WHERE id = ?",
+                                   [(now + lease, row[0]) for row in rows])
+        return [OutboxEntry(*row[:8], attempts=row[8] + 1) for row in rows]
+
+    def complete(self, ids: Sequence[int]):
+        """Delivered: remove the entries."""
+        self.executemany("DELETE FROM outbox WHERE id = ?", [(entry_id,) for entry_id in ids])
+
+    def release(self, ids: Sequence[int], error: str):
+        """Not delivered this time: make the entries available again."""
+        self.executemany("UPDATE outbox SET claimed_until = 0, last_error = ? WHERE id = ?",
+                         [(error, entry_id) for entry_id in ids])
+
+    def fail(self, entry_id: int, error: str):
+        """Rejected by the platform: keep the entry, but stop delivering it."""
+        self.execute("UPDATE outbox SET status = 'failed', last_error = ? WHERE id = ?", (error, entry_id))
+
+    def pending(self, platform: Optional[str] = None) -> int:
+        """Number of entries still to deliver."""
+        if platform is None:
+            rows = self.query("SELECT COUNT(*) FROM outbox WHERE status = 'pending'")
+        else:
+            rows = self.query("SELECT COUNT(*) FROM outbox WHERE status = 'pending' AND platform = ?", (platform,))
+        return rows[0][0]
+
+    def failed(self, platform: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Entries the platform rejected, with their last error."""
+        sql = ("SELECT platform, idempotency_key, business_id, review_text, rating, attempts, last_error"
+               " FROM outbox WHERE status = 'failed'")
+        params: tuple = ()
+        if platform is not None:
+            sql += " AND platform = ?"
+            params = (platform,)
+        columns = ("platform", "idempotency_key", "business_id", "review_text", "rating", "attempts", "last_error")
+        return [dict(zip(columns, row)) for row in self.query(sql + " ORDER BY id", params)]
+
+
+class PlatformHealth:
+    """
+    Reachability of one platform, as a simple circuit breaker.
+
+    After a failure the platform is skipped for ``base_delay`` seconds,
+    doubling up to ``max_delay`` while probes keep failing. When the delay
+    is over, ``available`` lets exactly one caller through as the probe.
+    """
+
+    def __init__(self, name: str, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.name = name
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.healthy = True
+        self._delay = 0.0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """True if a call should go to the platform (always, while healthy)."""
+        if self.healthy:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            if self.healthy or now >= self._retry_at:
+                # This caller is the probe; others keep skipping meanwhile
+                self._retry_at = now + self._delay
+                return True
+            return False
+
+    def record_success(self):
+        if self.healthy:
+            return
+        with self._lock:
+            self.healthy, self._delay = True, 0.0
+        events.emit("platform.healthy", "✅ {platform} is reachable again", platform=self.name)
+
+    def record_failure(self):
+        with self._lock:
+            self._delay = min(self.max_delay, self._delay * 2 if self._delay else self.base_delay)
+            self._retry_at = time.monotonic() + self._delay
+            was_healthy, self.healthy = self.healthy, False
+        if was_healthy:
+            events.emit("platform.unhealthy", "⚠️  {platform} is unreachable; queueing posts and retrying in {delay}s",
+                        platform=self.name, delay=self._delay)
+
+
+class OutboxFlusher:
+    """
+    Background thread calling ``platform.flush_outbox()`` every ``interval``
+    seconds until stopped.
+    """
+
+    def __init__(self, platform, interval: float = 5.0, batch_size: int = 100):
+        self.platform = platform
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "OutboxFlusher":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="outbox-flusher", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> int:
+        """Deliver what the platform will take now; returns the number delivered."""
+        try:
+            return self.platform.flush_outbox(self.batch_size)
+        except Exception as e:
+            events.emit("outbox.error", "⚠️  Outbox flush failed: {error}", error=str(e))
+            return 0
+
+    def stop(self, flush: bool = True):
+        """Stop the thread, then make a last delivery attempt if ``flush``."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if flush:
+            self.flush()
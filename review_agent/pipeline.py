@@ -0,0 +1,71 @@
+"""
+Review pipeline orchestration.
+
+Helpers that tie review generation and platform posting together so the
+independent network calls involved can overlap instead of running back to
+back.
+"""
+
+from concurrent.futures import Future
+from typing import Callable, Optional, Sequence, Tuple, Union
+
+from . import tracing
+from .dispatcher import DispatchReport, PlatformDispatcher
+from .platforms.base import ReviewPlatform
+
+
+def generate_and_post(generate: Callable[[], str],
+                      platforms: Union[Sequence[ReviewPlatform], PlatformDispatcher],
+                      business_name: str,
+                      location: Optional[str],
+                      rating: int,
+                      timeout: float = 30.0) -> Tuple[str, DispatchReport]:
+    """
+    Generate a review and post it to every platform, overlapping the
+    business lookups with generation.
+
+    ``search_business`` is started on each platform in a background thread
+    while ``generate`` runs on the calling thread. Once the review text is
+    ready, each platform is posted to as soon as its lookup has finished,
+    so per-review latency is roughly ``max(generate, search) + post``
+    instead of their sum.
+
+    Args:
+        generate: Zero-argument callable returning the review text
+        platforms: Logged-in platforms to post to, or an existing
+            ``PlatformDispatcher`` to reuse its worker threads
+        business_name: Name of the business being reviewed
+        location: Optional location passed to ``search_business``
+        rating: Rating 1-5
+        timeout: Per-platform timeout when a new dispatcher is created
+
+    Returns:
+        Tuple of the review text and the per-platform ``DispatchReport``
+
+    Raises:
+        Any exception raised by ``generate``. Platform failures are
+        reported in the ``DispatchReport`` instead.
+    """
+    with tracing.correlation(), tracing.span("submission", business_name=business_name):
+        if isinstance(platforms, PlatformDispatcher):
+            return _generate_and_dispatch(generate, platforms, business_name, location, rating)
+
+        with PlatformDispatcher(platforms, timeout=timeout) as dispatcher:
+            return _generate_and_dispatch(generate, dispatcher, business_name, location, rating)
+
+
+def _generate_and_dispatch(generate: Callable[[], str], dispatcher: PlatformDispatcher,
+                           business_name: str, location: Optional[str],
+                           rating: int) -> Tuple[str, DispatchReport]:
+    review_future: Future = Future()
+    pending = dispatcher.start(review_future, rating, business_name, location)
+
+    try:
+        review = generate()
+    except BaseException as e:
+        # Release the workers waiting on the review text before re-raising
+        review_future.set_exception(e)
+        raise
+
+    review_future.set_result(review)
+    return review, pending.wait()
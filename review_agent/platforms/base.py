@@ -1,7 +1,182 @@
+import functools
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Any, Dict, Optional
+
+from .. import metrics, tracing
+from ..cache import BUSINESS_CACHE, NOT_FOUND
+
+
+class BusinessNotFoundError(ValueError):
+    """The platform has no business matching the search."""
+
+
+class AuthenticationError(ValueError):
+    """The platform needs a (new) login before it will serve the request."""
+
+
+class RateLimitError(ValueError):
+    """The platform refused the request for now; retry after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PlatformUnavailableError(ValueError):
+    """The platform failed or is down; the same request may succeed later."""
+
+
+def platform_label(platform: "ReviewPlatform") -> str:
+    """Return the display name used for a platform in logs and reports."""
+    return getattr(platform, 'platform_name', None) or platform.__class__.__name__
+
+
+# Returned by a first attempt that failed authentication and should be retried
+_RELOGIN = object()
+
+
+def _instrumented(method, stage: str, self_metered: bool = False):
+    """
+    Wrap a platform method so every call is recorded as a pipeline stage and
+    stays within the platform's rate budget, if one is configured.
+    
+    Waiting for the budget happens before the stage starts, so it does not
+    count as the call's latency; a ``self_metered`` method draws its budget
+    itself, per request it sends. A call retried after logging in again is
+    recorded as two attempts: the first with outcome ``relogin``, the retry
+    as its own stage call (and span, with ``attempt=2``).
+    """
+    def attempt(self, label, args, kwargs, number):
+        budgets = self.rate_budgets
+        if budgets is not None and not self_metered:
+            budgets.acquire(label, stage)
+        span_args = {"platform": label} if number == 1 else {"platform": label, "attempt": number}
+        with metrics.stage_timer(stage, label) as timer, tracing.span(stage, **span_args):
+            try:
+                return method(self, *args, **kwargs)
+            except RateLimitError as e:
+                if budgets is not None:
+                    budgets.defer(label, stage, e.retry_after)
+                raise
+            except AuthenticationError:
+                # Pooled instances log in again once and retry
+                if number > 1 or self.relogin is None:
+                    raise
+                timer.outcome = "relogin"
+                return _RELOGIN
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        label = platform_label(self)
+        started = time.monotonic()
+        result = attempt(self, label, args, kwargs, 1)
+        if result is not _RELOGIN:
+            return result
+        with tracing.span("relogin", platform=label):
+            self.relogin(started)
+        return attempt(self, label, args, kwargs, 2)
+
+    wrapper._instrumented = True
+    return wrapper
+
+
+def cached_business_id(platform: "ReviewPlatform", business_name: str, location: Optional[str]):
+    """
+    Look a search up in the platform's ``business_cache``, counting the result.
+
+    Returns:
+        ``(business_id, message)`` as from ``BusinessCache.lookup`` (with
+        ``NOT_FOUND`` for a cached negative answer), or None on a miss or
+        without a cache
+    """
+    cache = platform.business_cache
+    if cache is None:
+        return None
+    label = platform_label(platform)
+    cached = cache.lookup(platform._namespace, business_name, location)
+    result = "miss" if cached is None else "negative_hit" if cached[0] is NOT_FOUND else "hit"
+    if metrics.enabled():
+        BUSINESS_CACHE.inc(label, result)
+    if cached is not None:
+        tracing.instant("business_cache_" + result, platform=label, business_name=business_name)
+    return cached
+
+
+def cache_business_id(platform: "ReviewPlatform", business_name: str, location: Optional[str],
+                      business_id: Optional[str], message: str = ""):
+    """Store a search result (or ``NOT_FOUND``) in the platform's ``business_cache``, if any."""
+    cache = platform.business_cache
+    # Offline fallbacks must not outlive the outage
+    if cache is None or (business_id is not NOT_FOUND and platform._is_placeholder_id(business_id)):
+        return
+    cache.store(platform._namespace, business_name, location, business_id, message)
+
+
+def _cached_search(method):
+    """Serve ``search_business`` from the platform's ``business_cache``, if any."""
+    @functools.wraps(method)
+    def wrapper(self, business_name, location=None, *args, **kwargs):
+        if self.business_cache is None:
+            return method(self, business_name, location, *args, **kwargs)
+
+        cached = cached_business_id(self, business_name, location)
+        if cached is not None:
+            business_id, message = cached
+            if business_id is NOT_FOUND:
+                raise BusinessNotFoundError(message)
+            return business_id
+
+        try:
+            business_id = method(self, business_name, location, *args, **kwargs)
+        except BusinessNotFoundError as e:
+            cache_business_id(self, business_name, location, NOT_FOUND, str(e))
+            raise
+        cache_business_id(self, business_name, location, business_id)
+        return business_id
+
+    return wrapper
+
 
 class ReviewPlatform(ABC):
+    # Display name used in logs and per-platform reports
+    platform_name = None
+
+    # Business ID cache consulted before search_business (see review_agent.cache);
+    # set on the class for every platform or on one instance
+    business_cache = None
+
+    # Login session cache (see review_agent.sessions); set like business_cache
+    session_cache = None
+
+    # Set by PlatformPool (see review_agent.pool): called with the time a
+    # failed call started to log in again after an AuthenticationError
+    relogin = None
+
+    # Per-platform call budgets (see review_agent.budgets); set like
+    # business_cache. Instrumented calls wait for a token before going out
+    rate_budgets = None
+
+    # Methods wrapped with per-stage instrumentation in every subclass
+    _instrumented_methods = {
+        'search_business': 'search_business',
+        'post_review': 'post_review',
+    }
+    
+    # Instrumented batch methods that take their rate budget per request,
+    # one token per review or sub-request, with _spend_budget
+    _self_metered_methods = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, stage in cls._instrumented_methods.items():
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(method, '_instrumented', False):
+                wrapped = _instrumented(method, stage, self_metered=name in cls._self_metered_methods)
+                if name == 'search_business':
+                    wrapped = _cached_search(wrapped)
+                setattr(cls, name, wrapped)
+
     @abstractmethod
     def login(self, credentials: Dict[str, str]):
         """Login to the platform"""
@@ -15,4 +190,43 @@ class ReviewPlatform(ABC):
     @abstractmethod
     def search_business(self, business_name: str, location: str) -> str:
         """Search for a business and return its ID"""
-        pass
\ No newline at end of file
+        pass
+
+    @property
+    def _namespace(self) -> str:
+        """Business cache partition; platforms with a configurable endpoint add it."""
+        return platform_label(self)
+
+    def _is_placeholder_id(self, business_id: str) -> bool:
+        """True for a stand-in ID made up while the platform was unreachable."""
+        return False
+
+    def _has_budget(self, operation: str) -> bool:
+        """True if ``rate_budgets`` paces this operation."""
+        budgets = self.rate_budgets
+        return budgets is not None and budgets.budget_for(platform_label(self), operation) is not None
+
+    def _spend_budget(self, operation: str, tokens: float = 1.0) -> float:
+        """
+        Wait for ``tokens`` of the operation's rate budget, if one is configured.
+
+        Returns:
+            float: Seconds waited
+
+        Raises:
+            RateLimitError: The wait would exceed the budgets' ``max_wait``
+        """
+        if self.rate_budgets is None or tokens <= 0:
+            return 0.0
+        return self.rate_budgets.acquire(platform_label(self), operation, tokens=tokens)
+
+    def _defer_budget(self, operation: str, seconds: float):
+        """Pause the operation's rate budget after the platform answered 429."""
+        if self.rate_budgets is not None:
+            self.rate_budgets.defer(platform_label(self), operation, seconds)
+
+    def close(self):
+        """Release the platform's HTTP connections"""
+        session = getattr(self, 'session', None)
+        if session is not None:
+            session.close()
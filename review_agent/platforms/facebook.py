@@ -1,7 +1,13 @@
 import requests
 import json
-from typing import Dict, Any, Optional
-from .base import ReviewPlatform
+import time
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import quote, urlencode
+from .base import (AuthenticationError, BusinessNotFoundError, RateLimitError, ReviewPlatform,
+                   cache_business_id, cached_business_id, platform_label)
+from ..cache import NOT_FOUND
+from .. import events
+from ..transport import HTTPTransport
 
 class FacebookPlatform(ReviewPlatform):
     """
@@ -12,10 +18,32 @@ class FacebookPlatform(ReviewPlatform):
     posting recommendations and check-ins which can include text.
     """
     
-    def __init__(self):
-        self.base_url = "https://graph.facebook.com/v18.0"
+    platform_name = "Facebook"
+    
+    _instrumented_methods = {
+        **ReviewPlatform._instrumented_methods,
+        'search_businesses': 'search_businesses',
+        'get_pages_info': 'get_pages_info',
+    }
+    # Graph counts every sub-request of a batch against the app's rate limit
+    _self_metered_methods = frozenset({'search_businesses', 'get_pages_info'})
+    
+    # Graph API limit on sub-requests per batch call
+    MAX_BATCH_SIZE = 50
+    
+    # How long a token validated with /me is trusted through session_cache
+    VALIDATION_TTL = 3600.0
+    
+    def __init__(self, transport: Optional[HTTPTransport] = None,
+                 base_url: str = "https://graph.facebook.com/v18.0"):
+        """
+        Args:
+            transport: Shared HTTP transport
+            base_url: Versioned Graph API root (point it at a local stand-in for testing)
+        """
+        self.base_url = base_url.rstrip('/')
         self.access_token = None
-        self.session = requests.Session()
+        self.session = transport or HTTPTransport()
         self.user_id = None
 
     def login(self, credentials: Dict[str, str]):
@@ -28,8 +56,19 @@ class FacebookPlatform(ReviewPlatform):
         self.access_token = credentials.get('access_token')
         if not self.access_token:
             raise ValueError("Facebook access token is required")
-            
-        # Test the token by getting user info
+        
+        # Test the token by getting user info, unless a recent check is cached
+        if self.session_cache is not None:
+            user_data = self.session_cache.get_or_refresh(platform_label(self), credentials, self._validate_token)
+        else:
+            user_data, _expires_at = self._validate_token()
+        
+        self.user_id = user_data.get('id')
+        events.emit("platform.login", "✅ Facebook login successful for user: {user}",
+                    platform=self.platform_name, user=user_data.get('name', 'Unknown'))
+        return True
+
+    def _validate_token(self):
         test_url = f"{self.base_url}/me"
         params = {'access_token': self.access_token}
         
@@ -37,9 +76,7 @@ class FacebookPlatform(ReviewPlatform):
         
         if response.status_code == 200:
             user_data = response.json()
-            self.user_id = user_data.get('id')
-            print(f"✅ Facebook login successful for user: {user_data.get('name', 'Unknown')}")
-            return True
+            return {'id': user_data.get('id'), 'name': user_data.get('name', 'Unknown')}, time.time() + self.VALIDATION_TTL
         else:
             raise ValueError(f"Facebook authentication failed: {response.text}")
 
@@ -55,7 +92,7 @@ class FacebookPlatform(ReviewPlatform):
             str: Facebook Page ID
         """
         if not self.access_token:
-            raise ValueError("Must be logged in to search businesses")
+            raise AuthenticationError("Must be logged in to search businesses")
             
         search_url = f"{self.base_url}/search"
         params = {
@@ -75,10 +112,13 @@ class FacebookPlatform(ReviewPlatform):
             if results.get('data'):
                 # Return the first match's ID
                 page = results['data'][0]
-                print(f"🔍 Found business: {page['name']} (ID: {page['id']})")
+                events.emit("platform.search_business", "🔍 Found business: {business_name} (ID: {business_id})",
+                            platform=self.platform_name, business_name=page['name'], business_id=page['id'])
                 return page['id']
             else:
-                raise ValueError(f"No Facebook page found for: {business_name}")
+                raise BusinessNotFoundError(f"No Facebook page found for: {business_name}")
+        elif response.status_code == 401:
+            raise AuthenticationError(f"Facebook search failed: {response.text}")
         else:
             raise ValueError(f"Facebook search failed: {response.text}")
 
@@ -95,7 +135,7 @@ class FacebookPlatform(ReviewPlatform):
             rating: Rating 1-5 (converted to recommend/not recommend)
         """
         if not self.access_token:
-            raise ValueError("Must be logged in to post reviews")
+            raise AuthenticationError("Must be logged in to post reviews")
             
         # Facebook uses recommendations (yes/no) rather than star ratings
         recommend = rating >= 3
@@ -113,8 +153,9 @@ class FacebookPlatform(ReviewPlatform):
         
         if response.status_code == 200:
             result = response.json()
-            print(f"✅ Recommendation posted to Facebook")
-            print(f"📝 {'Recommended' if recommend else 'Not recommended'}")
+            events.emit("platform.post_review", "✅ Recommendation posted to Facebook\n📝 {recommendation}",
+                        platform=self.platform_name, business_id=business_id, rating=rating,
+                        recommendation='Recommended' if recommend else 'Not recommended')
             return result
         else:
             # Facebook might restrict this - let's try posting to user's feed instead
@@ -139,9 +180,12 @@ class FacebookPlatform(ReviewPlatform):
         
         if response.status_code == 200:
             result = response.json()
-            print(f"✅ Review posted to your Facebook feed")
-            print(f"📝 Post ID: {result.get('id')}")
+            events.emit("platform.post_review", "✅ Review posted to your Facebook feed\n📝 Post ID: {post_id}",
+                        platform=self.platform_name, business_id=business_id, rating=rating,
+                        post_id=result.get('id'), target="feed")
             return result
+        elif response.status_code == 401:
+            raise AuthenticationError(f"Facebook posting failed: {response.text}")
         else:
             raise ValueError(f"Facebook posting failed: {response.text}")
 
@@ -156,7 +200,7 @@ class FacebookPlatform(ReviewPlatform):
             Dict containing page information
         """
         if not self.access_token:
-            raise ValueError("Must be logged in to get page info")
+            raise AuthenticationError("Must be logged in to get page info")
             
         page_url = f"{self.base_url}/{page_id}"
         params = {
@@ -169,4 +213,169 @@ class FacebookPlatform(ReviewPlatform):
         if response.status_code == 200:
             return response.json()
         else:
-            raise ValueError(f"Failed to get page info: {response.text}")
\ No newline at end of file
+            raise ValueError(f"Failed to get page info: {response.text}")
+
+    def get_pages_info(self, page_ids: Sequence[str],
+                       fields: str = 'id,name,location,category') -> List[Dict[str, Any]]:
+        """
+        Get information about many Facebook pages with Graph batch requests.
+        
+        Args:
+            page_ids: Facebook Page IDs
+            fields: Comma-separated fields to fetch; ask only for what you use
+            
+        Returns:
+            list: One dict per page ID, in order, with ``page_id``, ``ok``,
+            ``data`` (the page) and ``error``
+            
+        Raises:
+            AuthenticationError: Graph refused the access token
+        """
+        relative_urls = [f"{quote(str(page_id), safe='')}?{urlencode({'fields': fields})}" for page_id in page_ids]
+        return [
+            {'page_id': page_id, 'ok': error is None, 'data': data, 'error': error}
+            for page_id, (data, error) in zip(page_ids, self._graph_batch(relative_urls, 'get_pages_info'))
+        ]
+
+    def search_businesses(self, queries: Iterable[Tuple[str, Optional[str]]], limit: int = 1,
+                          fields: str = 'id,name') -> List[Dict[str, Any]]:
+        """
+        Search for many businesses with Graph batch requests.
+        
+        Results go through ``business_cache`` like ``search_business``:
+        cached answers skip the request, and new answers are stored.
+        
+        Args:
+            queries: ``(business_name, location)`` pairs; location may be None
+            limit: Maximum pages returned per search
+            fields: Fields returned for each page
+            
+        Returns:
+            list: One dict per query, in order, with ``business_name``,
+            ``location``, ``ok``, ``business_id`` (best match), ``data``
+            (all matches) and ``error``
+            
+        Raises:
+            AuthenticationError: Not logged in, or Graph refused the token
+        """
+        if not self.access_token:
+            raise AuthenticationError("Must be logged in to search businesses")
+        
+        queries = list(queries)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        pending: List[int] = []
+        for index, (business_name, location) in enumerate(queries):
+            cached = cached_business_id(self, business_name, location)
+            if cached is None:
+                pending.append(index)
+            elif cached[0] is NOT_FOUND:
+                results[index] = self._search_result(business_name, location, None, cached[1])
+            else:
+                results[index] = self._search_result(business_name, location, {'data': [{'id': cached[0]}]}, None)
+        
+        relative_urls = []
+        for index in pending:
+            business_name, location = queries[index]
+            params = {
+                'q': f"{business_name} {location}" if location else business_name,
+                'type': 'page',
+                'fields': fields,
+                'limit': limit,
+            }
+            relative_urls.append(f"search?{urlencode(params)}")
+        
+        for index, (data, error) in zip(pending, self._graph_batch(relative_urls, 'search_businesses')):
+            business_name, location = queries[index]
+            if error is None and not (isinstance(data, dict) and data.get('data')):
+                error = f"No Facebook page found for: {business_name}"
+                cache_business_id(self, business_name, location, NOT_FOUND, error)
+            result = self._search_result(business_name, location, data, error)
+            if result['ok']:
+                cache_business_id(self, business_name, location, result['business_id'])
+            results[index] = result
+        return results
+
+    @staticmethod
+    def _search_result(business_name: str, location: Optional[str], data: Optional[Dict[str, Any]],
+                       error: Optional[str]) -> Dict[str, Any]:
+        matches = (data or {}).get('data', [])
+        return {
+            'business_name': business_name,
+            'location': location,
+            'ok': error is None,
+            'business_id': matches[0]['id'] if error is None and matches else None,
+            'data': matches,
+            'error': error,
+        }
+
+    def _graph_batch(self, relative_urls: List[str],
+                     operation: str) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Run GET sub-requests through the Graph ``batch`` parameter.
+        
+        Each batch call takes one rate budget token per sub-request.
+        
+        Args:
+            relative_urls: Graph paths with their query strings
+            operation: Rate budget operation the calls draw from
+            
+        Returns:
+            list: ``(body, error)`` per URL, in order; a failed batch call
+            fails every sub-request in it rather than raising
+            
+        Raises:
+            AuthenticationError: Not logged in, or Graph refused the token,
+                so a pooled instance can log in again and retry
+        """
+        if not self.access_token:
+            raise AuthenticationError("Must be logged in to make Graph requests")
+        
+        outcomes: List[Tuple[Optional[Dict[str, Any]], Optional[str]]] = []
+        for start in range(0, len(relative_urls), self.MAX_BATCH_SIZE):
+            chunk = relative_urls[start:start + self.MAX_BATCH_SIZE]
+            batch = [{'method': 'GET', 'relative_url': url} for url in chunk]
+            try:
+                self._spend_budget(operation, tokens=len(chunk))
+                response = self.session.post(self.base_url, data={
+                    'access_token': self.access_token,
+                    'batch': json.dumps(batch),
+                    'include_headers': 'false',
+                })
+            except (RateLimitError, requests.exceptions.RequestException) as e:
+                outcomes.extend((None, f"Facebook batch request failed: {e}") for _ in chunk)
+                continue
+            if response.status_code == 401:
+                raise AuthenticationError(f"Facebook batch request failed: {response.text}")
+            if response.status_code != 200:
+                outcomes.extend((None, f"Facebook batch request failed: {response.text}") for _ in chunk)
+                continue
+            
+            try:
+                answers = response.json()
+            except ValueError:
+                answers = None
+            if not isinstance(answers, list):
+                # E.g. a proxy's HTML page or a Graph error object
+                error = f"Facebook batch request failed: unexpected response {response.text[:200]!r}"
+                outcomes.extend((None, error) for _ in chunk)
+                continue
+            for index in range(len(chunk)):
+                answer = answers[index] if index < len(answers) else None
+                outcomes.append(self._batch_outcome(answer))
+        return outcomes
+
+    @staticmethod
+    def _batch_outcome(answer: Optional[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        # Graph returns null for sub-requests it did not get to in time
+        if answer is None:
+            return None, "Sub-request not completed; retry it"
+        if not isinstance(answer, dict):
+            return None, f"Unexpected sub-request answer: {answer!r}"
+        try:
+            body = json.loads(answer.get('body') or 'null')
+        except ValueError:
+            body = None
+        if answer.get('code') != 200:
+            message = ((body or {}).get('error') or {}).get('message') if isinstance(body, dict) else None
+            return None, message or f"HTTP {answer.get('code')}"
+        return body, None
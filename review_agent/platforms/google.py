@@ -2,10 +2,12 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from .base import ReviewPlatform
+from .base import AuthenticationError, ReviewPlatform
 from typing import Dict
 
 class GoogleReviewPlatform(ReviewPlatform):
+    platform_name = "Google"
+
     def __init__(self):
         self.driver = None
         self.is_logged_in = False
@@ -39,7 +41,7 @@ class GoogleReviewPlatform(ReviewPlatform):
             str: Google Places ID for the business
         """
         if not self.is_logged_in:
-            raise ValueError("Must be logged in to search for businesses")
+            raise AuthenticationError("Must be logged in to search for businesses")
             
         search_query = f"{business_name} {location}"
         self.driver.get(f"https://www.google.com/maps/search/{search_query}")
@@ -58,7 +60,7 @@ class GoogleReviewPlatform(ReviewPlatform):
             rating (int): Rating (1-5)
         """
         if not self.is_logged_in:
-            raise ValueError("Must be logged in to post reviews")
+            raise AuthenticationError("Must be logged in to post reviews")
             
         # Navigate to the review page
         review_url = f"https://search.google.com/local/writereview?place_id={business_id}"
@@ -72,6 +74,12 @@ class GoogleReviewPlatform(ReviewPlatform):
         # This is where you'd implement the actual review posting logic
         # using Selenium commands
         
+    def close(self):
+        """Close the browser"""
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+
     def __del__(self):
         """Cleanup: Close the browser when done"""
         if self.driver:
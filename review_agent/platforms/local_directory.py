@@ -1,7 +1,24 @@
+import contextvars
 import requests
 import json
-from typing import Dict, Any
-from .base import ReviewPlatform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple, Union
+from .base import (AuthenticationError, BusinessNotFoundError, PlatformUnavailableError, RateLimitError,
+                   ReviewPlatform)
+from .. import events
+from ..outbox import OutboxEntry, OutboxFlusher, PlatformHealth, new_idempotency_key
+from ..registry import BUSINESS_REGISTRY, business_slug, canonical_name, numbers_match
+from ..transport import HTTPTransport
+
+
+class _DirectoryUnavailable(Exception):
+    """The directory API answered with an error; fall back to a mock ID."""
+
+
+# Marks business IDs made up while the server was unreachable:
+# "offline:<name slug>[@<location slug>]"
+PLACEHOLDER_PREFIX = "offline:"
 
 class LocalDirectoryPlatform(ReviewPlatform):
     """
@@ -11,11 +28,82 @@ class LocalDirectoryPlatform(ReviewPlatform):
     This simulates a real review platform but is under our control.
     """
     
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    platform_name = "Local Directory"
+    
+    _instrumented_methods = {
+        **ReviewPlatform._instrumented_methods,
+        'post_reviews_batch': 'post_reviews_batch',
+        'flush_outbox': 'flush_outbox',
+    }
+    # Take one rate budget token per review they send
+    _self_metered_methods = frozenset({'post_reviews_batch', 'flush_outbox'})
+    
+    # Resolves spelling variants of a business to one ID and makes concurrent
+    # searches for the same new business share one create call
+    business_registry = BUSINESS_REGISTRY
+    
+    # Durable queue for posts while the server is unreachable (see
+    # review_agent.outbox); without one such posts are only simulated
+    outbox = None
+    # Seconds between background delivery attempts of queued posts
+    outbox_flush_interval = 5.0
+    
+    # Placeholder business ID -> (name, location) as first given, shared by
+    # every instance in the process; IDs not in it (from another process)
+    # are resolved from their canonical name and location
+    _placeholder_businesses: Dict[str, Tuple[str, Optional[str]]] = {}
+    
+    def __init__(self, base_url: str = "http://localhost:8000", transport: Optional[HTTPTransport] = None):
+        """
+        Args:
+            base_url: Directory API root
+            transport: Shared HTTP transport (default: a new one with a
+                single retry, so an absent server falls back quickly)
+        """
         self.base_url = base_url
         self.api_key = None
-        self.session = requests.Session()
+        self.session = transport or HTTPTransport(retries=1)
         self.is_authenticated = False
+        # Minimum fuzzy-search score (servers that report one) to accept a
+        # match instead of creating the business
+        self.match_threshold = 0.8
+        # Cleared when the server answers the batch endpoint with 404/405
+        self.batch_supported = True
+        # Skips the network for a while after the server was unreachable
+        self.health = PlatformHealth(self.platform_name)
+        self._flusher: Optional[OutboxFlusher] = None
+        self._flusher_lock = threading.Lock()
+
+    @property
+    def _namespace(self) -> str:
+        """Business cache, registry and outbox partition: one per directory server."""
+        return f"{self.platform_name} {self.base_url}"
+
+    def _is_placeholder_id(self, business_id: str) -> bool:
+        return isinstance(business_id, str) and business_id.startswith(PLACEHOLDER_PREFIX)
+
+    def _placeholder_business(self, business_id: str) -> Tuple[str, Optional[str]]:
+        """Name and location a placeholder ID stands for."""
+        known = self._placeholder_businesses.get(business_id)
+        if known is not None:
+            return known
+        name, _, location = business_id[len(PLACEHOLDER_PREFIX):].partition("@")
+        return name.replace("_", " "), location.replace("_", " ") or None
+
+    def _resolve_business(self, name: str, location: Optional[str], check_health: bool = True) -> str:
+        """Server ID for a business, creating it if needed."""
+        # With a business cache the registry keeps IDs no longer than it does
+        ttl = self.business_cache.ttl if self.business_cache is not None else None
+        return self.business_registry.resolve(
+            self._namespace, name, location,
+            create=lambda: self._find_or_create_business(name, location, check_health=check_health),
+            threshold=self.match_threshold, ttl=ttl)
+    
+    def _forget_business(self, business_id: str):
+        """Drop a business the server no longer knows, so the next search finds or creates it again."""
+        self.business_registry.forget_id(self._namespace, business_id)
+        if self.business_cache is not None:
+            self.business_cache.invalidate_id(self._namespace, business_id)
 
     def login(self, credentials: Dict[str, str]):
         """
@@ -31,13 +119,18 @@ class LocalDirectoryPlatform(ReviewPlatform):
                 'Content-Type': 'application/json'
             })
             self.is_authenticated = True
-            print("✅ Local Directory API authentication successful")
-            return True
+            events.emit("platform.login", "✅ Local Directory API authentication successful",
+                        platform=self.platform_name, mode="api_key")
         else:
             # For demo purposes, accept any credentials
             self.is_authenticated = True  
-            print("✅ Local Directory login successful (demo mode)")
-            return True
+            events.emit("platform.login", "✅ Local Directory login successful (demo mode)",
+                        platform=self.platform_name, mode="demo")
+        
+        # Deliver posts queued by an earlier run
+        if self.outbox is not None and self.outbox.pending(self._namespace):
+            self._ensure_flusher()
+        return True
 
     def search_business(self, business_name: str, location: str = None) -> str:
         """
@@ -51,33 +144,52 @@ class LocalDirectoryPlatform(ReviewPlatform):
             str: Business ID
         """
         if not self.is_authenticated:
-            raise ValueError("Must be authenticated to search businesses")
+            raise AuthenticationError("Must be authenticated to search businesses")
+        
+        try:
+            return self._resolve_business(business_name, location)
+        except (requests.exceptions.ConnectionError, _DirectoryUnavailable):
+            # Local server not running or failing, create mock ID
+            return self._create_mock_business_id(business_name, location)
+
+    def _find_or_create_business(self, business_name: str, location: str = None,
+                                 check_health: bool = True) -> str:
+        """Search the directory and create the business if there is no match."""
+        if check_health and not self.health.available():
+            raise _DirectoryUnavailable("Local Directory is unreachable")
+        search_url = f"{self.base_url}/api/businesses/search"
+        params = {
+            'name': business_name,
+            'location': location
+        }
         
         try:
-            search_url = f"{self.base_url}/api/businesses/search"
-            params = {
-                'name': business_name,
-                'location': location
-            }
-            
             response = self.session.get(search_url, params=params)
-            
-            if response.status_code == 200:
-                results = response.json()
-                if results.get('businesses'):
-                    business = results['businesses'][0]
-                    print(f"🔍 Found business: {business['name']} (ID: {business['id']})")
-                    return business['id']
-                else:
-                    # If not found, create a new business entry
-                    return self._create_business(business_name, location)
-            else:
-                # API not available, create mock ID
-                return self._create_mock_business_id(business_name, location)
-                
         except requests.exceptions.ConnectionError:
-            # Local server not running, create mock ID
-            return self._create_mock_business_id(business_name, location)
+            self.health.record_failure()
+            raise
+        self.health.record_success()
+        
+        if response.status_code == 200:
+            results = response.json()
+            matches = [
+                business for business in results.get('businesses', [])
+                if business.get('score', 1.0) >= self.match_threshold
+                and numbers_match(business_name, business.get('name'))
+            ]
+            if matches:
+                business = matches[0]
+                events.emit("platform.search_business", "🔍 Found business: {business_name} (ID: {business_id})",
+                            platform=self.platform_name, business_name=business['name'],
+                            business_id=business['id'])
+                return business['id']
+            else:
+                # If not found, create a new business entry
+                return self._create_business(business_name, location)
+        elif response.status_code == 401:
+            raise AuthenticationError(f"Search failed: {response.text}")
+        else:
+            raise _DirectoryUnavailable(f"Search failed: {response.text}")
 
     def post_review(self, business_id: str, review_text: str, rating: int):
         """
@@ -89,63 +201,349 @@ class LocalDirectoryPlatform(ReviewPlatform):
             rating: Rating 1-5
         """
         if not self.is_authenticated:
-            raise ValueError("Must be authenticated to post reviews")
+            raise AuthenticationError("Must be authenticated to post reviews")
+        
+        # Sent with the first attempt so a queued retry cannot duplicate it
+        key = new_idempotency_key() if self.outbox is not None else None
+        if not self.health.available():
+            return self._post_unreachable(business_id, review_text, rating, key)
         
         try:
+            if self._is_placeholder_id(business_id):
+                # Found while the server was down; it is back, so look it up
+                business_id = self._resolve_business(*self._placeholder_business(business_id))
             review_url = f"{self.base_url}/api/businesses/{business_id}/reviews"
-            
-            review_data = {
-                'text': review_text,
-                'rating': rating,
-                'author': 'Review Agent User',
-                'date': '2024-03-21'
-            }
-            
-            response = self.session.post(review_url, json=review_data)
+            response = self.session.post(review_url, json=self._review_payload(review_text, rating, key))
+            self.health.record_success()
             
             if response.status_code in [200, 201]:
                 result = response.json()
-                print(f"✅ Review posted to Local Directory")
-                print(f"📝 Review ID: {result.get('id', 'N/A')}")
+                events.emit("platform.post_review", "✅ Review posted to Local Directory\n📝 Review ID: {review_id}",
+                            platform=self.platform_name, business_id=business_id, rating=rating,
+                            review_id=result.get('id', 'N/A'))
                 return result
+            elif response.status_code == 401:
+                raise AuthenticationError(f"Review posting failed: {response.text}")
+            elif response.status_code == 404:
+                self._forget_business(business_id)
+                raise BusinessNotFoundError(f"Review posting failed: {response.text}")
             else:
                 raise ValueError(f"Review posting failed: {response.text}")
                 
         except requests.exceptions.ConnectionError:
-            # Local server not running, simulate successful post
+            # Local server not running, queue or simulate the post
+            self.health.record_failure()
+            return self._post_unreachable(business_id, review_text, rating, key)
+        except _DirectoryUnavailable:
+            # Resolving a placeholder failed on the server's side
+            return self._post_unreachable(business_id, review_text, rating, key)
+        except requests.exceptions.Timeout:
+            # The server may have stored it; only a keyed redelivery is safe
+            if key is None:
+                raise
+            return self._post_unreachable(business_id, review_text, rating, key)
+
+    def _post_unreachable(self, business_id: str, review_text: str, rating: int,
+                          key: Optional[str]) -> Dict[str, Any]:
+        """Queue a post for later delivery, or simulate it without an outbox."""
+        if self.outbox is None:
             return self._simulate_post(business_id, review_text, rating)
+        
+        business_name, location = (self._placeholder_business(business_id)
+                                   if self._is_placeholder_id(business_id) else (None, None))
+        key = self.outbox.enqueue(self._namespace, business_id, review_text, rating, key,
+                                  business_name=business_name, location=location)
+        self._ensure_flusher()
+        events.emit("platform.post_review_queued",
+                    "📥 Local Directory unreachable, review queued for delivery\n🔑 Idempotency key: {key}",
+                    platform=self.platform_name, business_id=business_id, rating=rating, key=key)
+        return {
+            'id': None,
+            'business_id': business_id,
+            'text': review_text,
+            'rating': rating,
+            'status': 'queued',
+            'idempotency_key': key,
+            'platform': 'Local Directory (Queued)'
+        }
 
-    def _create_business(self, business_name: str, location: str = None) -> str:
-        """Create a new business entry in the directory."""
-        try:
-            create_url = f"{self.base_url}/api/businesses"
+    def _ensure_flusher(self):
+        with self._flusher_lock:
+            if self._flusher is None:
+                self._flusher = OutboxFlusher(self, interval=self.outbox_flush_interval).start()
+
+    def flush_outbox(self, batch_size: int = 100) -> int:
+        """
+        Deliver queued posts while the server takes them.
+        
+        Entries are sent in batches with their idempotency keys, so a
+        redelivered post is not created twice. Placeholder business IDs
+        are resolved first. Entries the server rejects (4xx) are marked
+        failed; on a server error, an outage or an exhausted rate budget
+        (one token per review) the rest stay queued.
+        
+        Args:
+            batch_size: Entries per request
             
-            business_data = {
-                'name': business_name,
-                'location': location or 'Unknown Location',
-                'category': 'General Business'
-            }
+        Returns:
+            int: Number of posts delivered
+        """
+        if self.outbox is None or not self.health.available():
+            return 0
+        
+        delivered = 0
+        while True:
+            entries = self.outbox.claim(self._namespace, batch_size)
+            if not entries:
+                break
+            try:
+                sent, keep_going = self._deliver(entries)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, _DirectoryUnavailable,
+                    RateLimitError) as e:
+                if not isinstance(e, (_DirectoryUnavailable, RateLimitError)):
+                    self.health.record_failure()
+                self.outbox.release([entry.id for entry in entries], str(e))
+                break
+            delivered += sent
+            if not keep_going:
+                break
+        
+        if delivered:
+            events.emit("outbox.flushed", "📤 Delivered {count} queued reviews to Local Directory ({pending} left)",
+                        platform=self.platform_name, count=delivered,
+                        pending=self.outbox.pending(self._namespace))
+        return delivered
+
+    def _deliver(self, entries: List[OutboxEntry]) -> Tuple[int, bool]:
+        """Post claimed entries; returns (delivered, whether to continue)."""
+        resolved = []
+        for entry in entries:
+            # Entries queued by another process may only carry the placeholder
+            if entry.business_name is not None:
+                name, location = entry.business_name, entry.location
+            elif self._is_placeholder_id(entry.business_id):
+                name, location = self._placeholder_business(entry.business_id)
+            else:
+                resolved.append(entry)
+                continue
+            business_id = self._resolve_business(name, location, check_health=False)
+            resolved.append(entry._replace(business_id=business_id))
+        
+        if self.batch_supported:
+            self._spend_budget('flush_outbox', tokens=len(resolved))
+            response = self.session.post(f"{self.base_url}/api/reviews/batch", json={
+                'reviews': [
+                    dict(self._review_payload(entry.review_text, entry.rating, entry.idempotency_key),
+                         business_id=entry.business_id)
+                    for entry in resolved
+                ]
+            })
+            self.health.record_success()
+            if response.status_code in (200, 201, 207):
+                answers = response.json().get('results', [])
+                return self._settle(resolved, [answer.get('status', 201) for answer in answers],
+                                    [answer.get('error') for answer in answers])
+            if response.status_code not in (404, 405):
+                self.outbox.release([entry.id for entry in resolved], f"status {response.status_code}")
+                return 0, False
+            self.batch_supported = False
+        
+        statuses, errors = [], []
+        for entry in resolved:
+            self._spend_budget('flush_outbox')
+            response = self.session.post(
+                f"{self.base_url}/api/businesses/{entry.business_id}/reviews",
+                json=self._review_payload(entry.review_text, entry.rating, entry.idempotency_key))
+            statuses.append(response.status_code)
+            errors.append(None if response.status_code < 400 else response.text)
+        self.health.record_success()
+        return self._settle(resolved, statuses, errors)
+
+    def _settle(self, entries: List[OutboxEntry], statuses: List[int],
+                errors: List[Optional[str]]) -> Tuple[int, bool]:
+        """Complete, fail or release each entry by its delivery status."""
+        delivered, retry = [], []
+        for index, entry in enumerate(entries):
+            status = statuses[index] if index < len(statuses) else 500
+            error = errors[index] if index < len(errors) else 'missing from batch response'
+            if status == 404:
+                self._forget_business(entry.business_id)
+            if status < 400:
+                delivered.append(entry.id)
+            elif 400 <= status < 500 and status not in (401, 408, 429):
+                self.outbox.fail(entry.id, error or f"status {status}")
+            else:
+                retry.append(entry.id)
+        self.outbox.complete(delivered)
+        if retry:
+            self.outbox.release(retry, "server error; will retry")
+        return len(delivered), not retry
+
+    def close(self):
+        """Stop the outbox flusher after a last delivery attempt, then close the session."""
+        with self._flusher_lock:
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.stop()
+        super().close()
+
+    def post_reviews_batch(self, reviews: Iterable[Union[Dict[str, Any], Sequence[Any]]],
+                           chunk_size: int = 100, concurrency: int = 4) -> List[Dict[str, Any]]:
+        """
+        Post many reviews with one request per chunk.
+
+        Chunks are sent to ``POST /api/reviews/batch``, each taking one rate
+        budget token per review it carries. If the server has no
+        batch endpoint (404/405) or is not running, every review is posted
+        with ``post_review`` instead, ``concurrency`` at a time over the
+        session's kept-alive connections.
+        
+        Args:
+            reviews: ``(business_id, review_text, rating)`` tuples or dicts
+                with those keys
+            chunk_size: Reviews per batch request
+            concurrency: Batch requests (or single posts) in flight at once
             
-            response = self.session.post(create_url, json=business_data)
+        Returns:
+            list: One dict per review, in input order, with ``business_id``,
+            ``ok``, ``result`` (the posted review) and ``error``
+        """
+        if not self.is_authenticated:
+            raise AuthenticationError("Must be authenticated to post reviews")
+        
+        items = [self._batch_item(review) for review in reviews]
+        chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+        results: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="local-directory-batch") as executor:
+            # copy_context keeps the caller's correlation ID in the workers
+            run = lambda function, *args: contextvars.copy_context().run(function, *args)
+            for chunk, chunk_results in zip(chunks, executor.map(lambda chunk: run(self._post_chunk, chunk), chunks)):
+                if chunk_results is None:
+                    chunk_results = list(executor.map(lambda item: run(self._post_single, *item), chunk))
+                results.extend(chunk_results)
+        
+        posted = sum(1 for result in results if result['ok'])
+        events.emit("platform.post_reviews_batch", "✅ Posted {posted}/{total} reviews to Local Directory",
+                    platform=self.platform_name, posted=posted, total=len(results),
+                    batched=self.batch_supported)
+        return results
+
+    @staticmethod
+    def _batch_item(review: Union[Dict[str, Any], Sequence[Any]]) -> Tuple[str, str, int]:
+        if isinstance(review, dict):
+            return review['business_id'], review['review_text'], review['rating']
+        business_id, review_text, rating = review
+        return business_id, review_text, rating
+
+    def _post_chunk(self, chunk: List[Tuple[str, str, int]]) -> Optional[List[Dict[str, Any]]]:
+        """Post one chunk to the batch endpoint; None means post it item by item."""
+        if self.batch_supported and self.health.available():
+            try:
+                self._spend_budget('post_reviews_batch', tokens=len(chunk))
+            except RateLimitError as e:
+                error = f"Batch posting failed: {e}"
+                return [self._item_result(business_id, error=error) for business_id, _text, _rating in chunk]
+            try:
+                response = self.session.post(f"{self.base_url}/api/reviews/batch", json={
+                    'reviews': [
+                        dict(self._review_payload(review_text, rating), business_id=business_id)
+                        for business_id, review_text, rating in chunk
+                    ]
+                })
+            except requests.exceptions.ConnectionError:
+                # Post item by item, which queues or simulates each one
+                self.health.record_failure()
+                return None
+            except requests.exceptions.RequestException as e:
+                # E.g. a read timeout: the server may have stored the chunk,
+                # so report it rather than posting it again
+                error = f"Batch posting failed: {e}"
+                return [self._item_result(business_id, error=error) for business_id, _text, _rating in chunk]
             
-            if response.status_code in [200, 201]:
-                result = response.json()
-                business_id = result.get('id', self._create_mock_business_id(business_name, location))
-                print(f"🆕 Created new business: {business_name} (ID: {business_id})")
-                return business_id
+            if response.status_code in (200, 201, 207):
+                try:
+                    answers = response.json().get('results', [])
+                except (ValueError, AttributeError):
+                    error = f"Batch posting failed: unreadable response {response.text[:200]!r}"
+                    return [self._item_result(business_id, error=error) for business_id, _text, _rating in chunk]
+                return self._chunk_results(chunk, answers)
+            if response.status_code not in (404, 405):
+                error = f"Batch posting failed: {response.status_code} {response.text}"
+                return [self._item_result(business_id, error=error) for business_id, _text, _rating in chunk]
+            self.batch_supported = False
+        
+        return None
+
+    def _post_single(self, business_id: str, review_text: str, rating: int) -> Dict[str, Any]:
+        try:
+            return self._item_result(business_id, result=self.post_review(business_id, review_text, rating))
+        except Exception as e:
+            return self._item_result(business_id, error=str(e))
+
+    def _chunk_results(self, chunk: List[Tuple[str, str, int]], answers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results = []
+        for index, (business_id, _text, _rating) in enumerate(chunk):
+            answer = answers[index] if index < len(answers) else {'error': 'missing from batch response'}
+            if answer.get('status') == 404:
+                self._forget_business(business_id)
+            if answer.get('error') or answer.get('status', 201) >= 400:
+                results.append(self._item_result(business_id, error=answer.get('error', f"status {answer.get('status')}")))
             else:
-                return self._create_mock_business_id(business_name, location)
-                
-        except requests.exceptions.ConnectionError:
-            return self._create_mock_business_id(business_name, location)
+                results.append(self._item_result(business_id, result=answer.get('review', answer)))
+        return results
+
+    @staticmethod
+    def _item_result(business_id: str, result: Optional[Dict[str, Any]] = None,
+                     error: Optional[str] = None) -> Dict[str, Any]:
+        return {'business_id': business_id, 'ok': error is None, 'result': result, 'error': error}
+
+    @staticmethod
+    def _review_payload(review_text: str, rating: int, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        payload = {
+            'text': review_text,
+            'rating': rating,
+            'author': 'Review Agent User',
+            'date': '2024-03-21'
+        }
+        if idempotency_key:
+            payload['idempotency_key'] = idempotency_key
+        return payload
+
+    def _create_business(self, business_name: str, location: str = None) -> str:
+        """Create a new business entry in the directory."""
+        create_url = f"{self.base_url}/api/businesses"
+        
+        business_data = {
+            'name': business_name,
+            'location': location or 'Unknown Location',
+            'category': 'General Business'
+        }
+        
+        response = self.session.post(create_url, json=business_data)
+        
+        if response.status_code in [200, 201]:
+            result = response.json()
+            if 'id' not in result:
+                raise _DirectoryUnavailable(f"Business creation returned no ID: {response.text}")
+            business_id = result['id']
+            events.emit("platform.create_business", "🆕 Created new business: {business_name} (ID: {business_id})",
+                        platform=self.platform_name, business_name=business_name, business_id=business_id)
+            return business_id
+        elif response.status_code == 401:
+            raise AuthenticationError(f"Business creation failed: {response.text}")
+        else:
+            raise _DirectoryUnavailable(f"Business creation failed: {response.text}")
 
     def _create_mock_business_id(self, business_name: str, location: str = None) -> str:
         """Create a mock business ID when API is not available."""
-        base_id = business_name.lower().replace(" ", "_").replace(",", "")
-        if location:
-            base_id += f"_{location.lower().replace(' ', '_')}"
+        base_id = PLACEHOLDER_PREFIX + business_slug(business_name)
+        if canonical_name(location):
+            base_id += "@" + business_slug(location)
+        self._placeholder_businesses.setdefault(base_id, (business_name, location))
         
-        print(f"🔍 Mock business ID created: {base_id}")
+        events.emit("platform.search_business", "🔍 Mock business ID created: {business_id}",
+                    platform=self.platform_name, business_name=business_name, business_id=base_id,
+                    simulated=True)
         return base_id
 
     def _simulate_post(self, business_id: str, review_text: str, rating: int) -> Dict[str, Any]:
@@ -159,20 +557,134 @@ class LocalDirectoryPlatform(ReviewPlatform):
             'platform': 'Local Directory (Simulated)'
         }
         
-        print(f"✅ Review simulated successfully on Local Directory")
-        print(f"📝 Simulated Review ID: {result['id']}")
+        events.emit("platform.post_review",
+                    "✅ Review simulated successfully on Local Directory\n📝 Simulated Review ID: {review_id}",
+                    platform=self.platform_name, business_id=business_id, rating=rating,
+                    review_id=result['id'], simulated=True)
         return result
 
     def get_business_reviews(self, business_id: str) -> list:
         """Get all reviews for a business."""
-        try:
-            reviews_url = f"{self.base_url}/api/businesses/{business_id}/reviews"
-            response = self.session.get(reviews_url)
+        return list(self.iter_business_reviews(business_id))
+
+    def iter_business_reviews(self, business_id: str, page_size: int = 100, since: Optional[str] = None,
+                              cursor: Optional[str] = None, prefetch: bool = True) -> "ReviewPages":
+        """
+        Iterate over a business's reviews one server page at a time.
+        
+        Pages are fetched lazily, so at most the current and the next page
+        are held in memory; with ``prefetch`` the next page is requested on
+        a background thread while the caller works through the current one.
+        
+        Args:
+            business_id: Business identifier
+            page_size: Reviews per request
+            since: Only reviews with a later ``created_at``
+            cursor: Resume after this cursor, e.g. ``pages.cursor`` saved
+                at the end of a previous sync, to get only new reviews
+            prefetch: Fetch the next page in the background
             
-            if response.status_code == 200:
-                return response.json().get('reviews', [])
-            else:
-                return []
+        Returns:
+            ReviewPages: Iterable of review dicts; after iteration its
+            ``cursor`` is the resume point for the next incremental sync
+            
+        If the first page cannot be fetched the business reads as having
+        no reviews, as with ``get_business_reviews``.
+        
+        Raises:
+            PlatformUnavailableError: While iterating, if a page after the
+                first cannot be fetched
+            AuthenticationError: While iterating, if a page after the first
+                is refused
+        """
+        return ReviewPages(self, business_id, page_size, since, cursor, prefetch)
+
+    def _fetch_review_page(self, business_id: str, page_size: int, since: Optional[str],
+                           cursor: Optional[str], first: bool = True) -> Dict[str, Any]:
+        """
+        Fetch one page of reviews.
+        
+        On the first page an absent server, or any answer other than a
+        readable 200, reads as no reviews, as ``get_business_reviews`` always
+        did. Any failure after that raises, so a partial listing is never
+        mistaken for a complete one.
+        
+        Raises:
+            PlatformUnavailableError: A page after the first could not be fetched
+            AuthenticationError: A page after the first was refused
+        """
+        params = {'limit': page_size}
+        if since:
+            params['since'] = since
+        if cursor:
+            params['cursor'] = cursor
+        try:
+            response = self.session.get(f"{self.base_url}/api/businesses/{business_id}/reviews", params=params)
+        except requests.exceptions.ConnectionError as e:
+            if first:
+                return {}  # API not available
+            raise PlatformUnavailableError(f"Fetching reviews failed after {cursor}: {e}") from e
+        if first and response.status_code != 200:
+            return {}
+        if response.status_code == 401:
+            raise AuthenticationError(f"Fetching reviews failed: {response.text}")
+        if response.status_code != 200:
+            raise PlatformUnavailableError(f"Fetching reviews failed: {response.status_code} {response.text}")
+        try:
+            return response.json()
+        except ValueError as e:
+            if first:
+                return {}
+            raise PlatformUnavailableError(f"Fetching reviews failed: unreadable page {response.text[:200]!r}") from e
+
+
+class ReviewPages:
+    """Lazy, prefetching iterator over the pages of a business's reviews."""
+    
+    def __init__(self, platform: LocalDirectoryPlatform, business_id: str, page_size: int,
+                 since: Optional[str], cursor: Optional[str], prefetch: bool):
+        self.platform = platform
+        self.business_id = business_id
+        self.page_size = page_size
+        self.since = since
+        self.prefetch = prefetch
+        # Resume point: the server's cursor after the last page read so far
+        self.cursor = cursor
+        self.pages = 0
+    
+    def _fetch(self, cursor: Optional[str], first: bool = False) -> Dict[str, Any]:
+        return self.platform._fetch_review_page(self.business_id, self.page_size, self.since, cursor, first)
+    
+    def __iter__(self):
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="review-prefetch") if self.prefetch else None
+        upcoming = None
+        try:
+            page = self._fetch(self.cursor, first=True)
+            while page:
+                self.pages += 1
+                next_cursor = page.get('next_cursor')
+                # Servers without pagination return everything in one page
+                has_more = bool(page.get('has_more')) and next_cursor is not None
+                upcoming = None
+                if has_more and executor is not None:
+                    upcoming = executor.submit(contextvars.copy_context().run, self._fetch, next_cursor)
                 
-        except requests.exceptions.ConnectionError:
-            return []  # Return empty list if API not available
\ No newline at end of file
+                # A copy: a revalidated page is shared with the HTTP cache
+                reviews = list(page.get('reviews', []))
+                page = None
+                # Pop as we go so consumed reviews can be freed
+                reviews.reverse()
+                while reviews:
+                    yield reviews.pop()
+                
+                if next_cursor is not None:
+                    self.cursor = next_cursor
+                if not has_more:
+                    break
+                page = upcoming.result() if upcoming is not None else self._fetch(next_cursor)
+                upcoming = None
+        finally:
+            if executor is not None:
+                if upcoming is not None:
+                    upcoming.cancel()
+                executor.shutdown(wait=False)
\ No newline at end of file
@@ -1,19 +1,37 @@
 import json
 import os
 from datetime import datetime
-from typing import Dict, Any
-from .base import ReviewPlatform
+from typing import Dict, Any, Optional
+from .base import AuthenticationError, ReviewPlatform
+from .. import events
+from ..faults import FaultInjector, FaultProfile
+from ..registry import business_slug
 
 class MockPlatform(ReviewPlatform):
     """
     Mock platform for testing and development.
-    Saves reviews to local files instead of posting online.
+    Saves reviews to local files instead of posting online, optionally
+    with injected latency and failures for load testing.
     """
     
-    def __init__(self, platform_name: str = "Mock"):
+    # Latency, errors, rate limits and outages to inject (see
+    # review_agent.faults); set on the class for every mock platform
+    faults: Optional[FaultProfile] = None
+    
+    def __init__(self, platform_name: str = "Mock", reviews_dir: str = "mock_reviews",
+                 faults: Optional[FaultProfile] = None):
+        """
+        Args:
+            platform_name: Display name, also used in review file names
+            reviews_dir: Directory the reviews are saved to
+            faults: Fault profile for this instance (default: ``MockPlatform.faults``)
+        """
         self.platform_name = platform_name
-        self.reviews_dir = "mock_reviews"
+        self.reviews_dir = reviews_dir
         self.is_logged_in = False
+        if faults is not None:
+            self.faults = faults
+        self._faults = FaultInjector(self.faults, platform_name) if self.faults is not None else None
         
         # Create reviews directory if it doesn't exist
         os.makedirs(self.reviews_dir, exist_ok=True)
@@ -25,7 +43,8 @@ class MockPlatform(ReviewPlatform):
         Args:
             credentials: Any credentials (ignored in mock)
         """
-        print(f"✅ Mock login successful to {self.platform_name}")
+        events.emit("platform.login", "✅ Mock login successful to {platform}",
+                    platform=self.platform_name)
         self.is_logged_in = True
         return True
 
@@ -41,14 +60,16 @@ class MockPlatform(ReviewPlatform):
             str: Mock business ID
         """
         if not self.is_logged_in:
-            raise ValueError("Must be logged in to search businesses")
+            raise AuthenticationError("Must be logged in to search businesses")
+        if self._faults is not None:
+            self._faults.before_call("search_business")
             
-        # Create a simple ID from business name
-        business_id = business_name.lower().replace(" ", "_").replace(",", "")
-        if location:
-            business_id += f"_{location.lower().replace(' ', '_')}"
+        # Derived from the canonical name alone, so spellings with the same
+        # canonical form share an ID whichever this process saw first
+        business_id = business_slug(business_name, location)
             
-        print(f"🔍 Found business: {business_name} (ID: {business_id})")
+        events.emit("platform.search_business", "🔍 Found business: {business_name} (ID: {business_id})",
+                    platform=self.platform_name, business_name=business_name, business_id=business_id)
         return business_id
 
     def post_review(self, business_id: str, review_text: str, rating: int):
@@ -61,7 +82,9 @@ class MockPlatform(ReviewPlatform):
             rating: Rating 1-5
         """
         if not self.is_logged_in:
-            raise ValueError("Must be logged in to post reviews")
+            raise AuthenticationError("Must be logged in to post reviews")
+        if self._faults is not None:
+            self._faults.before_call("post_review")
             
         timestamp = datetime.now().isoformat()
         
@@ -74,15 +97,29 @@ class MockPlatform(ReviewPlatform):
             'status': 'posted_successfully'
         }
         
-        # Save to file
-        filename = f"{self.reviews_dir}/{business_id}_{timestamp.replace(':', '-')}.json"
-        with open(filename, 'w') as f:
-            json.dump(review_data, f, indent=2)
+        # Save to file. Concurrent posts for the same business can share a
+        # timestamp, so never overwrite an existing review file.
+        stem = f"{self.reviews_dir}/{business_id}_{timestamp.replace(':', '-')}"
+        filename = f"{stem}.json"
+        suffix = 0
+        while True:
+            try:
+                with open(filename, 'x') as f:
+                    json.dump(review_data, f, indent=2)
+                break
+            except FileExistsError:
+                suffix += 1
+                filename = f"{stem}_{suffix}.json"
             
-        print(f"✅ Review posted successfully to {self.platform_name}")
-        print(f"📁 Saved to: {filename}")
-        print(f"⭐ Rating: {rating}/5")
-        print(f"📝 Preview: {review_text[:100]}...")
+        events.emit(
+            "platform.post_review",
+            "✅ Review posted successfully to {platform}\n"
+            "📁 Saved to: {path}\n"
+            "⭐ Rating: {rating}/5\n"
+            "📝 Preview: {preview}...",
+            platform=self.platform_name, business_id=business_id, rating=rating,
+            path=filename, preview=review_text[:100]
+        )
         
         return review_data
 
@@ -1,21 +1,121 @@
+import contextvars
 import requests
-import json
-from typing import Dict, Any
-from .base import ReviewPlatform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Union
+from .base import AuthenticationError, BusinessNotFoundError, ReviewPlatform, platform_label
+from .. import events
+from ..ratelimit import TokenBucket, parse_retry_after
+from ..storage import SQLiteStore
+from ..transport import HTTPTransport
+
+
+class InvitationIndex(SQLiteStore):
+    """
+    Persistent record of review invitations by (business unit, referenceId).
+    
+    A reference is claimed before its invitation is sent and marked sent
+    afterwards, so re-runs, and concurrent runs sharing the file, never
+    invite the same transaction twice. Failed invitations are released
+    and retried by the next run.
+    """
+    
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS invitations ("
+        " business_id TEXT NOT NULL, reference_id TEXT NOT NULL, email TEXT,"
+        " status TEXT NOT NULL, updated_at REAL NOT NULL, response TEXT,"
+        " PRIMARY KEY (business_id, reference_id))",
+    )
+    
+    def __init__(self, path: str = "trustpilot_invitations.db", claim_timeout: float = 600.0):
+        """
+        Args:
+            path: SQLite file
+            claim_timeout: Seconds after which a claim left by a crashed run
+                can be taken over
+        """
+        super().__init__(path)
+        self.claim_timeout = claim_timeout
+    
+    def claim(self, business_id: str, reference_id: str, email: str) -> bool:
+        """Reserve a reference for sending; False if it was sent or is being sent."""
+        now = time.time()
+        with self.transaction() as connection:
+            inserted = connection.execute(
+                "INSERT OR IGNORE INTO invitations VALUES (?, ?, ?, 'pending', ?, NULL)",
+                (business_id, reference_id, email, now)).rowcount
+            if inserted:
+                return True
+            return connection.execute(
+                "UPDATE invitations SET status = 'pending', updated_at = ?, email = ?"
+                " WHERE business_id = ? AND reference_id = ?"
+                " AND (status = 'failed' OR (status = 'pending' AND updated_at < ?))",
+                (now, email, business_id, reference_id, now - self.claim_timeout)).rowcount == 1
+    
+    def mark_sent(self, business_id: str, reference_id: str, response: Optional[str] = None):
+        """Record a sent invitation with the raw body Trustpilot answered."""
+        self.execute("UPDATE invitations SET status = 'sent', updated_at = ?, response = ?"
+                     " WHERE business_id = ? AND reference_id = ?",
+                     (time.time(), response, business_id, reference_id))
+    
+    def release(self, business_id: str, reference_id: str):
+        self.execute("UPDATE invitations SET status = 'failed', updated_at = ?"
+                     " WHERE business_id = ? AND reference_id = ?",
+                     (time.time(), business_id, reference_id))
+    
+    def status(self, business_id: str, reference_id: str) -> Optional[str]:
+        rows = self.query("SELECT status FROM invitations WHERE business_id = ? AND reference_id = ?",
+                          (business_id, reference_id))
+        return rows[0][0] if rows else None
+
 
 class TrustpilotPlatform(ReviewPlatform):
-    def __init__(self):
-        self.base_url = "https://api.trustpilot.com/v1"
+    platform_name = "Trustpilot"
+    
+    # Renew the access token this many seconds before it expires
+    TOKEN_REFRESH_MARGIN = 300.0
+
+    def __init__(self, transport: Optional[HTTPTransport] = None,
+                 base_url: str = "https://api.trustpilot.com/v1"):
+        """
+        Args:
+            transport: Shared HTTP transport
+            base_url: API root (point it at a local stand-in for testing)
+        """
+        self.base_url = base_url.rstrip('/')
         self.access_token = None
-        self.session = requests.Session()
+        self.token_expires_at = None
+        self.session = transport or HTTPTransport()
+        self._credentials = None
+        self._token_lock = threading.Lock()
 
     def login(self, credentials: Dict[str, str]):
         """
         Authenticate with Trustpilot API using API key.
         
+        With a ``session_cache``, a token cached by any process is reused
+        until shortly before it expires.
+        
         Args:
             credentials: Dict containing 'api_key' and 'secret'
         """
+        fetch = lambda: self._fetch_token(credentials)
+        if self.session_cache is not None:
+            token = self.session_cache.get_or_refresh(platform_label(self), credentials, fetch)
+        else:
+            token, _expires_at = fetch()
+        
+        self._credentials = credentials
+        self.access_token = token['access_token']
+        self.token_expires_at = token['expires_at']
+        self.session.headers.update({
+            'Authorization': f'Bearer {self.access_token}',
+            'Content-Type': 'application/json'
+        })
+        return True
+
+    def _fetch_token(self, credentials: Dict[str, str]):
         auth_url = f"{self.base_url}/oauth/oauth-business-users-for-applications/accesstoken"
         
         auth_data = {
@@ -28,15 +128,20 @@ class TrustpilotPlatform(ReviewPlatform):
         
         if response.status_code == 200:
             token_data = response.json()
-            self.access_token = token_data['access_token']
-            self.session.headers.update({
-                'Authorization': f'Bearer {self.access_token}',
-                'Content-Type': 'application/json'
-            })
-            return True
+            expires_at = time.time() + float(token_data.get('expires_in') or 3600)
+            return {'access_token': token_data['access_token'], 'expires_at': expires_at}, expires_at
         else:
             raise ValueError(f"Authentication failed: {response.text}")
 
+    def _ensure_token(self):
+        """Log in again if the access token is about to expire."""
+        if self.token_expires_at is None or time.time() < self.token_expires_at - self.TOKEN_REFRESH_MARGIN:
+            return
+        with self._token_lock:
+            # Another thread may have renewed it while we waited
+            if time.time() >= self.token_expires_at - self.TOKEN_REFRESH_MARGIN:
+                self.login(self._credentials)
+
     def search_business(self, business_name: str, location: str = None) -> str:
         """
         Search for a business on Trustpilot.
@@ -48,6 +153,7 @@ class TrustpilotPlatform(ReviewPlatform):
         Returns:
             str: Business domain/identifier
         """
+        self._ensure_token()
         search_url = f"{self.base_url}/business-units/search"
         params = {
             'query': business_name,
@@ -65,7 +171,9 @@ class TrustpilotPlatform(ReviewPlatform):
                 # Return the first match's identifier
                 return results['businessUnits'][0]['identifyingName']
             else:
-                raise ValueError(f"No business found for: {business_name}")
+                raise BusinessNotFoundError(f"No business found for: {business_name}")
+        elif response.status_code == 401:
+            raise AuthenticationError(f"Search failed: {response.text}")
         else:
             raise ValueError(f"Search failed: {response.text}")
 
@@ -81,6 +189,8 @@ class TrustpilotPlatform(ReviewPlatform):
             review_text: Review content
             rating: Rating 1-5
         """
+        self._ensure_token()
+        
         # Trustpilot typically requires invitation-based reviews
         # This is a simplified example - actual implementation would need
         # to handle their invitation system
@@ -100,6 +210,8 @@ class TrustpilotPlatform(ReviewPlatform):
         
         if response.status_code in [200, 201]:
             return response.json()
+        elif response.status_code == 401:
+            raise AuthenticationError(f"Review posting failed: {response.text}")
         else:
             raise ValueError(f"Review posting failed: {response.text}")
 
@@ -114,20 +226,155 @@ class TrustpilotPlatform(ReviewPlatform):
             customer_name: Customer's name
             reference_id: Optional reference ID for the transaction
         """
+        self._ensure_token()
         invite_url = f"{self.base_url}/private/business-units/{business_id}/email-invitations"
-        
-        invite_data = {
-            'recipient': {
-                'email': customer_email,
-                'name': customer_name
-            },
-            'referenceId': reference_id or f"review_{business_id}_{customer_email}",
-            'locale': 'en-US'
-        }
+        invite_data = self._invitation_payload(business_id, customer_email, customer_name, reference_id)
         
         response = self.session.post(invite_url, json=invite_data)
         
         if response.status_code in [200, 201]:
             return response.json()
+        elif response.status_code == 401:
+            raise AuthenticationError(f"Invitation failed: {response.text}")
         else:
-            raise ValueError(f"Invitation failed: {response.text}")
\ No newline at end of file
+            raise ValueError(f"Invitation failed: {response.text}")
+
+    def invite_reviews_bulk(self, business_id: str, customers: Iterable[Dict[str, Any]],
+                            index: Union[InvitationIndex, str, None] = "trustpilot_invitations.db",
+                            concurrency: int = 8, chunk_size: int = 200, rate_per_second: float = 10.0,
+                            max_attempts: int = 5) -> List[Dict[str, Any]]:
+        """
+        Send review invitations to many customers.
+        
+        Customers are processed in chunks, each chunk with up to
+        ``concurrency`` invitations in flight, paced by the
+        ``invite_review`` rate budget when ``rate_budgets`` has one for
+        Trustpilot, else by ``rate_per_second``. A 429 answer pauses every
+        worker for its ``Retry-After`` and the invitation is retried. References already invited, by this or an
+        earlier run sharing the ``index``, are skipped.
+        
+        Args:
+            business_id: Business unit identifier
+            customers: Dicts with ``email`` and ``name``, and optionally
+                ``reference_id`` and ``locale``
+            index: ``InvitationIndex`` or path to its SQLite file for
+                de-duplication across runs (default:
+                ``trustpilot_invitations.db``); None turns it off
+            concurrency: Invitations in flight at once
+            chunk_size: Customers read and submitted per chunk
+            rate_per_second: Maximum invitation requests per second
+                without a rate budget
+            max_attempts: Attempts per invitation when rate limited
+            
+        Returns:
+            list: One dict per customer, in order, with ``email``,
+            ``reference_id``, ``status`` (``sent``, ``duplicate`` or
+            ``failed``), ``result`` and ``error``
+        """
+        owned_index = isinstance(index, str)
+        if owned_index:
+            index = InvitationIndex(index)
+        try:
+            report = self._invite_chunks(business_id, customers, index, concurrency, chunk_size,
+                                         rate_per_second, max_attempts)
+        finally:
+            if owned_index:
+                index.close()
+        
+        counts = {status: sum(1 for item in report if item['status'] == status)
+                  for status in ('sent', 'duplicate', 'failed')}
+        events.emit("platform.invite_reviews_bulk",
+                    "✉️  Trustpilot invitations: {sent} sent, {duplicate} already sent, {failed} failed",
+                    platform=self.platform_name, business_id=business_id, **counts)
+        return report
+
+    def _invite_chunks(self, business_id: str, customers: Iterable[Dict[str, Any]],
+                       index: Optional[InvitationIndex], concurrency: int, chunk_size: int,
+                       rate_per_second: float, max_attempts: int) -> List[Dict[str, Any]]:
+        # Shared with every process drawing from the same budget, if there is one
+        limiter = (None if self._has_budget('invite_review')
+                   else TokenBucket(rate_per_second, burst=max(1.0, min(rate_per_second, concurrency))))
+        
+        report: List[Dict[str, Any]] = []
+        chunk: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="trustpilot-invite") as executor:
+            def submit_chunk():
+                invite = lambda customer: contextvars.copy_context().run(
+                    self._invite_one, business_id, customer, index, limiter, max_attempts)
+                report.extend(executor.map(invite, chunk))
+                chunk.clear()
+            
+            for customer in customers:
+                chunk.append(customer)
+                if len(chunk) >= chunk_size:
+                    submit_chunk()
+            if chunk:
+                submit_chunk()
+        return report
+
+    def _invite_one(self, business_id: str, customer: Dict[str, Any], index: Optional[InvitationIndex],
+                    limiter: Optional[TokenBucket], max_attempts: int) -> Dict[str, Any]:
+        email = customer.get('email')
+        payload = self._invitation_payload(business_id, email, customer.get('name'),
+                                           customer.get('reference_id'), customer.get('locale', 'en-US'))
+        reference_id = payload['referenceId']
+        outcome = {'email': email, 'reference_id': reference_id, 'status': 'failed', 'result': None, 'error': None}
+        if not email:
+            outcome['error'] = "email is required"
+            return outcome
+        if index is not None and not index.claim(business_id, reference_id, email):
+            outcome['status'] = 'duplicate'
+            return outcome
+        
+        invite_url = f"{self.base_url}/private/business-units/{business_id}/email-invitations"
+        try:
+            for attempt in range(max_attempts):
+                if limiter is not None:
+                    limiter.acquire()
+                else:
+                    self._spend_budget('invite_review')
+                self._ensure_token()
+                response = self.session.post(invite_url, json=payload)
+                if response.status_code == 429 and attempt + 1 < max_attempts:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'), default=2.0 ** attempt)
+                    if limiter is not None:
+                        limiter.defer(retry_after)
+                    else:
+                        self._defer_budget('invite_review', retry_after)
+                    continue
+                break
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError covers a failed token renewal and an exhausted budget
+            outcome['error'] = f"Invitation failed: {e}"
+            if index is not None:
+                index.release(business_id, reference_id)
+            return outcome
+        
+        if response.status_code not in (200, 201, 202):
+            outcome['error'] = f"Invitation failed: {response.status_code} {response.text}"
+            if index is not None:
+                index.release(business_id, reference_id)
+            return outcome
+        
+        # Trustpilot accepted it: record that before anything else can fail,
+        # so the invitation is never sent again
+        outcome['status'] = 'sent'
+        if index is not None:
+            index.mark_sent(business_id, reference_id, response.text)
+        try:
+            outcome['result'] = response.json() if response.content else {}
+        except ValueError as e:
+            outcome['error'] = f"Invitation sent but its response was not JSON: {e}"
+        return outcome
+
+    @staticmethod
+    def _invitation_payload(business_id: str, customer_email: str, customer_name: str,
+                            reference_id: Optional[str] = None, locale: str = 'en-US') -> Dict[str, Any]:
+        return {
+            'recipient': {
+                'email': customer_email,
+                'name': customer_name
+            },
+            'referenceId': reference_id or f"review_{business_id}_{customer_email}",
+            'locale': locale
+        }
\ No newline at end of file
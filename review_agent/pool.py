@@ -0,0 +1,118 @@
+"""
+Shared, logged-in platform instances.
+
+Creating a platform and logging in for every review throws away its HTTP
+connection pool and its login. ``PlatformPool`` keeps one logged-in
+instance per platform class, constructor arguments and credentials, and
+hands the same instance to every caller:
+
+- the first ``get`` for a key creates the instance and logs in; concurrent
+  callers wait for that login instead of starting their own
+- a pooled instance that raises ``AuthenticationError`` logs in again once
+  and retries the call (see ``ReviewPlatform.relogin``); a cached login
+  session is dropped first so the new login is a real one
+- ``close`` (or leaving the ``with`` block) closes every instance
+
+Instances are shared between threads, like the platforms a
+``PlatformDispatcher`` posts to.
+
+    with PlatformPool() as pool:
+        yelp = pool.get(MockPlatform, {"username": "demo", "password": "demo"}, "Yelp")
+"""
+
+import functools
+import threading
+import time
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple, Type, TypeVar
+
+from . import events
+from .platforms.base import ReviewPlatform, platform_label
+from .sessions import credentials_key
+
+P = TypeVar("P", bound=ReviewPlatform)
+
+
+class _Entry:
+    """One pooled instance and the credentials it logs in with."""
+
+    def __init__(self, credentials: Mapping[str, Any]):
+        self.credentials = dict(credentials)
+        self.platform: Optional[ReviewPlatform] = None
+        self.logged_in_at = 0.0
+        self.lock = threading.Lock()
+
+
+class PlatformPool:
+    """Logged-in platform instances keyed by platform and credentials."""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[Hashable, ...], _Entry] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def get(self, platform_class: Type[P], credentials: Mapping[str, Any], *args, **kwargs) -> P:
+        """
+        Return the logged-in instance of ``platform_class(*args, **kwargs)``.
+
+        Args:
+            platform_class: ReviewPlatform subclass
+            credentials: Passed to ``login``
+            *args, **kwargs: Constructor arguments; part of the key
+
+        Returns:
+            The pooled instance, created and logged in on first use
+        """
+        key = (platform_class, args, tuple(sorted(kwargs.items())), credentials_key(credentials))
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("PlatformPool is closed")
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(credentials)
+
+        with entry.lock:
+            if entry.platform is None:
+                platform = platform_class(*args, **kwargs)
+                try:
+                    platform.login(entry.credentials)
+                except BaseException:
+                    platform.close()
+                    raise
+                platform.relogin = functools.partial(self._relogin, entry)
+                entry.platform, entry.logged_in_at = platform, time.monotonic()
+            return entry.platform
+
+    def _relogin(self, entry: _Entry, failed_at: float):
+        """Log in again unless another thread already did after ``failed_at``."""
+        with entry.lock:
+            if entry.logged_in_at > failed_at:
+                return
+            platform = entry.platform
+            label = platform_label(platform)
+            if platform.session_cache is not None:
+                platform.session_cache.invalidate(label, entry.credentials)
+            events.emit("platform.relogin", "🔄 Logging in to {platform} again", platform=label)
+            platform.login(entry.credentials)
+            entry.logged_in_at = time.monotonic()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for entry in self._entries.values() if entry.platform is not None)
+
+    def close(self):
+        """Close every pooled instance; later ``get`` calls fail."""
+        with self._lock:
+            self._closed = True
+            entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            with entry.lock:
+                platform, entry.platform = entry.platform, None
+            if platform is not None:
+                platform.relogin = None
+                platform.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,119 @@
+"""
+Whole-run profiling for the CLI's ``--profile`` option.
+
+``RunProfiler`` runs cProfile on the main thread and on every thread
+started while it is active (the dispatcher's workers, for example), merges
+the results into a single pstats file, and summarizes where the wall time
+went per pipeline stage using the stage metrics from ``review_agent.metrics``.
+"""
+
+import cProfile
+import pstats
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from . import metrics
+
+# Order in which stages are listed in the breakdown
+STAGE_ORDER = ("agent_init", "transcribe", "generate", "search_business", "post_review")
+
+
+def _stage_totals() -> Dict[str, Tuple[float, int]]:
+    """Total seconds and call count per stage, summed over platforms."""
+    totals: Dict[str, Tuple[float, int]] = {}
+    for (stage, _platform), (counts, seconds) in metrics.STAGE_DURATION.snapshot().items():
+        previous_seconds, previous_calls = totals.get(stage, (0.0, 0))
+        totals[stage] = (previous_seconds + seconds, previous_calls + sum(counts))
+    return totals
+
+
+class RunProfiler:
+    """
+    Profile one CLI run.
+
+    Example:
+        profiler = RunProfiler("run.pstats", import_seconds=0.8)
+        profiler.start()
+        ...
+        profiler.stop()
+        print(profiler.format_breakdown())
+    """
+
+    def __init__(self, path: str, import_seconds: float = 0.0):
+        self.path = path
+        self.import_seconds = import_seconds
+        self.wall_seconds = 0.0
+        self.stages: Dict[str, Tuple[float, int]] = {}
+        self._profiler = cProfile.Profile()
+        self._thread_profilers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._baseline: Dict[str, Tuple[float, int]] = {}
+        self._started = 0.0
+        self._metrics_were_enabled = False
+
+    def _start_thread_profiler(self, frame, event, arg):
+        # Runs as the first profile event of each new thread, then hands the
+        # thread over to its own cProfile instance
+        sys.setprofile(None)
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Only one profiler may be active at a time on some Pythons
+            return
+        with self._lock:
+            self._thread_profilers.append(profiler)
+
+    def start(self):
+        self._metrics_were_enabled = metrics.enabled()
+        metrics.enable()
+        self._baseline = _stage_totals()
+        threading.setprofile(self._start_thread_profiler)
+        self._started = time.perf_counter()
+        self._profiler.enable()
+
+    def stop(self):
+        """Stop profiling, write the pstats file and compute the breakdown."""
+        self._profiler.disable()
+        self.wall_seconds = time.perf_counter() - self._started
+        threading.setprofile(None)
+        if not self._metrics_were_enabled:
+            metrics.disable()
+
+        stats = pstats.Stats(self._profiler)
+        with self._lock:
+            thread_profilers = list(self._thread_profilers)
+        for profiler in thread_profilers:
+            try:
+                stats.add(profiler)
+            except TypeError:
+                # A thread that never made a profiled call has no stats
+                pass
+        stats.dump_stats(self.path)
+
+        self.stages = {}
+        for stage, (seconds, calls) in _stage_totals().items():
+            base_seconds, base_calls = self._baseline.get(stage, (0.0, 0))
+            if calls - base_calls:
+                self.stages[stage] = (seconds - base_seconds, calls - base_calls)
+
+    def format_breakdown(self) -> str:
+        """Return a short per-stage timing table."""
+        lines = [f"⏱️  Profile: {self.wall_seconds:.3f}s run, pstats written to {self.path}"]
+        lines.append(f"  {'import':<16} {self.import_seconds:>9.3f}s")
+
+        ordered = [stage for stage in STAGE_ORDER if stage in self.stages]
+        ordered += sorted(stage for stage in self.stages if stage not in STAGE_ORDER)
+        for stage in ordered:
+            seconds, calls = self.stages[stage]
+            lines.append(f"  {stage:<16} {seconds:>9.3f}s  ({calls} call{'s' if calls != 1 else ''})")
+
+        staged = sum(seconds for seconds, _calls in self.stages.values())
+        other = self.wall_seconds - staged
+        if other > 0:
+            lines.append(f"  {'other':<16} {other:>9.3f}s")
+        if staged > self.wall_seconds:
+            lines.append("  (stages ran concurrently, so their sum exceeds the run time)")
+        return "\n".join(lines)
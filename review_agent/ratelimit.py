@@ -0,0 +1,96 @@
+"""
+Client-side rate limiting.
+
+``TokenBucket`` paces calls to at most ``rate`` per second with bursts of
+up to ``burst``; every thread sharing a bucket shares the budget. A server's
+``Retry-After`` answer can push the whole bucket back with ``defer``, so
+the other threads wait too instead of hitting the limit again.
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+def parse_retry_after(value: Optional[str], default: float = 1.0) -> float:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class TokenBucket:
+    """Thread-safe token bucket."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Bucket size (default: one second's worth, at least 1)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0, max_wait: Optional[float] = None) -> float:
+        """
+        Take ``tokens`` (possibly going into debt) and return the wait in seconds.
+
+        If the wait would exceed ``max_wait``, nothing is taken and the wait
+        is still returned.
+        """
+        with self._lock:
+            now = time.monotonic()
+            available = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            remaining = available - tokens
+            wait = max(-remaining / self.rate if remaining < 0 else 0.0, self._blocked_until - now)
+            if max_wait is not None and wait > max_wait:
+                return wait
+            self._tokens, self._updated = remaining, now
+            return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available; returns the seconds waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` only if available right now."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return False
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def delay(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` would be available, without taking them."""
+        with self._lock:
+            now = time.monotonic()
+            available = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            wait = (tokens - available) / self.rate if available < tokens else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def defer(self, seconds: float):
+        """Hold every caller for ``seconds``, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
@@ -0,0 +1,297 @@
+"""
+Canonical business registry.
+
+Business names arrive spelled many ways ("Joe's Pizza", "Joes Pizza",
+"JOE’S PIZZA", "Joe's Pizza, NYC"). ``BusinessRegistry`` maps them to one
+business per platform before any ID is derived or any create call is made:
+
+- ``canonical_name`` folds case, accents, apostrophes and punctuation, so
+  trivially different spellings share a key
+- a trigram index finds variant spellings of a known business (Jaccard
+  similarity of at least ``threshold``, or the caller's stricter one, same
+  location and the same numbers, so "Pizza Hut 13" never becomes
+  "Pizza Hut 12")
+- creation is single-flight: concurrent resolvers of the same business wait
+  for the first one's ``create`` call and share its result
+
+The registry is in memory and shared by every thread of a process; the
+platforms that create IDs use ``BUSINESS_REGISTRY``. It keeps at most
+``max_entries`` businesses, evicting the least recently used, and forgets a
+resolved ID after ``ttl`` seconds so a business deleted or merged on the
+platform is looked up again.
+
+    business_id = BUSINESS_REGISTRY.resolve("Yelp", "Joe's Pizza", "New York",
+                                            create=lambda: create_business(...))
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from . import metrics
+
+RegistryKey = Tuple[str, str, str]
+
+BUSINESS_REGISTRY_LOOKUPS = metrics.REGISTRY.counter(
+    "review_agent_business_registry_total",
+    "Business registry resolutions by namespace and result (exact, fuzzy, joined, created)",
+    ("namespace", "result"),
+)
+
+_APOSTROPHES = re.compile(r"['’ʼ`´]")
+_NON_WORD = re.compile(r"[\W_]+")
+_DIGIT = re.compile(r"\d")
+
+
+def canonical_name(text: Optional[str]) -> str:
+    """
+    Matching form of a business name or location.
+
+    NFKD-decomposed with accents dropped, case-folded, "&" read as "and",
+    apostrophes removed and other punctuation treated as spaces.
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    text = _APOSTROPHES.sub("", text.replace("&", " and "))
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def business_slug(business_name: str, location: Optional[str] = None) -> str:
+    """Stable ID derived from a business's canonical name and location."""
+    slug = "_".join(canonical_name(business_name).split())
+    if location:
+        slug += "_" + "_".join(canonical_name(location).split())
+    return slug
+
+
+def numeric_tokens(text: str) -> Tuple[str, ...]:
+    """Words of a canonical name that contain a digit ("12", "3rd"), sorted."""
+    return tuple(sorted(word for word in text.split() if _DIGIT.search(word)))
+
+
+def numbers_match(business_name: Optional[str], other_name: Optional[str]) -> bool:
+    """True if two names carry the same numbers, e.g. store or unit numbers."""
+    return numeric_tokens(canonical_name(business_name)) == numeric_tokens(canonical_name(other_name))
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of a canonical name, padded at word edges."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class BusinessRegistry:
+    """
+    Business IDs per namespace (usually one platform), resolved once.
+
+    Example:
+        registry = BusinessRegistry(threshold=0.8)
+        registry.resolve("Mock", "Joes Pizza", None, create=lambda: "joes_pizza")
+        registry.resolve("Mock", "Joe's Pizza", None, create=...)  # "joes_pizza", no call
+    """
+
+    def __init__(self, threshold: float = 0.7, max_entries: int = 10_000, ttl: float = 86400.0):
+        """
+        Args:
+            threshold: Minimum trigram similarity (0-1) for a variant spelling
+                to resolve to a known business
+            max_entries: Businesses kept; the least recently used resolved
+                ones are evicted beyond it
+            ttl: Seconds a resolved business ID stays known
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> future of the business ID (pending while it is being
+        # created), least recently used first
+        self._entries: "OrderedDict[RegistryKey, Future]" = OrderedDict()
+        # key -> time its resolved ID expires
+        self._expires: Dict[RegistryKey, float] = {}
+        # (namespace, trigram) -> keys, and key -> trigram count
+        self._postings: Dict[Tuple[str, str], Set[RegistryKey]] = defaultdict(set)
+        self._gram_counts: Dict[RegistryKey, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(namespace: str, business_name: str, location: Optional[str]) -> RegistryKey:
+        return (namespace, canonical_name(business_name), canonical_name(location))
+
+    def _closest(self, key: RegistryKey, threshold: Optional[float] = None) -> Optional[RegistryKey]:
+        """Best indexed variant of ``key`` above the threshold; needs the lock."""
+        namespace, name, location = key
+        numbers = numeric_tokens(name)
+        grams = trigrams(name)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings.get((namespace, gram), ()))
+
+        best, best_similarity = None, max(self.threshold, threshold or 0.0)
+        for candidate, count in shared.items():
+            if candidate[2] != location or numeric_tokens(candidate[1]) != numbers:
+                continue
+            if self._expired(candidate):
+                continue
+            similarity = count / (len(grams) + self._gram_counts[candidate] - count)
+            if similarity >= best_similarity:
+                best, best_similarity = candidate, similarity
+        return best
+
+    def _index(self, key: RegistryKey):
+        grams = trigrams(key[1])
+        for gram in grams:
+            self._postings[(key[0], gram)].add(key)
+        self._gram_counts[key] = len(grams)
+
+    def _unindex(self, key: RegistryKey):
+        for gram in trigrams(key[1]):
+            self._postings[(key[0], gram)].discard(key)
+        del self._gram_counts[key]
+
+    def _remove(self, key: RegistryKey):
+        del self._entries[key]
+        self._expires.pop(key, None)
+        self._unindex(key)
+
+    def _expired(self, key: RegistryKey) -> bool:
+        return self._expires.get(key, float("inf")) <= time.monotonic()
+
+    def _match(self, key: RegistryKey, threshold: Optional[float], fuzzy: bool) -> Optional[RegistryKey]:
+        """Live entry for ``key`` or a variant of it; needs the lock."""
+        if key in self._entries and self._expired(key):
+            self._remove(key)
+        if key in self._entries:
+            match = key
+        elif fuzzy:
+            match = self._closest(key, threshold)
+        else:
+            match = None
+        if match is not None:
+            self._entries.move_to_end(match)
+        return match
+
+    def _evict(self):
+        """Drop least recently used resolved entries beyond ``max_entries``; needs the lock."""
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+        # Pending creations have waiters and are never evicted
+        evicted = []
+        for key, future in self._entries.items():
+            if len(evicted) == excess:
+                break
+            if future.done():
+                evicted.append(key)
+        for key in evicted:
+            self._remove(key)
+
+    def lookup(self, namespace: str, business_name: str, location: Optional[str],
+               threshold: Optional[float] = None, fuzzy: bool = True) -> Optional[str]:
+        """Return the ID of a known business (or variant), waiting for a pending creation."""
+        key = self.key(namespace, business_name, location)
+        with self._lock:
+            match = self._match(key, threshold, fuzzy)
+            future = self._entries.get(match) if match is not None else None
+        if future is None:
+            return None
+        return future.result()
+
+    def resolve(self, namespace: str, business_name: str, location: Optional[str],
+                create: Callable[[], str], threshold: Optional[float] = None, fuzzy: bool = True,
+                ttl: Optional[float] = None) -> str:
+        """
+        Return the business ID, calling ``create`` only for a new business.
+
+        Args:
+            namespace: Registry partition, e.g. the platform label
+            business_name: Name as given
+            location: Optional location; variants only match the same location
+            create: Looks up or creates the business and returns its ID
+            threshold: The platform's own minimum similarity; the registry's
+                is used if it is stricter
+            fuzzy: Resolve variant spellings; without it only names with the
+                same canonical form share an ID
+            ttl: Seconds a newly created ID stays known (default: the
+                registry's ``ttl``), e.g. the platform's business cache TTL
+
+        Returns:
+            str: Business ID
+
+        If ``create`` raises, the business stays unknown and the error is
+        raised to every caller that was waiting for it.
+        """
+        key = self.key(namespace, business_name, location)
+        with self._lock:
+            match = self._match(key, threshold, fuzzy)
+            if match is not None:
+                future = self._entries[match]
+                result = "exact" if match == key else "fuzzy"
+                if not future.done():
+                    result = "joined"
+                owner = False
+            else:
+                future = self._entries[key] = Future()
+                self._index(key)
+                self._evict()
+                result = "created"
+                owner = True
+        if metrics.enabled():
+            BUSINESS_REGISTRY_LOOKUPS.inc(namespace, result)
+        if not owner:
+            return future.result()
+
+        try:
+            business_id = create()
+        except BaseException as e:
+            with self._lock:
+                self._remove(key)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            if self._entries.get(key) is future:
+                self._expires[key] = time.monotonic() + (self.ttl if ttl is None else ttl)
+        future.set_result(business_id)
+        return business_id
+
+    def forget(self, namespace: str, business_name: str, location: Optional[str]):
+        """Drop a business, e.g. after the platform deleted it."""
+        key = self.key(namespace, business_name, location)
+        with self._lock:
+            future = self._entries.get(key)
+            if future is not None and future.done():
+                self._remove(key)
+
+    def forget_id(self, namespace: str, business_id: str) -> List[RegistryKey]:
+        """
+        Drop every spelling resolved to ``business_id``, e.g. after the
+        platform answered that it does not exist.
+
+        Returns:
+            list: The forgotten keys
+        """
+        with self._lock:
+            keys = [key for key, future in self._entries.items()
+                    if key[0] == namespace and future.done() and not future.exception()
+                    and future.result() == business_id]
+            for key in keys:
+                self._remove(key)
+        return keys
+
+    def clear(self):
+        with self._lock:
+            resolved = [key for key, future in self._entries.items() if future.done()]
+            for key in resolved:
+                self._remove(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Shared by every platform instance in the process
+BUSINESS_REGISTRY = BusinessRegistry()
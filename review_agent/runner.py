@@ -0,0 +1,306 @@
+"""
+Multi-process bulk runner.
+
+``ShardedRunner`` spreads a bulk review run over a process pool. Input is
+sharded by business so every review for a given business is handled by the
+same worker, each worker builds its own platform instances (and therefore
+its own HTTP sessions) once, and the results are merged back in input order.
+
+Settings installed process-wide in the parent (business and session caches,
+rate budgets, the HTTP cache, the outbox, mock faults, metrics and tracing)
+are captured as ``WorkerSettings`` and rebuilt in workers that did not
+inherit them, so spawn and forkserver pools behave like fork.
+"""
+
+import multiprocessing
+import multiprocessing.util
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from . import metrics, tracing
+from .agent import ReviewAgent, ReviewInput, generate_fallback_review
+from .budgets import RateBudgets
+from .cache import BusinessCache
+from .dispatcher import PlatformDispatcher
+from .faults import FaultProfile
+from .outbox import Outbox
+from .pipeline import generate_and_post
+from .platforms.base import ReviewPlatform
+from .platforms.local_directory import LocalDirectoryPlatform
+from .platforms.mock import MockPlatform
+from .sessions import SessionCache
+from .transport import HTTPCache, HTTPTransport
+
+PlatformFactory = Callable[[], List[ReviewPlatform]]
+
+
+def build_platforms(mock_names: Sequence[str] = ("Mock",),
+                    local_directory_url: Optional[str] = None) -> List[ReviewPlatform]:
+    """
+    Create and log in the platforms used by a bulk run.
+
+    This is a module-level function so that ``functools.partial`` wrappers
+    around it can be pickled and sent to worker processes.
+    """
+    platforms: List[ReviewPlatform] = []
+    for name in mock_names:
+        platform = MockPlatform(name)
+        platform.login({"username": "batch", "password": "batch"})
+        platforms.append(platform)
+
+    if local_directory_url:
+        platform = LocalDirectoryPlatform(local_directory_url)
+        platform.login({"api_key": os.getenv("LOCAL_DIRECTORY_API_KEY", "batch_key")})
+        platforms.append(platform)
+
+    return platforms
+
+
+def shard_key(item: Dict[str, Any]) -> str:
+    """
+    Return the key used to assign an input item to a shard.
+
+    Malformed items get an empty key; the worker reports them as failed.
+    """
+    name = item.get('business_name') if isinstance(item, dict) else None
+    if not isinstance(name, str):
+        return ""
+    return " ".join(name.casefold().split())
+
+
+def shard_items(items: Sequence[Dict[str, Any]], shards: int) -> List[List[Tuple[int, Dict[str, Any]]]]:
+    """
+    Split items into shards by business, keeping each item's input index.
+
+    A stable hash (CRC32) is used rather than ``hash()`` so the assignment
+    does not change between runs or processes.
+    """
+    buckets: List[List[Tuple[int, Dict[str, Any]]]] = [[] for _ in range(shards)]
+    for index, item in enumerate(items):
+        bucket = zlib.crc32(shard_key(item).encode("utf-8")) % shards
+        buckets[bucket].append((index, item))
+    return [bucket for bucket in buckets if bucket]
+
+
+class WorkerSettings(NamedTuple):
+    """
+    The parent's process-wide settings, as constructor arguments.
+
+    Forked workers inherit them with the parent's memory; ``install`` builds
+    them in a worker that started from a fresh interpreter. Caches without a
+    file start empty there, and budgets without one are per worker.
+    """
+
+    business_cache: Optional[Dict[str, Any]] = None
+    session_cache: Optional[Dict[str, Any]] = None
+    rate_budgets: Optional[Dict[str, Any]] = None
+    http_cache: Optional[Dict[str, Any]] = None
+    outbox: Optional[str] = None
+    mock_faults: Optional[FaultProfile] = None
+    metrics: bool = False
+    tracing: bool = False
+
+    @classmethod
+    def capture(cls) -> "WorkerSettings":
+        """Read the settings installed in this process."""
+        business_cache = ReviewPlatform.business_cache
+        session_cache = ReviewPlatform.session_cache
+        budgets = ReviewPlatform.rate_budgets
+        http_cache = HTTPTransport.cache
+        outbox = LocalDirectoryPlatform.outbox
+        return cls(
+            business_cache=None if business_cache is None else dict(
+                path=business_cache.path, ttl=business_cache.ttl,
+                negative_ttl=business_cache.negative_ttl, max_entries=business_cache.max_entries),
+            session_cache=None if session_cache is None else dict(
+                path=session_cache.path, refresh_margin=session_cache.refresh_margin,
+                lease_timeout=session_cache.lease_timeout),
+            rate_budgets=None if budgets is None else dict(
+                budgets=budgets.budgets, path=budgets.path, max_wait=budgets.max_wait),
+            http_cache=None if http_cache is None else dict(
+                max_bytes=http_cache.max_bytes, max_entry_bytes=http_cache.max_entry_bytes),
+            outbox=None if outbox is None else outbox.path,
+            mock_faults=MockPlatform.faults,
+            metrics=metrics.enabled(),
+            tracing=tracing.enabled(),
+        )
+
+    def install(self):
+        """Build every setting this process does not have yet."""
+        if self.business_cache is not None and ReviewPlatform.business_cache is None:
+            ReviewPlatform.business_cache = BusinessCache(**self.business_cache)
+        if self.session_cache is not None and ReviewPlatform.session_cache is None:
+            ReviewPlatform.session_cache = SessionCache(**self.session_cache)
+        if self.rate_budgets is not None and ReviewPlatform.rate_budgets is None:
+            ReviewPlatform.rate_budgets = RateBudgets(**self.rate_budgets)
+        if self.http_cache is not None and HTTPTransport.cache is None:
+            HTTPTransport.cache = HTTPCache(**self.http_cache)
+        if self.outbox is not None and LocalDirectoryPlatform.outbox is None:
+            LocalDirectoryPlatform.outbox = Outbox(self.outbox)
+        if self.mock_faults is not None and MockPlatform.faults is None:
+            MockPlatform.faults = self.mock_faults
+        if self.metrics:
+            metrics.enable()
+        if self.tracing:
+            tracing.enable()
+
+
+class _Worker:
+    """Per-process state: platforms, dispatcher and generator."""
+
+    def __init__(self, platform_factory: PlatformFactory, api_key: Optional[str],
+                 timeout: float):
+        self.platforms = platform_factory()
+        self.dispatcher = PlatformDispatcher(self.platforms, timeout=timeout)
+        self.agent = ReviewAgent(api_key=api_key) if api_key else None
+
+    def generate(self, review_input: ReviewInput) -> str:
+        if self.agent is None:
+            return generate_fallback_review(review_input)
+        return self.agent.generate_review(review_input)
+
+    def process(self, item: Dict[str, Any], index: int) -> Dict[str, Any]:
+        if not isinstance(item, dict):
+            return {'business_name': None, 'ok': False, 'error': f"expected a JSON object, got {type(item).__name__}"}
+        with tracing.correlation(str(item.get('correlation_id') or f"item-{index}")):
+            return self._process(item)
+
+    def _process(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        location = item.get('location')
+        try:
+            review_input = ReviewInput(**{
+                key: value for key, value in item.items() if key not in ('location', 'correlation_id')
+            })
+            review, report = generate_and_post(
+                partial(self.generate, review_input),
+                self.dispatcher,
+                review_input.business_name,
+                location,
+                review_input.rating
+            )
+        except Exception as e:
+            return {
+                'business_name': item.get('business_name'),
+                'ok': False,
+                'error': repr(e),
+            }
+
+        return {
+            'business_name': review_input.business_name,
+            'ok': report.ok,
+            'review': review,
+            'report': report.to_dict(),
+        }
+
+    def run_shard(self, shard: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+        return [(index, self.process(item, index)) for index, item in shard]
+
+    def close(self):
+        self.dispatcher.close()
+        for platform in self.platforms:
+            platform.close()
+
+
+_worker: Optional[_Worker] = None
+
+
+def _init_worker(platform_factory: PlatformFactory, api_key: Optional[str], timeout: float,
+                 settings: WorkerSettings):
+    global _worker
+    settings.install()
+    # Forked workers inherit the parent's recorded metrics; start from zero
+    # so drained shard metrics are not counted twice
+    metrics.REGISTRY.reset()
+    tracing.reset()
+    _worker = _Worker(platform_factory, api_key, timeout)
+    # Pool workers leave through multiprocessing's exit handling, which runs
+    # finalizers but not atexit hooks
+    multiprocessing.util.Finalize(_worker, _worker.close, exitpriority=10)
+
+
+def _run_shard(shard: List[Tuple[int, Dict[str, Any]]]) -> Tuple[List[Tuple[int, Dict[str, Any]]], Dict[str, Any]]:
+    results = _worker.run_shard(shard)
+    # Ship this shard's metrics and trace events back so the parent sees the
+    # whole run
+    telemetry = {
+        'metrics': metrics.REGISTRY.drain() if metrics.enabled() else None,
+        'trace': tracing.drain() if tracing.enabled() else None,
+    }
+    return results, telemetry
+
+
+class ShardedRunner:
+    """
+    Run a bulk review job across a pool of worker processes.
+
+    Example:
+        runner = ShardedRunner(partial(build_platforms, ["Google Reviews"]), workers=8)
+        results = runner.run(items)  # same order as items
+    """
+
+    def __init__(self, platform_factory: PlatformFactory = build_platforms,
+                 workers: Optional[int] = None, api_key: Optional[str] = None,
+                 timeout: float = 30.0, shards_per_worker: int = 4,
+                 start_method: Optional[str] = None):
+        """
+        Args:
+            platform_factory: Picklable callable returning logged-in platforms;
+                called once in every worker process
+            workers: Number of worker processes, defaults to the CPU count
+            api_key: OpenAI API key; the fallback generator is used without one
+            timeout: Per-platform post timeout in seconds
+            shards_per_worker: Shards created per worker, so that a worker that
+                drew a few busy businesses doesn't hold up the whole run
+            start_method: ``fork``, ``spawn`` or ``forkserver`` (default:
+                the platform's)
+        """
+        self.platform_factory = platform_factory
+        self.workers = workers or os.cpu_count() or 1
+        self.api_key = api_key
+        self.timeout = timeout
+        self.shards_per_worker = shards_per_worker
+        self.start_method = start_method
+
+    def run(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Generate and post a review for every item.
+
+        Args:
+            items: Dicts with ``ReviewInput`` fields plus an optional ``location``
+
+        Returns:
+            One result dict per item, in input order
+        """
+        items = list(items)
+        shards = shard_items(items, self.workers * self.shards_per_worker)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+
+        if self.workers == 1:
+            worker = _Worker(self.platform_factory, self.api_key, self.timeout)
+            try:
+                outputs = [worker.run_shard(shard) for shard in shards]
+            finally:
+                worker.close()
+        else:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker,
+                initargs=(self.platform_factory, self.api_key, self.timeout, WorkerSettings.capture())
+            ) as executor:
+                outputs = []
+                for shard_results, telemetry in executor.map(_run_shard, shards):
+                    outputs.append(shard_results)
+                    if telemetry['metrics']:
+                        metrics.REGISTRY.merge(telemetry['metrics'])
+                    if telemetry['trace']:
+                        tracing.merge(telemetry['trace'])
+
+        for output in outputs:
+            for index, result in output:
+                results[index] = result
+
+        return results
@@ -0,0 +1,154 @@
+"""
+Cross-process cache of platform login sessions.
+
+``TrustpilotPlatform.login`` fetches an OAuth token and
+``FacebookPlatform.login`` validates its token with a ``/me`` call; both
+are a round trip before any real work, repeated by every run and every
+batch worker. ``SessionCache`` keeps the result in SQLite, keyed by
+platform and a hash of the credentials, together with its expiry:
+
+- ``login`` skips the network while a cached session is valid
+- sessions are treated as stale ``refresh_margin`` seconds before they
+  expire, so a token is never used right at its deadline
+- refreshes are serialized across processes: the first process to find a
+  stale session takes a lease on it and refreshes it while the others
+  poll for the result; no database lock is held during the round trip,
+  and a lease left by a crashed process expires after ``lease_timeout``
+
+The file holds live access tokens and is created readable by its owner
+only.
+
+    ReviewPlatform.session_cache = SessionCache("sessions.db")
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from . import events
+from .storage import SQLiteStore
+
+# fetch() result: session data and its expiry as a Unix timestamp
+Fetched = Tuple[Dict[str, Any], float]
+
+
+def credentials_key(credentials: Mapping[str, Any]) -> str:
+    """Stable hash identifying an account without storing its secrets."""
+    canonical = json.dumps(sorted((str(key), str(value)) for key, value in credentials.items()))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SessionCache(SQLiteStore):
+    """Login sessions shared by every process using the same file."""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS sessions ("
+        " platform TEXT NOT NULL, account TEXT NOT NULL, data TEXT NOT NULL,"
+        " expires_at REAL NOT NULL, updated_at REAL NOT NULL,"
+        " PRIMARY KEY (platform, account))",
+        "CREATE TABLE IF NOT EXISTS session_leases ("
+        " platform TEXT NOT NULL, account TEXT NOT NULL, holder TEXT NOT NULL,"
+        " expires_at REAL NOT NULL, PRIMARY KEY (platform, account))",
+    )
+
+    # Seconds between checks while another caller refreshes a session
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, path: str = "review_agent_sessions.db", refresh_margin: float = 300.0,
+                 lease_timeout: float = 60.0):
+        """
+        Args:
+            path: SQLite file
+            refresh_margin: Seconds before expiry at which a session is refreshed
+            lease_timeout: Seconds after which a refresh left by a crashed
+                process can be taken over
+        """
+        if path != ":memory:" and not os.path.exists(path):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+        super().__init__(path)
+        self.refresh_margin = refresh_margin
+        self.lease_timeout = lease_timeout
+
+    def _fresh(self, connection, platform: str, account: str) -> Optional[Dict[str, Any]]:
+        row = connection.execute(
+            "SELECT data, expires_at FROM sessions WHERE platform = ? AND account = ?",
+            (platform, account)).fetchone()
+        if row is None or row[1] - self.refresh_margin <= time.time():
+            return None
+        return json.loads(row[0])
+
+    def get(self, platform: str, credentials: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the cached session if it is valid for longer than the margin."""
+        with self._lock:
+            return self._fresh(self._connect(), platform, credentials_key(credentials))
+
+    def get_or_refresh(self, platform: str, credentials: Mapping[str, Any],
+                       fetch: Callable[[], Fetched]) -> Dict[str, Any]:
+        """
+        Return a valid session, calling ``fetch`` only if none is cached.
+
+        The caller that finds the session stale leases it, commits, and runs
+        ``fetch`` outside any transaction; concurrent callers, in this or
+        other processes, poll until the new session is stored. If ``fetch``
+        raises, nothing is cached and the lease is dropped so the next
+        caller tries again.
+        """
+        account = credentials_key(credentials)
+        holder = f"{os.getpid()}:{threading.get_ident()}:{uuid.uuid4().hex}"
+        while True:
+            session = self.get(platform, credentials)
+            if session is None:
+                with self.transaction() as connection:
+                    # Another caller may have refreshed it since we looked
+                    session = self._fresh(connection, platform, account)
+                    leased = session is None and self._lease(connection, platform, account, holder)
+            if session is not None:
+                events.emit("session.cached", "🔑 Reusing cached {platform} session", platform=platform)
+                return session
+            if leased:
+                break
+            time.sleep(self.POLL_INTERVAL)
+
+        try:
+            session, expires_at = fetch()
+        except BaseException:
+            self._release(platform, account, holder)
+            raise
+        now = time.time()
+        with self.transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+                (platform, account, json.dumps(session), expires_at, now))
+            connection.execute(
+                "DELETE FROM session_leases WHERE platform = ? AND account = ? AND holder = ?",
+                (platform, account, holder))
+        events.emit("session.refreshed", "🔑 New {platform} session cached for {seconds}s",
+                    platform=platform, seconds=int(expires_at - now))
+        return session
+
+    def _lease(self, connection, platform: str, account: str, holder: str) -> bool:
+        """Take the right to refresh a session; False while someone else holds it."""
+        now = time.time()
+        inserted = connection.execute(
+            "INSERT OR IGNORE INTO session_leases VALUES (?, ?, ?, ?)",
+            (platform, account, holder, now + self.lease_timeout)).rowcount
+        if inserted:
+            return True
+        return connection.execute(
+            "UPDATE session_leases SET holder = ?, expires_at = ?"
+            " WHERE platform = ? AND account = ? AND expires_at < ?",
+            (holder, now + self.lease_timeout, platform, account, now)).rowcount == 1
+
+    def _release(self, platform: str, account: str, holder: str):
+        self.execute("DELETE FROM session_leases WHERE platform = ? AND account = ? AND holder = ?",
+                     (platform, account, holder))
+
+    def invalidate(self, platform: str, credentials: Mapping[str, Any]):
+        """Forget a session, e.g. after the platform rejected its token."""
+        self.execute("DELETE FROM sessions WHERE platform = ? AND account = ?",
+                     (platform, credentials_key(credentials)))
@@ -0,0 +1,79 @@
+"""
+Small SQLite helper shared by the on-disk caches and indexes.
+
+``SQLiteStore`` opens one connection per process (reconnecting after a
+fork, so batch workers never share a handle with their parent), serializes
+access from threads with a lock, and enables WAL so several processes can
+read and write the same file. Subclasses set ``SCHEMA``.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterable, List, Optional, Sequence
+
+
+def connect(path: str, timeout: float = 30.0) -> sqlite3.Connection:
+    """Open ``path`` for concurrent use by several threads and processes."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+    if path != ":memory:":
+        connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class SQLiteStore:
+    """Base class for a table-backed store in one SQLite file."""
+
+    # Statements run once per connection; use IF NOT EXISTS
+    SCHEMA: Sequence[str] = ()
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None or self._pid != os.getpid():
+            connection = connect(self.path)
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Run a statement and return the number of rows changed."""
+        with self._lock:
+            return self._connect().execute(sql, params).rowcount
+
+    def executemany(self, sql: str, rows: Iterable[Sequence[Any]]):
+        """Run a statement for every row in one transaction."""
+        with self.transaction() as connection:
+            connection.executemany(sql, rows)
+
+    @contextmanager
+    def transaction(self):
+        """Hold the lock and a write transaction; yields the connection."""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
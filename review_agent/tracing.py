@@ -0,0 +1,215 @@
+"""
+Pipeline tracing in the Chrome trace-event format.
+
+Each stage of a submission (transcribe, generate, search_business,
+post_review) is recorded as a span, and decisions such as fallbacks and
+cache hits as instant events. Every event carries the submission's
+correlation ID, so one review can be followed across dispatcher threads
+and batch worker processes. Load the exported JSON in chrome://tracing or
+https://ui.perfetto.dev to see where workers sit idle and where stages
+serialize.
+
+Tracing is disabled by default and costs one flag check per span.
+
+Example:
+    from review_agent import tracing
+
+    tracing.enable()
+    with tracing.correlation("order-1234"):
+        ...
+    tracing.export("trace.json")
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+_correlation_id: contextvars.ContextVar = contextvars.ContextVar("review_agent_correlation_id", default=None)
+
+# perf_counter is monotonic but has an arbitrary origin; anchor it to the
+# wall clock so events from different processes line up
+_CLOCK_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+_enabled = False
+_events: List[Dict[str, Any]] = []
+_thread_names: Dict[tuple, str] = {}
+_lock = threading.Lock()
+
+
+def _now_us() -> float:
+    return (time.perf_counter_ns() + _CLOCK_OFFSET_NS) / 1000.0
+
+
+def enable():
+    """Start recording trace events."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop recording trace events (recorded events are kept)."""
+    global _enabled
+    _enabled = False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def new_correlation_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def current_correlation_id() -> Optional[str]:
+    return _correlation_id.get()
+
+
+class correlation:
+    """
+    Context manager that sets the correlation ID for the enclosed code.
+
+    Without an explicit ID a new one is generated, unless one is already set.
+    """
+
+    def __init__(self, correlation_id: Optional[str] = None):
+        self.correlation_id = correlation_id
+        self._token = None
+
+    def __enter__(self) -> str:
+        if self.correlation_id is None:
+            self.correlation_id = _correlation_id.get() or new_correlation_id()
+        self._token = _correlation_id.set(self.correlation_id)
+        return self.correlation_id
+
+    def __exit__(self, exc_type, exc, tb):
+        _correlation_id.reset(self._token)
+        return False
+
+
+def _record(event: Dict[str, Any]):
+    pid = os.getpid()
+    thread = threading.current_thread()
+    event["pid"] = pid
+    event["tid"] = thread.ident
+    correlation_id = _correlation_id.get()
+    if correlation_id is not None:
+        event["args"]["correlation_id"] = correlation_id
+    with _lock:
+        _events.append(event)
+        _thread_names[(pid, thread.ident)] = thread.name
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A timed span; extra arguments can be attached with ``set``."""
+
+    __slots__ = ('name', 'category', 'args', '_started')
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def __enter__(self):
+        self._started = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+        _record({
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": self._started,
+            "dur": _now_us() - self._started,
+            "args": self.args,
+        })
+        return False
+
+
+def span(name: str, category: str = "pipeline", **args: Any):
+    """Context manager recording a complete ("X") event, or a no-op when disabled."""
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, category, args)
+
+
+def instant(name: str, category: str = "decision", **args: Any):
+    """Record an instant ("i") event, e.g. a fallback or cache decision."""
+    if not _enabled:
+        return
+    _record({"name": name, "cat": category, "ph": "i", "s": "t", "ts": _now_us(), "args": args})
+
+
+def drain() -> Dict[str, Any]:
+    """Return and clear the recorded events, for shipping from worker processes."""
+    with _lock:
+        events = list(_events)
+        names = dict(_thread_names)
+        _events.clear()
+        _thread_names.clear()
+    return {"events": events, "thread_names": names}
+
+
+def merge(drained: Dict[str, Any]):
+    """Add events drained from another process."""
+    with _lock:
+        _events.extend(drained["events"])
+        _thread_names.update(drained["thread_names"])
+
+
+def reset():
+    with _lock:
+        _events.clear()
+        _thread_names.clear()
+
+
+def to_chrome_trace() -> Dict[str, Any]:
+    """Return the recorded events as a Chrome trace-event JSON object."""
+    with _lock:
+        events = list(_events)
+        names = dict(_thread_names)
+
+    metadata = []
+    main_pid = os.getpid()
+    for pid in sorted({event["pid"] for event in events} | {main_pid}):
+        metadata.append({
+            "name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+            "args": {"name": "review-agent" if pid == main_pid else f"review-agent worker {pid}"},
+        })
+    for (pid, tid), name in names.items():
+        metadata.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+
+    return {
+        "traceEvents": metadata + sorted(events, key=lambda event: event["ts"]),
+        "displayTimeUnit": "ms",
+    }
+
+
+def export(path: str):
+    """Write the recorded events to ``path`` in Chrome trace-event JSON."""
+    with open(path, "w") as f:
+        json.dump(to_chrome_trace(), f, default=str)
@@ -0,0 +1,396 @@
+"""
+Shared HTTP transport for the REST platforms.
+
+``HTTPTransport`` is a ``requests.Session`` with the defaults the platform
+integrations need when many reviews are posted concurrently:
+
+- connect and read timeouts on every request, so a hung socket fails the
+  call instead of stalling a dispatcher worker forever
+- connection pools sized for the dispatcher's worker threads
+- retries with exponential backoff: connection failures are retried for
+  every method (the request never reached the server), read errors and
+  502/503/504 responses only for idempotent methods, so a POST is never
+  sent twice
+- optional gzip compression of large request bodies
+- optional conditional GET caching (``HTTPCache``): responses with an
+  ``ETag`` or ``Last-Modified`` are kept in a size-bounded LRU store and
+  revalidated with ``If-None-Match``/``If-Modified-Since``, so an unchanged
+  resource costs an empty 304 instead of its full payload
+- per-host request, latency, retry, connection and cache metrics in
+  ``review_agent.metrics`` (recorded only while metrics are enabled)
+
+Example:
+    from review_agent.transport import HTTPTransport
+
+    session = HTTPTransport(timeout=(3.05, 10), compress_min_bytes=4096)
+    platform = LocalDirectoryPlatform("http://localhost:8000", transport=session)
+
+    HTTPTransport.cache = HTTPCache(max_bytes=64 * 2**20)  # every transport
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+
+from . import metrics
+
+# (connect, read) seconds; a connect timeout slightly above a multiple of 3s
+# lets the kernel's SYN retransmit finish before giving up
+DEFAULT_TIMEOUT: Tuple[float, float] = (3.05, 30.0)
+
+# Methods safe to resend after the server may already have processed them
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+RETRY_STATUSES = (502, 503, 504)
+
+HTTP_REQUESTS = metrics.REGISTRY.counter(
+    "review_agent_http_requests_total",
+    "HTTP requests sent by the platform transport, by host, method and status",
+    ("host", "method", "status"),
+)
+HTTP_DURATION = metrics.REGISTRY.histogram(
+    "review_agent_http_request_duration_seconds",
+    "HTTP request latency including retries, by host",
+    ("host",),
+)
+HTTP_RETRIES = metrics.REGISTRY.counter(
+    "review_agent_http_retries_total",
+    "HTTP retries performed by the transport, by host",
+    ("host",),
+)
+HTTP_CONNECTIONS = metrics.REGISTRY.gauge(
+    "review_agent_http_connections_opened",
+    "Connections opened so far per host pool; compare with requests to see connection reuse",
+    ("host",),
+)
+HTTP_BYTES_COMPRESSED = metrics.REGISTRY.counter(
+    "review_agent_http_request_bytes_saved_total",
+    "Request body bytes saved by gzip compression, by host",
+    ("host",),
+)
+HTTP_CACHE = metrics.REGISTRY.counter(
+    "review_agent_http_cache_total",
+    "GETs sent through the HTTP cache by host and result (hit: revalidated with a 304, miss: full response)",
+    ("host", "result"),
+)
+HTTP_CACHE_BYTES_SAVED = metrics.REGISTRY.counter(
+    "review_agent_http_cache_bytes_saved_total",
+    "Response body bytes served from the HTTP cache instead of downloaded, by host",
+    ("host",),
+)
+
+# Response headers refreshed from a 304 (RFC 9111 4.3.4); the rest are kept
+_REVALIDATION_HEADERS = ("Cache-Control", "Date", "ETag", "Expires", "Last-Modified", "Vary")
+
+
+def build_retry(total: int = 3, backoff_factor: float = 0.3,
+                status_forcelist: Iterable[int] = RETRY_STATUSES) -> Retry:
+    """
+    Return the transport's retry policy.
+
+    Args:
+        total: Maximum retries of any kind
+        backoff_factor: Sleep ``backoff_factor * 2 ** (retry - 1)`` seconds
+            between attempts
+        status_forcelist: Response statuses retried for idempotent methods
+    """
+    options = dict(
+        total=total,
+        connect=total,
+        read=total,
+        status=total,
+        backoff_factor=backoff_factor,
+        status_forcelist=tuple(status_forcelist),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(allowed_methods=IDEMPOTENT_METHODS, **options)
+    except TypeError:
+        # urllib3 < 1.26
+        return Retry(method_whitelist=IDEMPOTENT_METHODS, **options)
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """``HTTPAdapter`` that compresses large bodies and records per-host metrics."""
+
+    def __init__(self, compress_min_bytes: Optional[int] = None, **kwargs):
+        self.compress_min_bytes = compress_min_bytes
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).netloc
+        self._maybe_compress(request, host)
+        if not metrics.enabled():
+            return super().send(request, **kwargs)
+
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = super().send(request, **kwargs)
+            status = str(response.status_code)
+            retries = getattr(response.raw, "retries", None)
+            if retries is not None and retries.history:
+                HTTP_RETRIES.inc(host, amount=len(retries.history))
+            pool = getattr(response.raw, "_pool", None)
+            if pool is not None:
+                HTTP_CONNECTIONS.set(host, value=pool.num_connections)
+            return response
+        finally:
+            HTTP_DURATION.observe(host, value=time.perf_counter() - started)
+            HTTP_REQUESTS.inc(host, request.method, status)
+
+    def _maybe_compress(self, request, host: str):
+        body = request.body
+        if (self.compress_min_bytes is None or body is None or hasattr(body, "read")
+                or "Content-Encoding" in request.headers):
+            return
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if len(body) < self.compress_min_bytes:
+            return
+        compressed = gzip.compress(body, compresslevel=5)
+        request.body = compressed
+        request.headers["Content-Encoding"] = "gzip"
+        request.headers["Content-Length"] = str(len(compressed))
+        if metrics.enabled():
+            HTTP_BYTES_COMPRESSED.inc(host, amount=len(body) - len(compressed))
+
+
+class _CachedResponse(NamedTuple):
+    status: int
+    reason: str
+    headers: Dict[str, str]
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    parsed: Dict[str, Any]  # the decoded JSON body, filled on first json()
+
+
+class HTTPCache:
+    """
+    Size-bounded LRU store of GET responses for conditional revalidation.
+
+    Responses are keyed by URL and ``Authorization`` header, so accounts never
+    see each other's data. Only 200 responses with an ``ETag`` or
+    ``Last-Modified`` header and without ``Cache-Control: no-store`` are
+    kept. Every lookup revalidates with the server; nothing is served
+    without asking. The body is decoded at most once per entry: every hit's
+    ``json()`` returns the same object, so callers must not mutate it.
+
+    Example:
+        cache = HTTPCache(max_bytes=16 * 2**20)
+        session = HTTPTransport(cache=cache)
+        ...
+        print(cache.stats())  # hits, misses, hit_rate, bytes_saved, ...
+    """
+
+    def __init__(self, max_bytes: int = 32 * 2**20, max_entry_bytes: Optional[int] = None):
+        """
+        Args:
+            max_bytes: Total body bytes kept; least recently used entries
+                are evicted beyond it
+            max_entry_bytes: Larger responses are not cached (default:
+                an eighth of ``max_bytes``)
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 8
+        self._entries: "OrderedDict[Tuple[str, str], _CachedResponse]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def key(request: requests.PreparedRequest) -> Tuple[str, str]:
+        authorization = request.headers.get("Authorization", "")
+        if authorization:
+            authorization = hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+        return request.url, authorization
+
+    def get(self, key: Tuple[str, str]) -> Optional[_CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def store(self, key: Tuple[str, str], response: requests.Response) -> Optional[_CachedResponse]:
+        """Keep a 200 response if it has a validator; drop the stale entry otherwise.
+
+        Returns:
+            The new entry, or None if the response was not cached
+        """
+        headers = response.headers
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        content = response.content
+        cacheable = (response.status_code == 200 and (etag or last_modified)
+                     and "no-store" not in headers.get("Cache-Control", "")
+                     and len(content) <= self.max_entry_bytes)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.content)
+            if not cacheable:
+                return None
+            entry = self._entries[key] = _CachedResponse(
+                response.status_code, response.reason, dict(headers), content, etag, last_modified, {})
+            self._size += len(content)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.content)
+            return entry
+
+    def record(self, host: str, hit: bool, saved: int = 0):
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.bytes_saved += saved
+            else:
+                self.misses += 1
+        if metrics.enabled():
+            HTTP_CACHE.inc(host, "hit" if hit else "miss")
+            if saved:
+                HTTP_CACHE_BYTES_SAVED.inc(host, amount=saved)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counts since creation: revalidated hits, full misses and body bytes not downloaded."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+            }
+
+
+class HTTPTransport(requests.Session):
+    """
+    ``requests.Session`` with default timeouts, pooled retrying adapters
+    and optional request compression.
+
+    A per-call ``timeout=`` still overrides the default.
+    """
+
+    # Conditional GET cache; set on the class to share one with every
+    # transport, or pass ``cache=`` for one
+    cache: Optional[HTTPCache] = None
+
+    def __init__(self, timeout: Union[float, Tuple[float, float], None] = DEFAULT_TIMEOUT,
+                 retries: Union[int, Retry, None] = None, pool_connections: int = 10,
+                 pool_maxsize: int = 32, compress_min_bytes: Optional[int] = None,
+                 cache: Optional[HTTPCache] = None):
+        """
+        Args:
+            timeout: Default ``(connect, read)`` timeout in seconds, or one
+                value for both
+            retries: Retry count or urllib3 ``Retry`` (default: ``build_retry()``)
+            pool_connections: Number of hosts to keep pools for
+            pool_maxsize: Connections kept per host; match the number of
+                threads posting to that host concurrently
+            compress_min_bytes: Gzip request bodies at least this large
+                (off by default; the server must accept ``Content-Encoding: gzip``)
+            cache: Revalidate GET responses through this cache (default:
+                ``HTTPTransport.cache``)
+        """
+        super().__init__()
+        self.timeout = timeout
+        if cache is not None:
+            self.cache = cache
+        if retries is None:
+            retries = build_retry()
+        elif isinstance(retries, int):
+            retries = build_retry(total=retries)
+
+        adapter = InstrumentedAdapter(
+            compress_min_bytes=compress_min_bytes,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retries,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().request(method, url, **kwargs)
+
+    def send(self, request, **kwargs):
+        cache = self.cache
+        if (cache is None or request.method != "GET" or kwargs.get("stream")
+                or "If-None-Match" in request.headers or "If-Modified-Since" in request.headers):
+            return super().send(request, **kwargs)
+
+        key = cache.key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+        response = super().send(request, **kwargs)
+
+        host = urlparse(request.url).netloc
+        if entry is not None and response.status_code == 304:
+            cache.record(host, hit=True, saved=len(entry.content))
+            return self._from_cache(response, entry)
+        cache.record(host, hit=False)
+        stored = cache.store(key, response)
+        if stored is not None:
+            self._share_json(response, stored)
+        return response
+
+    @staticmethod
+    def _share_json(response: requests.Response, entry: _CachedResponse):
+        """Make ``response.json()`` decode the body once per cache entry."""
+        decode = response.json
+
+        def json(**kwargs):
+            if kwargs:
+                return decode(**kwargs)
+            try:
+                return entry.parsed["json"]
+            except KeyError:
+                # A racing first parse only decodes twice; both results are equal
+                value = entry.parsed["json"] = decode()
+                return value
+
+        response.json = json
+
+    @staticmethod
+    def _from_cache(not_modified: requests.Response, entry: _CachedResponse) -> requests.Response:
+        """Turn a 304 into the cached full response, with refreshed validators."""
+        headers = CaseInsensitiveDict(entry.headers)
+        for name in _REVALIDATION_HEADERS:
+            if name in not_modified.headers:
+                headers[name] = not_modified.headers[name]
+        response = not_modified
+        response.status_code = entry.status
+        response.reason = entry.reason
+        response.headers = headers
+        response.encoding = get_encoding_from_headers(headers)
+        response._content = entry.content
+        response._content_consumed = True
+        response.from_cache = True
+        HTTPTransport._share_json(response, entry)
+        return response
@@ -11,14 +11,16 @@ import os
 from pathlib import Path
 from typing import Optional
 
+from .. import events, metrics, tracing
+
 class SimpleVoiceProcessor:
     """
     Simplified voice processor that can handle file-based input
     and provides fallback options when microphone isn't available.
     """
     
-    def __init__(self):
-        self.audio_dir = Path("audio_input")
+    def __init__(self, audio_dir: str = "audio_input"):
+        self.audio_dir = Path(audio_dir)
         self.audio_dir.mkdir(exist_ok=True)
         
     def process_audio_file(self, audio_file_path: str) -> str:
@@ -37,6 +39,11 @@ class SimpleVoiceProcessor:
         Returns:
             str: Transcribed text
         """
+        with metrics.stage_timer("transcribe"), tracing.span("transcribe", file=os.path.basename(audio_file_path)):
+            return self._transcribe(audio_file_path)
+    
+    def _transcribe(self, audio_file_path: str) -> str:
+        """Simulated transcription behind process_audio_file."""
         if not os.path.exists(audio_file_path):
             raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
         
@@ -54,12 +61,14 @@ class SimpleVoiceProcessor:
         # Try to match filename to mock transcription
         for keyword, transcription in mock_transcriptions.items():
             if keyword in filename:
-                print(f"🎤 Transcribed from {filename}: {transcription[:50]}...")
+                events.emit("voice.transcribe", "🎤 Transcribed from {filename}: {preview}...",
+                            filename=filename, preview=transcription[:50], matched=keyword)
                 return transcription
         
         # Default mock transcription
         default_text = "This was a good experience overall. I would recommend this place to others."
-        print(f"🎤 Transcribed from {filename}: {default_text}")
+        events.emit("voice.transcribe", "🎤 Transcribed from {filename}: {preview}",
+                    filename=filename, preview=default_text, matched=None)
         return default_text
     
     def record_voice_simulation(self) -> str:
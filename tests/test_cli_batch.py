@@ -0,0 +1,28 @@
+"""The batch command end to end."""
+
+import json
+import os
+import subprocess
+import sys
+
+CLI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "review_agent", "cli.py")
+
+
+def test_unparsable_lines_fail_alone_in_place(tmp_path):
+    lines = [
+        json.dumps({"business_name": "Cafe One", "experience_text": "Good", "rating": 5}),
+        '{"business_name": "Broken",',
+        json.dumps({"business_name": "Cafe Two", "experience_text": "Fine", "rating": 4}),
+    ]
+    (tmp_path / "items.jsonl").write_text("\n".join(lines) + "\n")
+    env = dict(os.environ, OPENAI_API_KEY="")
+
+    completed = subprocess.run(
+        [sys.executable, CLI, "--quiet", "batch", "--input", "items.jsonl", "--workers", "1"],
+        cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120)
+
+    assert completed.returncode == 0, completed.stderr
+    results = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert [result["business_name"] for result in results] == ["Cafe One", None, "Cafe Two"]
+    assert [result["ok"] for result in results] == [True, False, True]
+    assert results[1]["error"].startswith("line 2 is not valid JSON")
@@ -0,0 +1,44 @@
+"""Reference Local Directory server error handling."""
+
+import pytest
+import requests
+
+from review_agent.directory_server import DirectoryServer
+
+
+@pytest.fixture
+def server():
+    with DirectoryServer(port=0) as server:
+        yield server
+
+
+def test_business_fields_must_be_strings(server):
+    response = requests.post(f"{server.url}/api/businesses", json={"name": ["Joe's"], "location": "NYC"})
+
+    assert response.status_code == 422
+    assert server.store.search("Joe's") == []
+
+
+def test_bad_gzip_body_is_a_client_error(server):
+    response = requests.post(f"{server.url}/api/businesses", data=b"not gzip",
+                             headers={"Content-Encoding": "gzip", "Content-Type": "application/json"})
+
+    assert response.status_code == 400
+    assert "gzip" in response.json()["error"]
+
+
+def test_unexpected_errors_are_answered_and_the_server_keeps_serving(server, monkeypatch):
+    def broken_search(*args, **kwargs):
+        raise RuntimeError("index corrupted")
+
+    monkeypatch.setattr(server.store, "search", broken_search)
+    monkeypatch.setattr(server.httpd.RequestHandlerClass, "log_error", lambda self, *args: None)
+
+    response = requests.get(f"{server.url}/api/businesses/search", params={"name": "Joe's"})
+    assert response.status_code == 500
+    assert response.json() == {"error": "internal error: RuntimeError"}
+
+    monkeypatch.undo()
+    created = requests.post(f"{server.url}/api/businesses", json={"name": "Joe's Pizza", "location": "NYC"})
+    assert created.status_code == 201
+    assert server.store.search("Joe's Pizza")[0]["id"] == created.json()["id"]
@@ -0,0 +1,158 @@
+"""FacebookPlatform Graph batch lookups against the local Graph stand-in."""
+
+import json
+
+import pytest
+
+from review_agent.budgets import RateBudgets
+from review_agent.cache import BusinessCache
+from review_agent.graph_server import MAX_BATCH_SIZE, GraphServer
+from review_agent.platforms.base import AuthenticationError
+from review_agent.platforms.facebook import FacebookPlatform
+
+TOKEN = "test-token"
+
+
+@pytest.fixture
+def graph():
+    with GraphServer(access_token=TOKEN) as server:
+        yield server
+
+
+@pytest.fixture
+def facebook(graph):
+    platform = FacebookPlatform(base_url=graph.url)
+    platform.login({"access_token": TOKEN})
+    yield platform
+    platform.close()
+
+
+def test_get_pages_info_splits_batches_at_graph_limit(graph, facebook):
+    page_ids = [graph.add_page(f"Page {i}") for i in range(2 * MAX_BATCH_SIZE + 20)]
+
+    results = facebook.get_pages_info(page_ids)
+
+    assert graph.state.batch_sizes == [MAX_BATCH_SIZE, MAX_BATCH_SIZE, 20]
+    assert [result["page_id"] for result in results] == page_ids
+    assert all(result["ok"] for result in results)
+    assert [result["data"]["name"] for result in results] == [f"Page {i}" for i in range(len(page_ids))]
+
+
+def test_get_pages_info_exactly_one_batch(graph, facebook):
+    page_ids = [graph.add_page(f"Page {i}") for i in range(MAX_BATCH_SIZE)]
+
+    facebook.get_pages_info(page_ids)
+
+    assert graph.state.batch_sizes == [MAX_BATCH_SIZE]
+
+
+def test_get_pages_info_reports_errors_per_item(graph, facebook):
+    known = graph.add_page("Known Page")
+
+    results = facebook.get_pages_info([known, "404404", known])
+
+    assert [result["ok"] for result in results] == [True, False, True]
+    assert "does not exist" in results[1]["error"]
+    assert results[1]["data"] is None
+    assert results[2]["data"]["id"] == known
+
+
+def test_incomplete_sub_requests_fail_only_those_items(graph, facebook):
+    page_ids = [graph.add_page(f"Page {i}") for i in range(5)]
+    graph.state.complete_limit = 3
+
+    results = facebook.get_pages_info(page_ids)
+
+    assert [result["ok"] for result in results] == [True, True, True, False, False]
+    assert results[3]["error"] == "Sub-request not completed; retry it"
+
+
+class FakeResponse:
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+@pytest.mark.parametrize("status_code, text, error", [
+    (500, '{"error": {"message": "Service temporarily unavailable"}}', "batch request failed"),
+    (200, "<html>Bad Gateway</html>", "unexpected response"),
+    (200, '{"error": {"message": "Please reduce the amount of data"}}', "unexpected response"),
+])
+def test_failed_batch_call_fails_its_items_without_raising(facebook, monkeypatch, status_code, text, error):
+    monkeypatch.setattr(facebook.session, "post", lambda url, **kwargs: FakeResponse(status_code, text))
+
+    results = facebook.get_pages_info(["1", "2", "3"])
+    searches = facebook.search_businesses([("Joe's Pizza", None)])
+
+    assert not any(result["ok"] for result in results + searches)
+    assert all(error in result["error"] for result in results + searches)
+
+
+def test_refused_token_raises_so_a_pool_can_log_in_again(graph, facebook):
+    page_ids = [graph.add_page(f"Page {i}") for i in range(3)]
+    facebook.access_token = "revoked"
+
+    with pytest.raises(AuthenticationError):
+        facebook.get_pages_info(page_ids)
+
+    facebook.relogin = lambda started: setattr(facebook, "access_token", TOKEN)
+    results = facebook.get_pages_info(page_ids)
+
+    assert all(result["ok"] for result in results)
+
+
+def test_search_businesses_finds_and_misses_per_query(graph, facebook):
+    pizza = graph.add_page("Joe's Pizza", "New York")
+    graph.add_page("Joe's Pizza", "Boston")
+
+    results = facebook.search_businesses([("Joe's Pizza", "New York"), ("Nowhere Diner", None)])
+
+    assert results[0]["ok"] and results[0]["business_id"] == pizza
+    assert not results[1]["ok"]
+    assert results[1]["error"] == "No Facebook page found for: Nowhere Diner"
+
+
+def test_search_businesses_uses_business_cache(graph, facebook):
+    graph.add_page("Cached Cafe", "Austin")
+    facebook.business_cache = BusinessCache()
+    queries = [("Cached Cafe", "Austin"), ("Missing Cafe", "Austin")]
+
+    first = facebook.search_businesses(queries)
+    second = facebook.search_businesses(queries)
+
+    # The second call is answered from the cache, hits and misses alike
+    assert graph.state.batch_sizes == [2]
+    assert [result["business_id"] for result in second] == [result["business_id"] for result in first]
+    assert [result["ok"] for result in second] == [True, False]
+    # search_business shares the same cache entries
+    assert facebook.search_business("Cached Cafe", "Austin") == first[0]["business_id"]
+    assert graph.state.batch_sizes == [2]
+
+
+def test_batch_calls_take_one_budget_token_per_sub_request(graph, facebook):
+    page_ids = [graph.add_page(f"Page {i}") for i in range(MAX_BATCH_SIZE + 5)]
+    budgets = RateBudgets.parse("Facebook=10000")
+    acquired = []
+    acquire = budgets.acquire
+    budgets.acquire = lambda platform, operation, tokens=1.0: (
+        acquired.append((operation, tokens)) or acquire(platform, operation, tokens))
+    facebook.rate_budgets = budgets
+
+    facebook.get_pages_info(page_ids)
+    facebook.search_businesses([("Page 1", None), ("Page 2", None)])
+
+    assert acquired == [("get_pages_info", MAX_BATCH_SIZE), ("get_pages_info", 5), ("search_businesses", 2)]
+
+
+def test_exhausted_budget_fails_the_batch_items(graph, facebook):
+    page_ids = [graph.add_page(f"Page {i}") for i in range(3)]
+    facebook.rate_budgets = RateBudgets.parse("Facebook=1/60:1", max_wait=0)
+
+    results = facebook.get_pages_info(page_ids)
+
+    assert not any(result["ok"] for result in results)
+    assert all("rate budget exhausted" in result["error"] for result in results)
+    assert graph.state.batch_sizes == []
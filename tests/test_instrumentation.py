@@ -0,0 +1,94 @@
+"""Stage instrumentation shared by every ReviewPlatform."""
+
+import time
+
+import pytest
+
+from review_agent import metrics
+from review_agent.platforms.base import AuthenticationError, ReviewPlatform
+
+
+class ExpiringPlatform(ReviewPlatform):
+    platform_name = "Expiring"
+
+    def __init__(self, failures=1):
+        self.failures = failures
+        self.calls = 0
+
+    def login(self, credentials):
+        pass
+
+    def search_business(self, business_name, location=None):
+        return business_name
+
+    def post_review(self, business_id, review_text, rating):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise AuthenticationError("token expired")
+        return {"id": "review-1"}
+
+
+@pytest.fixture
+def stage_metrics():
+    metrics.REGISTRY.reset()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.REGISTRY.reset()
+
+
+def outcomes(stage, platform):
+    return {outcome: metrics.STAGE_TOTAL.value(stage, platform, outcome)
+            for outcome in ("success", "failure", "relogin")}
+
+
+def test_relogin_retry_is_recorded_as_its_own_attempt(stage_metrics):
+    platform = ExpiringPlatform()
+    relogins = []
+    platform.relogin = relogins.append
+
+    assert platform.post_review("biz", "Great", 5) == {"id": "review-1"}
+
+    assert len(relogins) == 1
+    assert outcomes("post_review", "Expiring") == {"success": 1, "failure": 0, "relogin": 1}
+
+
+def test_second_authentication_failure_is_not_retried_again(stage_metrics):
+    platform = ExpiringPlatform(failures=2)
+    platform.relogin = lambda started: None
+
+    with pytest.raises(AuthenticationError):
+        platform.post_review("biz", "Great", 5)
+
+    assert platform.calls == 2
+    assert outcomes("post_review", "Expiring") == {"success": 0, "failure": 1, "relogin": 1}
+
+
+def test_without_a_pool_authentication_failures_propagate(stage_metrics):
+    platform = ExpiringPlatform()
+
+    with pytest.raises(AuthenticationError):
+        platform.post_review("biz", "Great", 5)
+
+    assert outcomes("post_review", "Expiring") == {"success": 0, "failure": 1, "relogin": 0}
+
+
+class SlowBudgets:
+    def acquire(self, platform, operation):
+        time.sleep(0.2)
+        return 0.2
+
+    def defer(self, platform, operation, seconds):
+        pass
+
+
+def test_budget_wait_is_not_counted_as_stage_latency(stage_metrics):
+    platform = ExpiringPlatform(failures=0)
+    platform.rate_budgets = SlowBudgets()
+
+    started = time.monotonic()
+    platform.post_review("biz", "Great", 5)
+
+    assert time.monotonic() - started >= 0.2
+    _counts, total_seconds = metrics.STAGE_DURATION.snapshot()[("post_review", "Expiring")]
+    assert total_seconds < 0.1
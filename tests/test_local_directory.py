@@ -0,0 +1,166 @@
+"""LocalDirectoryPlatform against the reference directory server."""
+
+import json
+
+import pytest
+import requests
+
+from review_agent.budgets import RateBudgets
+from review_agent.cache import BusinessCache
+from review_agent.directory_server import DirectoryServer
+from review_agent.platforms.base import BusinessNotFoundError, PlatformUnavailableError
+from review_agent.platforms.local_directory import LocalDirectoryPlatform
+from review_agent.registry import BusinessRegistry
+
+
+@pytest.fixture
+def server():
+    with DirectoryServer(port=0) as server:
+        yield server
+
+
+@pytest.fixture
+def directory(server, monkeypatch):
+    monkeypatch.setattr(LocalDirectoryPlatform, "business_registry", BusinessRegistry())
+    platform = LocalDirectoryPlatform(server.url)
+    platform.login({})
+    yield platform
+    platform.close()
+
+
+class FakeResponse:
+    status_code = 207
+    text = "<html>Bad Gateway</html>"
+
+    def json(self):
+        raise ValueError("Expecting value")
+
+
+def test_batch_timeout_fails_each_item_without_reposting(directory, monkeypatch):
+    business_id = directory.search_business("Joe's Pizza", "New York")
+    posts = []
+
+    def timeout(url, **kwargs):
+        posts.append(url)
+        raise requests.exceptions.ReadTimeout("read timed out")
+
+    monkeypatch.setattr(directory.session, "post", timeout)
+
+    results = directory.post_reviews_batch([(business_id, "Great", 5), (business_id, "Good", 4)])
+
+    assert [result["ok"] for result in results] == [False, False]
+    assert all("read timed out" in result["error"] for result in results)
+    assert len(posts) == 1
+
+
+def test_unreadable_batch_answer_fails_each_item(directory, monkeypatch):
+    business_id = directory.search_business("Joe's Pizza", "New York")
+    monkeypatch.setattr(directory.session, "post", lambda url, **kwargs: FakeResponse())
+
+    results = directory.post_reviews_batch([(business_id, "Great", 5), (business_id, "Good", 4)])
+
+    assert [result["ok"] for result in results] == [False, False]
+    assert all("unreadable response" in result["error"] for result in results)
+
+
+def test_failure_after_the_first_page_raises(directory, monkeypatch):
+    business_id = directory.search_business("Joe's Pizza", "New York")
+    directory.post_reviews_batch([(business_id, f"Review {i}", 5) for i in range(5)])
+    get = directory.session.get
+    calls = []
+
+    def fail_second_page(url, **kwargs):
+        calls.append(url)
+        if len(calls) > 1:
+            raise requests.exceptions.ConnectionError("connection reset")
+        return get(url, **kwargs)
+
+    monkeypatch.setattr(directory.session, "get", fail_second_page)
+
+    pages = directory.iter_business_reviews(business_id, page_size=2, prefetch=False)
+    with pytest.raises(PlatformUnavailableError):
+        list(pages)
+
+
+def test_unknown_business_reads_as_no_reviews(directory):
+    assert directory.get_business_reviews("999999") == []
+
+
+def test_business_cache_is_kept_per_directory(server, directory, monkeypatch):
+    cache = BusinessCache()
+    monkeypatch.setattr(LocalDirectoryPlatform, "business_cache", cache)
+    with DirectoryServer(port=0) as other_server:
+        other_server.store.create_business("Someone Else", "Boston", "Food")
+        other = LocalDirectoryPlatform(other_server.url)
+        other.login({})
+
+        first = directory.search_business("Joe's Pizza", "New York")
+        second = other.search_business("Joe's Pizza", "New York")
+        other.close()
+
+    assert first != second
+    assert cache.lookup(directory._namespace, "Joe's Pizza", "New York")[0] == first
+    assert cache.lookup(other._namespace, "Joe's Pizza", "New York")[0] == second
+
+
+def test_offline_ids_are_not_cached(monkeypatch):
+    cache = BusinessCache()
+    monkeypatch.setattr(LocalDirectoryPlatform, "business_cache", cache)
+    monkeypatch.setattr(LocalDirectoryPlatform, "business_registry", BusinessRegistry())
+    offline = LocalDirectoryPlatform("http://127.0.0.1:9")
+    offline.login({})
+
+    assert offline._is_placeholder_id(offline.search_business("Joe's Pizza", "New York"))
+    assert cache.lookup(offline._namespace, "Joe's Pizza", "New York") is None
+    offline.close()
+
+
+class FirstPageResponse:
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+@pytest.mark.parametrize("status_code, text", [(500, '{"error": "boom"}'), (503, "Service Unavailable"),
+                                               (200, "<html>proxy error</html>")])
+def test_unusable_first_page_reads_as_no_reviews(directory, monkeypatch, status_code, text):
+    monkeypatch.setattr(directory.session, "get", lambda url, **kwargs: FirstPageResponse(status_code, text))
+
+    assert directory.get_business_reviews("1") == []
+
+
+def test_business_unknown_to_the_server_is_looked_up_again(server, directory, monkeypatch):
+    cache = BusinessCache()
+    monkeypatch.setattr(LocalDirectoryPlatform, "business_cache", cache)
+    # Known from an earlier run, since deleted on the server
+    cache.store(directory._namespace, "Corner Bakery", "Austin", "999")
+    directory.business_registry.resolve(directory._namespace, "Corner Bakery", "Austin", create=lambda: "999")
+    assert directory.search_business("Corner Bakery", "Austin") == "999"
+
+    with pytest.raises(BusinessNotFoundError):
+        directory.post_review("999", "Great bread", 5)
+
+    assert cache.lookup(directory._namespace, "Corner Bakery", "Austin") is None
+    business_id = directory.search_business("Corner Bakery", "Austin")
+    [business] = server.store.search("Corner Bakery", "Austin")
+    assert business_id == business["id"]
+    assert directory.post_review(business_id, "Great bread", 5)["business_id"] == business_id
+
+
+def test_batch_posts_take_one_budget_token_per_review(directory):
+    business_id = directory.search_business("Joe's Pizza", "New York")
+    budgets = RateBudgets.parse("Local Directory=10000")
+    acquired = []
+    acquire = budgets.acquire
+    budgets.acquire = lambda platform, operation, tokens=1.0: (
+        acquired.append((operation, tokens)) or acquire(platform, operation, tokens))
+    directory.rate_budgets = budgets
+
+    results = directory.post_reviews_batch([(business_id, f"Review {i}", 5) for i in range(5)],
+                                           chunk_size=2, concurrency=1)
+
+    assert all(result["ok"] for result in results)
+    assert acquired == [("post_reviews_batch", 2), ("post_reviews_batch", 2), ("post_reviews_batch", 1)]
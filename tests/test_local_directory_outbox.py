@@ -0,0 +1,79 @@
+"""LocalDirectoryPlatform placeholder IDs survive the process that made them."""
+
+import socket
+
+import pytest
+
+from review_agent.directory_server import DirectoryServer
+from review_agent.outbox import Outbox
+from review_agent.platforms.local_directory import PLACEHOLDER_PREFIX, LocalDirectoryPlatform
+from review_agent.registry import BusinessRegistry
+
+
+@pytest.fixture
+def port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    monkeypatch.setattr(LocalDirectoryPlatform, "business_registry", BusinessRegistry())
+    monkeypatch.setattr(LocalDirectoryPlatform, "_placeholder_businesses", {})
+
+
+def platform_for(port, outbox=None):
+    platform = LocalDirectoryPlatform(f"http://127.0.0.1:{port}")
+    platform.outbox = outbox
+    platform.outbox_flush_interval = 3600
+    platform.login({})
+    return platform
+
+
+def offline_id(port):
+    platform = platform_for(port)
+    business_id = platform.search_business("Joe's Pizza", "New York")
+    platform.close()
+    return business_id
+
+
+def test_placeholder_ids_are_recognisable(port):
+    business_id = offline_id(port)
+
+    assert business_id == PLACEHOLDER_PREFIX + "joes_pizza@new_york"
+    assert platform_for(port)._is_placeholder_id(business_id)
+
+
+def test_placeholder_from_another_process_is_delivered(port, tmp_path, monkeypatch):
+    business_id = offline_id(port)
+    # A fresh process knows nothing about the placeholders made elsewhere
+    monkeypatch.setattr(LocalDirectoryPlatform, "_placeholder_businesses", {})
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    platform = platform_for(port, outbox)
+
+    queued = platform.post_review(business_id, "Great slice", 5)
+    assert queued["status"] == "queued"
+
+    with DirectoryServer(port=port) as server:
+        platform.health.record_success()
+        assert platform.flush_outbox() == 1
+        assert outbox.pending() == 0 and outbox.failed() == []
+        [business] = server.store.search("Joe's Pizza", "New York")
+        reviews = platform.get_business_reviews(business["id"])
+        platform.close()
+
+    assert [review["text"] for review in reviews] == ["Great slice"]
+    outbox.close()
+
+
+def test_live_post_resolves_a_placeholder(port):
+    business_id = offline_id(port)
+
+    with DirectoryServer(port=port) as server:
+        platform = platform_for(port)
+        result = platform.post_review(business_id, "Great slice", 5)
+        platform.close()
+        [business] = server.store.search("Joe's Pizza", "New York")
+
+    assert result["business_id"] == business["id"]
@@ -0,0 +1,100 @@
+"""BusinessRegistry canonicalization and fuzzy matching."""
+
+import itertools
+
+import pytest
+
+from review_agent.platforms.mock import MockPlatform
+from review_agent.registry import BusinessRegistry, numbers_match
+
+
+def resolve(registry, name, location=None, **kwargs):
+    return registry.resolve("Test", name, location, create=lambda: name, **kwargs)
+
+
+def test_variant_spellings_share_one_business():
+    registry = BusinessRegistry()
+
+    assert resolve(registry, "Joe's Pizza") == "Joe's Pizza"
+    assert resolve(registry, "JOE’S PIZZA") == "Joe's Pizza"
+    assert resolve(registry, "Joes Piza") == "Joe's Pizza"
+
+
+def test_numbered_branches_stay_apart():
+    registry = BusinessRegistry()
+
+    assert resolve(registry, "Pizza Hut 12") == "Pizza Hut 12"
+    assert resolve(registry, "Pizza Hut 13") == "Pizza Hut 13"
+    assert resolve(registry, "Pizza Hut #12") == "Pizza Hut 12"
+    assert resolve(registry, "Pizza Hut") == "Pizza Hut"
+
+
+def test_numbers_match():
+    assert numbers_match("Unit 5, Main St", "unit 5 main street")
+    assert not numbers_match("Store 12", "Store 13")
+    assert not numbers_match("Route 66 Diner", "Route Diner")
+
+
+def test_caller_threshold_is_never_looser_than_the_registry():
+    registry = BusinessRegistry(threshold=0.7)
+    resolve(registry, "Joe's Pizza")
+
+    # Similar enough (0.75) for the registry's 0.7, not for a platform asking for 0.8
+    assert resolve(registry, "Joes Piza", threshold=0.8) == "Joes Piza"
+    assert resolve(registry, "Joes Pizza NYC", threshold=0.5) == "Joe's Pizza"
+
+
+def test_mock_ids_do_not_depend_on_arrival_order():
+    spellings = ["Joe's Pizza", "Joes Piza"]
+    seen = set()
+    for order in itertools.permutations(spellings):
+        platform = MockPlatform()
+        platform.login({})
+        seen.add(tuple(sorted((name, platform.search_business(name)) for name in order)))
+
+    assert len(seen) == 1
+
+
+def test_least_recently_used_businesses_are_evicted():
+    registry = BusinessRegistry(max_entries=2)
+    resolve(registry, "Joe's Pizza")
+    resolve(registry, "Blue Bottle Coffee")
+    resolve(registry, "Joe's Pizza")
+    resolve(registry, "Corner Bakery")
+
+    assert len(registry) == 2
+    assert registry.lookup("Test", "Joe's Pizza", None) == "Joe's Pizza"
+    assert registry.lookup("Test", "Blue Bottle Coffee", None) is None
+
+
+def test_resolved_ids_expire(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("review_agent.registry.time.monotonic", lambda: clock[0])
+    registry = BusinessRegistry(ttl=60)
+    resolve(registry, "Joe's Pizza")
+    resolve(registry, "Corner Bakery", ttl=600)
+
+    clock[0] += 120
+
+    assert registry.lookup("Test", "Joes Piza", None) is None
+    assert resolve(registry, "Joes Piza") == "Joes Piza"
+    assert registry.lookup("Test", "Corner Bakery", None) == "Corner Bakery"
+
+
+def test_forget_id_drops_every_spelling():
+    registry = BusinessRegistry()
+    created = iter(["42", "43"])
+    for name in ("Joe's Pizza", "JOE’S PIZZA", "Joes Piza"):
+        registry.resolve("Test", name, None, create=lambda: next(created))
+
+    assert registry.forget_id("Test", "42") == [("Test", "joes pizza", "")]
+    assert registry.lookup("Test", "Joes Piza", None) is None
+    assert registry.resolve("Test", "Joe's Pizza", None, create=lambda: next(created)) == "43"
+
+
+@pytest.mark.parametrize("name", ["Joe's Pizza", "JOE’S PIZZA"])
+def test_mock_ids_need_no_registry(name):
+    platform = MockPlatform()
+    platform.login({})
+
+    assert platform.search_business(name, "New York") == "joes_pizza_new_york"
@@ -0,0 +1,64 @@
+"""ShardedRunner worker setup."""
+
+import pickle
+
+import pytest
+
+from review_agent import metrics
+from review_agent.budgets import Budget, RateBudgets
+from review_agent.cache import BusinessCache
+from review_agent.faults import FaultProfile
+from review_agent.platforms.base import ReviewPlatform
+from review_agent.platforms.mock import MockPlatform
+from review_agent.runner import WorkerSettings, shard_key
+from review_agent.transport import HTTPTransport
+
+
+@pytest.fixture
+def clean_settings(monkeypatch):
+    monkeypatch.setattr(ReviewPlatform, "business_cache", None)
+    monkeypatch.setattr(ReviewPlatform, "session_cache", None)
+    monkeypatch.setattr(ReviewPlatform, "rate_budgets", None)
+    monkeypatch.setattr(HTTPTransport, "cache", None)
+    monkeypatch.setattr(MockPlatform, "faults", None)
+    yield
+    metrics.disable()
+
+
+def test_settings_survive_a_fresh_interpreter(clean_settings, tmp_path, monkeypatch):
+    ReviewPlatform.business_cache = BusinessCache(str(tmp_path / "ids.db"), ttl=60)
+    ReviewPlatform.rate_budgets = RateBudgets.parse("Mock=5", path=str(tmp_path / "budgets.db"), max_wait=2)
+    MockPlatform.faults = FaultProfile.parse("error_rate=0.1,seed=3")
+    metrics.enable()
+
+    settings = pickle.loads(pickle.dumps(WorkerSettings.capture()))
+
+    # What a spawned worker starts with
+    for cls, name in ((ReviewPlatform, "business_cache"), (ReviewPlatform, "rate_budgets"), (MockPlatform, "faults")):
+        monkeypatch.setattr(cls, name, None)
+    metrics.disable()
+    settings.install()
+
+    assert ReviewPlatform.business_cache.path == str(tmp_path / "ids.db")
+    assert ReviewPlatform.business_cache.ttl == 60
+    assert ReviewPlatform.rate_budgets.path == str(tmp_path / "budgets.db")
+    assert ReviewPlatform.rate_budgets.budgets == {"Mock": Budget(5.0, 5.0)}
+    assert ReviewPlatform.rate_budgets.max_wait == 2
+    assert MockPlatform.faults == FaultProfile.parse("error_rate=0.1,seed=3")
+    assert metrics.enabled()
+    ReviewPlatform.rate_budgets.close()
+
+
+def test_install_keeps_inherited_settings(clean_settings):
+    inherited = BusinessCache()
+    ReviewPlatform.business_cache = inherited
+
+    WorkerSettings(business_cache={"path": None}).install()
+
+    assert ReviewPlatform.business_cache is inherited
+
+
+def test_shard_key_tolerates_malformed_items():
+    assert shard_key({"business_name": "  Joe's  PIZZA "}) == "joe's pizza"
+    assert shard_key({"business_name": 12}) == ""
+    assert shard_key(["not", "a", "dict"]) == ""
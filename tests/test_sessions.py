@@ -0,0 +1,75 @@
+"""SessionCache refreshes: one fetch per stale session, no lock held while fetching."""
+
+import threading
+import time
+
+import pytest
+
+from review_agent.sessions import SessionCache
+
+CREDENTIALS = {"api_key": "key", "secret": "secret"}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "sessions.db")
+
+
+def test_concurrent_callers_share_one_fetch(path):
+    calls = []
+
+    def fetch():
+        calls.append(threading.get_ident())
+        time.sleep(0.3)
+        return {"access_token": "token-1"}, time.time() + 3600
+
+    caches = [SessionCache(path) for _ in range(4)]
+    results = []
+    threads = [threading.Thread(target=lambda cache=cache: results.append(
+        cache.get_or_refresh("Trustpilot", CREDENTIALS, fetch))) for cache in caches]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"access_token": "token-1"}] * 4
+
+
+def test_fetch_runs_outside_the_write_transaction(path):
+    cache, other = SessionCache(path), SessionCache(path)
+
+    def fetch():
+        # Would block on the database lock if fetch ran inside a transaction
+        other.invalidate("Facebook", CREDENTIALS)
+        return {"access_token": "token-2"}, time.time() + 3600
+
+    started = time.monotonic()
+    assert cache.get_or_refresh("Trustpilot", CREDENTIALS, fetch) == {"access_token": "token-2"}
+    assert time.monotonic() - started < 5
+
+
+def test_failed_fetch_caches_nothing_and_frees_the_lease(path):
+    cache = SessionCache(path)
+
+    def failing():
+        raise ValueError("Authentication failed")
+
+    with pytest.raises(ValueError):
+        cache.get_or_refresh("Trustpilot", CREDENTIALS, failing)
+
+    assert cache.get("Trustpilot", CREDENTIALS) is None
+    session = cache.get_or_refresh("Trustpilot", CREDENTIALS, lambda: ({"access_token": "t"}, time.time() + 3600))
+    assert session == {"access_token": "t"}
+
+
+def test_abandoned_lease_is_taken_over(path):
+    cache = SessionCache(path, lease_timeout=0.2)
+    with cache.transaction() as connection:
+        assert cache._lease(connection, "Trustpilot", "account", "crashed-process")
+
+    with cache.transaction() as connection:
+        assert not cache._lease(connection, "Trustpilot", "account", "other")
+    time.sleep(0.25)
+    with cache.transaction() as connection:
+        assert cache._lease(connection, "Trustpilot", "account", "other")
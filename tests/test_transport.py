@@ -0,0 +1,45 @@
+"""HTTPTransport conditional GET caching."""
+
+import pytest
+
+from review_agent.directory_server import DirectoryServer
+from review_agent.platforms.local_directory import LocalDirectoryPlatform
+from review_agent.registry import BusinessRegistry
+from review_agent.transport import HTTPCache, HTTPTransport
+
+
+@pytest.fixture
+def server():
+    with DirectoryServer(port=0) as server:
+        yield server
+
+
+def test_unchanged_resource_is_decoded_once(server):
+    cache = HTTPCache()
+    session = HTTPTransport(cache=cache)
+    url = f"{server.url}/api/businesses/search"
+
+    first = session.get(url, params={"name": "Joe's Pizza"})
+    payload = first.json()
+    again = session.get(url, params={"name": "Joe's Pizza"})
+
+    assert again.status_code == 200 and again.from_cache
+    assert again.json() is payload
+    assert session.get(url, params={"name": "Joe's Pizza"}).json() is payload
+    assert cache.hits == 2
+    session.close()
+
+
+def test_revalidated_review_pages_read_the_same_twice(server, monkeypatch):
+    monkeypatch.setattr(LocalDirectoryPlatform, "business_registry", BusinessRegistry())
+    platform = LocalDirectoryPlatform(server.url, transport=HTTPTransport(cache=HTTPCache()))
+    platform.login({})
+    business_id = platform.search_business("Joe's Pizza", "New York")
+    platform.post_reviews_batch([(business_id, f"Review {i}", 5) for i in range(3)])
+
+    first = platform.get_business_reviews(business_id)
+    second = platform.get_business_reviews(business_id)
+    platform.close()
+
+    assert len(first) == 3
+    assert second == first
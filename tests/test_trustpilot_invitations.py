@@ -0,0 +1,108 @@
+"""TrustpilotPlatform.invite_reviews_bulk de-duplication and per-item results."""
+
+import json
+
+import pytest
+
+from review_agent.budgets import RateBudgets
+from review_agent.platforms.trustpilot import InvitationIndex, TrustpilotPlatform
+
+
+class FakeResponse:
+    def __init__(self, status_code=202, text='{"id": "invitation-1"}'):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = {}
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeSession:
+    def __init__(self, response=None):
+        self.response = response or FakeResponse()
+        self.posts = []
+
+    def post(self, url, **kwargs):
+        self.posts.append(kwargs.get("json"))
+        return self.response
+
+
+@pytest.fixture
+def trustpilot():
+    platform = TrustpilotPlatform()
+    platform.session = FakeSession()
+    return platform
+
+
+CUSTOMERS = [{"email": "a@example.com", "name": "A"}, {"email": "b@example.com", "name": "B"}]
+
+
+def test_dedup_index_is_on_by_default(trustpilot, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    first = trustpilot.invite_reviews_bulk("unit-1", CUSTOMERS)
+    second = trustpilot.invite_reviews_bulk("unit-1", CUSTOMERS)
+
+    assert [item["status"] for item in first] == ["sent", "sent"]
+    assert [item["status"] for item in second] == ["duplicate", "duplicate"]
+    assert len(trustpilot.session.posts) == 2
+    assert (tmp_path / "trustpilot_invitations.db").exists()
+
+
+def test_unreadable_answer_is_a_per_item_result_and_stays_sent(trustpilot, tmp_path):
+    trustpilot.session.response = FakeResponse(202, "<html>accepted</html>")
+    index = InvitationIndex(str(tmp_path / "invitations.db"))
+
+    report = trustpilot.invite_reviews_bulk("unit-1", CUSTOMERS, index=index)
+
+    assert [item["status"] for item in report] == ["sent", "sent"]
+    assert all("not JSON" in item["error"] for item in report)
+    assert index.status("unit-1", report[0]["reference_id"]) == "sent"
+    index.close()
+
+
+def test_rejected_invitation_is_released_for_the_next_run(trustpilot, tmp_path):
+    trustpilot.session.response = FakeResponse(400, '{"message": "bad email"}')
+    index = InvitationIndex(str(tmp_path / "invitations.db"))
+
+    report = trustpilot.invite_reviews_bulk("unit-1", CUSTOMERS[:1], index=index)
+
+    assert report[0]["status"] == "failed"
+    assert index.status("unit-1", report[0]["reference_id"]) == "failed"
+    trustpilot.session.response = FakeResponse()
+    assert trustpilot.invite_reviews_bulk("unit-1", CUSTOMERS[:1], index=index)[0]["status"] == "sent"
+    index.close()
+
+
+class SequenceSession(FakeSession):
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+
+    def post(self, url, **kwargs):
+        self.posts.append(kwargs.get("json"))
+        return self.responses.pop(0)
+
+
+def test_invitations_draw_from_the_shared_rate_budget(trustpilot):
+    rate_limited = FakeResponse(429, '{"message": "slow down"}')
+    rate_limited.headers = {"Retry-After": "0.01"}
+    trustpilot.session = SequenceSession([rate_limited, FakeResponse(), FakeResponse()])
+    budgets = RateBudgets.parse("Trustpilot.invite_review=1000")
+    calls = []
+    acquire, defer = budgets.acquire, budgets.defer
+    budgets.acquire = lambda *args, **kwargs: calls.append(("acquire", args)) or acquire(*args, **kwargs)
+    budgets.defer = lambda *args: calls.append(("defer", args)) or defer(*args)
+    trustpilot.rate_budgets = budgets
+
+    report = trustpilot.invite_reviews_bulk("unit-1", CUSTOMERS, index=None, concurrency=1)
+
+    assert [item["status"] for item in report] == ["sent", "sent"]
+    assert calls == [
+        ("acquire", ("Trustpilot", "invite_review")),
+        ("defer", ("Trustpilot", "invite_review", 0.01)),
+        ("acquire", ("Trustpilot", "invite_review")),
+        ("acquire", ("Trustpilot", "invite_review")),
+    ]
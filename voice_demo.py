@@ -1,5 +1,6 @@
 import os
 from dotenv import load_dotenv
+from review_agent import events
 from review_agent.agent import ReviewAgent, ReviewInput
 from review_agent.platforms.mock import MockPlatform
 from review_agent.utils.simple_voice import SimpleVoiceProcessor
@@ -171,4 +172,5 @@ def generate_fallback_review(review_input: ReviewInput) -> str:
     return review
 
 if __name__ == "__main__":
+    events.subscribe(events.ConsoleListener())
     voice_demo()
\ No newline at end of file